@@ -0,0 +1,211 @@
+"""Benchmarks for typedargs hot paths.
+
+This is a standalone script rather than part of the test suite so that it
+can be run against any checkout and its results saved for comparison with
+compare_benchmarks.py.
+
+Usage:
+    python benchmarks/bench_typedargs.py [-o results.json] [-k FILTER]
+"""
+
+import os
+import sys
+import json
+import time
+import timeit
+import platform
+import argparse
+import subprocess
+from typing import List, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=wrong-import-position
+from typedargs import typeinfo, types, type_system, docannotate, param, return_type, context
+from typedargs.shell import HierarchicalShell
+
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register a function that returns the callable to benchmark."""
+
+    def _register(func):
+        BENCHMARKS.append((name, func))
+        return func
+
+    return _register
+
+
+def _make_convert(value, type_or_name):
+    def _setup():
+        return lambda: type_system.convert_to_type(value, type_or_name)
+
+    return _setup
+
+
+CONVERSIONS = [
+    ('integer', '0x10'),
+    ('float', '1.5'),
+    ('bool', 'true'),
+    ('string', 'hello'),
+    ('bytes', '0xdeadbeef'),
+    ('path', '/tmp'),
+    ('basic_dict', {'a': 1}),
+    ('list(integer)', '[1, 2, 3, 4, 5, 6, 7, 8]'),
+    ('map(string, integer)', {'a': 1, 'b': 2}),
+    (int, '10'),
+    (float, '1.5'),
+    (bool, 'true'),
+    (str, 'hello'),
+    (List[int], '[1, 2, 3]'),
+    (Dict[str, int], {'a': 1}),
+]
+
+for _type, _value in CONVERSIONS:
+    _name = _type if isinstance(_type, str) else "py:" + str(_type).replace('typing.', '').replace("<class '", "").replace("'>", "")
+    benchmark("convert_to_type[%s]" % _name)(_make_convert(_value, _type))
+
+
+def _make_instantiate(type_name, typing_type):
+    def _setup():
+        system = typeinfo.TypeSystem(types)
+
+        def _instantiate():
+            system.known_types.pop(type_name, None)
+            system._complex_type_proxies.pop(typing_type, None)  # pylint: disable=protected-access
+            system.get_proxy_for_type(type_name)
+            system.get_proxy_for_type(typing_type)
+
+        return _instantiate
+
+    return _setup
+
+
+benchmark("instantiate[list]")(_make_instantiate('list(integer)', List[int]))
+benchmark("instantiate[map]")(_make_instantiate('map(string, integer)', Dict[str, int]))
+
+
+@benchmark("docannotate[first_call]")
+def _docannotate_first_call():
+    def _first_call():
+        def func(arg1, arg2=5):
+            """Add two numbers.
+
+            Args:
+                arg1 (integer): The first number.
+                arg2 (integer): The second number.
+
+            Returns:
+                integer: The sum of arg1 and arg2.
+            """
+            return arg1 + arg2
+
+        return docannotate(func)('1', '2')
+
+    return _first_call
+
+
+@param("arg1", "integer", "positive")
+@param("arg2", "string")
+@return_type("string")
+def _annotated_func(arg1, arg2="hello"):
+    return arg2 * arg1
+
+
+@benchmark("annotated_call[steady_state]")
+def _steady_state():
+    _annotated_func(1)
+    return lambda: _annotated_func('5', arg2='world')
+
+
+@benchmark("shell.invoke_string")
+def _invoke_string():
+    shell = HierarchicalShell('Benchmark Shell')
+    shell.root_add('func', _annotated_func)
+    return lambda: shell.invoke_string('func 5 --arg2 world')
+
+
+@benchmark("shell.list_dir[500]")
+def _list_dir():
+    @context("Large")
+    class LargeContext:
+        """A context with many functions."""
+
+    for i in range(500):
+        def _func(self, value):
+            return value
+
+        _func.__name__ = "func_%d" % i
+        _func.__doc__ = "Function %d." % i
+        setattr(LargeContext, _func.__name__, param("value", "integer")(_func))
+
+    shell = HierarchicalShell('Benchmark Shell')
+    large = LargeContext()
+    return lambda: shell.list_dir(large)
+
+
+def _run_benchmark(func, repeat):
+    """Return the best time per call in seconds and the number of calls per repeat."""
+
+    timer = timeit.Timer(func)
+    number, _elapsed = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number, number
+
+
+def _import_time(repeat):
+    """Measure the time to import typedargs in a fresh interpreter."""
+
+    def _spawn(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=ROOT)
+        return time.perf_counter() - start
+
+    baseline = min(_spawn('pass') for _i in range(repeat))
+    imported = min(_spawn('import typedargs') for _i in range(repeat))
+    return max(imported - baseline, 0.0)
+
+
+def main(argv=None):
+    """Run all benchmarks and save the results."""
+
+    parser = argparse.ArgumentParser(description="Benchmark typedargs hot paths")
+    parser.add_argument('-o', '--output', help="Save results as JSON to this file")
+    parser.add_argument('-k', '--filter', help="Only run benchmarks whose name contains this string")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="Number of repeats, the best is reported")
+    args = parser.parse_args(argv)
+
+    results = {}
+
+    for name, setup in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+
+        per_call, number = _run_benchmark(setup(), args.repeat)
+        results[name] = {'seconds': per_call, 'number': number}
+        print("%-40s %12.3f us" % (name, per_call * 1e6))
+
+    if not args.filter or args.filter in 'import_time':
+        import_time = _import_time(args.repeat)
+        results['import_time'] = {'seconds': import_time, 'number': 1}
+        print("%-40s %12.3f us" % ('import_time', import_time * 1e6))
+
+    if args.output:
+        data = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'benchmarks': results
+        }
+
+        with open(args.output, "w") as outfile:
+            json.dump(data, outfile, indent=2, sort_keys=True)
+            outfile.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
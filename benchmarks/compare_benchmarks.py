@@ -0,0 +1,86 @@
+"""Compare two benchmark result files and flag regressions.
+
+Usage:
+    python benchmarks/compare_benchmarks.py baseline.json results.json [-t 0.2]
+
+The exit code is 1 if any benchmark present in both files is slower than
+the baseline by more than the threshold, which is a fraction of the
+baseline time.
+"""
+
+import sys
+import json
+import argparse
+
+
+def load_results(path):
+    """Load the benchmark timings from a results file."""
+
+    with open(path, "r") as infile:
+        data = json.load(infile)
+
+    return {name: entry['seconds'] for name, entry in data['benchmarks'].items()}
+
+
+def compare(baseline, current, threshold):
+    """Compare two sets of timings.
+
+    Args:
+        baseline (dict): Benchmark name to seconds per call.
+        current (dict): Benchmark name to seconds per call.
+        threshold (float): The fractional slowdown that counts as a regression.
+
+    Returns:
+        (list, list): A list of (name, baseline, current, change) tuples for all
+            benchmarks present in both sets and the names of the benchmarks that
+            regressed.
+    """
+
+    rows = []
+    regressions = []
+
+    for name in sorted(set(baseline) & set(current)):
+        old = baseline[name]
+        new = current[name]
+
+        change = (new - old) / old if old > 0 else 0.0
+        rows.append((name, old, new, change))
+
+        if change > threshold:
+            regressions.append(name)
+
+    return rows, regressions
+
+
+def main(argv=None):
+    """Print a comparison table and return 1 if there are regressions."""
+
+    parser = argparse.ArgumentParser(description="Compare typedargs benchmark results")
+    parser.add_argument('baseline', help="The baseline results file")
+    parser.add_argument('current', help="The results file to compare against the baseline")
+    parser.add_argument('-t', '--threshold', type=float, default=0.2,
+                        help="Fractional slowdown that is reported as a regression (default 0.2)")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    rows, regressions = compare(baseline, current, args.threshold)
+
+    print("%-40s %14s %14s %9s" % ("benchmark", "baseline (us)", "current (us)", "change"))
+    for name, old, new, change in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print("%-40s %14.3f %14.3f %+8.1f%%%s" % (name, old * 1e6, new * 1e6, change * 100.0, flag))
+
+    missing = sorted(set(baseline) - set(current))
+    if missing:
+        print("\nNot run: %s" % ", ".join(missing))
+
+    if regressions:
+        print("\n%d benchmark(s) regressed by more than %.0f%%" % (len(regressions), args.threshold * 100.0))
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,10 +29,9 @@ setup(
     version=version["__version__"],
     license="LGPLv3",
     install_requires=[
-        "decorator>=4.3.0",
         "pyreadline>=2.1.0;platform_system==\"Windows\""
     ],
-    python_requires=">=3.6,<4",
+    python_requires=">=3.7,<4",
     description="A typechecking and shell generation program for python APIs",
     author="Arch",
     author_email="info@arch-iot.com",
@@ -41,7 +40,6 @@ setup(
     classifiers=[
         "Programming Language :: Python",
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
@@ -10,15 +10,21 @@
 
 # pylint: disable=unused-argument,redefined-outer-name,missing-docstring
 
+import os
+import decimal
+import datetime
+import fractions
 import pytest
 from typedargs import type_system
 import typedargs
 from typedargs.exceptions import ValidationError, ArgumentError
+from typedargs.statcache import StatCache, stat_cache
 
 
 def test_builtins_exist():
     """Make sure basic builtins are found."""
-    builtin = ['integer', 'int', 'path', 'string', 'str', 'basic_dict', 'dict', 'bool', 'bytes', 'float']
+    builtin = ['integer', 'int', 'path', 'string', 'str', 'basic_dict', 'dict', 'bool', 'bytes', 'float',
+               'datetime', 'date', 'duration']
 
     for type_name in builtin:
         type_system.get_proxy_for_type(type_name)
@@ -65,6 +71,89 @@ def test_annotation_validation():
         function_test(-1)
 
 
+def test_path_validation(tmpdir):
+    """Make sure path validators check the file system through the stat cache."""
+
+    existing = str(tmpdir.join('exists.txt'))
+    missing = str(tmpdir.join('missing.txt'))
+    with open(existing, "w") as outfile:
+        outfile.write("hello")
+
+    @typedargs.param("src", "path", "readable")
+    @typedargs.param("dst", "path", "writeable")
+    def copy(src, dst):  # pylint: disable=C0111,W0613
+        pass
+
+    @typedargs.param("files", "list(path)", "exists")
+    def check(files):  # pylint: disable=C0111,W0613
+        pass
+
+    stat_cache.clear()
+    copy(existing, missing)
+    check([existing] * 20)
+
+    with pytest.raises(ValidationError):
+        copy(missing, missing)
+
+    with pytest.raises(ValidationError):
+        copy(str(tmpdir), missing)
+
+    with pytest.raises(ValidationError):
+        copy(existing, str(tmpdir.join('missing_dir', 'file.txt')))
+
+    with pytest.raises(ValidationError) as exc:
+        check([existing] * 5 + [missing])
+
+    assert "list element 5" in str(exc.value)
+
+
+def test_stat_cache(tmpdir):
+    """Make sure stat results are only reused within a scope and misses are never cached."""
+
+    path = str(tmpdir.join('file.txt'))
+    cache = StatCache()
+
+    with cache.scope():
+        assert cache.stat(path) is None
+        with open(path, "w") as outfile:
+            outfile.write("hello")
+
+        assert cache.is_file(path)
+        assert not cache.is_dir(path)
+        assert cache.is_dir(str(tmpdir))
+        assert cache.access(path, os.R_OK) is True
+
+        os.remove(path)
+        assert cache.is_file(path)
+
+    assert cache.stat(path) is None
+
+    with open(path, "w") as outfile:
+        outfile.write("hello")
+
+    assert cache.stat(path) is not None
+    os.remove(path)
+    assert cache.stat(path) is None
+
+
+def test_path_created_after_failure(tmpdir):
+    """Make sure a path that failed validation is checked again on the next call."""
+
+    path = str(tmpdir.join('later.txt'))
+
+    @typedargs.param("src", "path", "readable", "exists")
+    def read(src):  # pylint: disable=C0111,W0613
+        return src
+
+    with pytest.raises(ValidationError):
+        read(path)
+
+    with open(path, "w") as outfile:
+        outfile.write("hello")
+
+    assert read(path) == path
+
+
 def test_bool_valid():
     """Ensure bool conversion works."""
     val = type_system.convert_to_type('True', 'bool')
@@ -137,3 +226,180 @@ def test_bytes_hexdump_formatting():
     print(val)
 
     assert val == EXPECTED_HEXDUMP
+
+
+def test_datetime_conversion():
+    """Make sure datetimes are converted from ISO-8601, epoch and relative times."""
+
+    utc = datetime.timezone.utc
+    expected = datetime.datetime(2023, 11, 14, 22, 13, 20, tzinfo=utc)
+
+    assert type_system.convert_to_type('2023-11-14T22:13:20Z', 'datetime') == expected
+    assert type_system.convert_to_type('2023-11-14T22:13:20', 'datetime') == expected.replace(tzinfo=None)
+    assert type_system.convert_to_type('1700000000', 'datetime') == expected
+    assert type_system.convert_to_type('1700000000500', 'datetime') == expected + datetime.timedelta(milliseconds=500)
+    assert type_system.convert_to_type(1700000000, datetime.datetime) == expected
+
+    before = datetime.datetime.now(utc)
+    relative = type_system.convert_to_type('-5m', 'datetime')
+    assert before - datetime.timedelta(minutes=5) <= relative <= datetime.datetime.now(utc)
+
+    with pytest.raises(ValidationError):
+        type_system.convert_to_type('yesterday', 'datetime')
+
+
+def test_datetime_format_precedence():
+    """Make sure ambiguous strings convert the same way whatever was converted before."""
+
+    expected = datetime.date(1970, 8, 23)
+
+    for type_obj in ('date', datetime.date):
+        convert = type_system.make_converter(type_obj)
+
+        assert convert('20230101') == expected
+        assert convert('2024-01-02') == datetime.date(2024, 1, 2)
+        assert convert('20230101') == expected
+        assert type_system.convert_to_type('20230101', type_obj) == expected
+
+    convert = type_system.make_converter(datetime.datetime)
+    assert convert('2024-01-02') == datetime.datetime(2024, 1, 2)
+    assert convert('0') == datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    assert convert('20230101').year == 1970
+
+    with pytest.raises(ValidationError):
+        convert('2024-13-01')
+
+
+def test_date_conversion():
+    """Make sure dates are converted and datetimes are truncated."""
+
+    assert type_system.convert_to_type('2024-01-02', 'date') == datetime.date(2024, 1, 2)
+    assert type_system.convert_to_type('2024-01-02T10:00:00', 'date') == datetime.date(2024, 1, 2)
+    assert type_system.convert_to_type('1700000000', 'date') == datetime.date(2023, 11, 14)
+    assert type_system.convert_to_type(datetime.datetime(2024, 1, 2, 5), 'date') == datetime.date(2024, 1, 2)
+
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    assert type_system.convert_to_type('-1d', 'date') in (today - datetime.timedelta(days=1), today)
+
+
+def test_duration_conversion():
+    """Make sure durations are converted from all supported formats."""
+
+    expected = datetime.timedelta(hours=1, minutes=30)
+
+    for value in ['1h30m', '90m', '1.5h', '5400', '1:30:00', 'PT1H30M', 5400]:
+        assert type_system.convert_to_type(value, 'duration') == expected
+
+    assert type_system.convert_to_type('-250ms', 'duration') == datetime.timedelta(milliseconds=-250)
+    assert type_system.convert_to_type('2 days, 0:00:01', 'duration') == datetime.timedelta(days=2, seconds=1)
+
+    for value in ['', 'P', '5x', '1h 30m']:
+        with pytest.raises(ValidationError):
+            type_system.convert_to_type(value, 'duration')
+
+    with pytest.raises(ValueError):
+        type_system.get_proxy_for_type('duration').validate_positive(datetime.timedelta())
+
+
+def test_datetime_out_of_range():
+    """Make sure values outside of the datetime range fail conversion."""
+
+    for value, type_name in [('9' * 30, 'datetime'), ('99999999999999999', 'datetime'), (10**30, 'datetime'),
+                             ('-99999999999s', 'datetime'), ('9' * 30, 'date'), (10**30, 'date'),
+                             ('9' * 20 + 'd', 'duration'), ('9' * 30, 'duration'), (10**30, 'duration')]:
+        with pytest.raises(ValidationError):
+            type_system.convert_to_type(value, type_name)
+
+        assert type_system.try_convert(value, type_name) is None
+
+
+def test_date_truncates_datetime():
+    """Make sure datetimes are never passed through as dates."""
+
+    value = datetime.datetime(2024, 1, 2, 5)
+    expected = datetime.date(2024, 1, 2)
+
+    for convert in (type_system.make_converter(datetime.date), type_system.make_converter('date'),
+                    lambda x: type_system.convert_to_type(x, datetime.date),
+                    lambda x: type_system.try_convert(x, datetime.date)):
+        result = convert(value)
+        assert result == expected
+        assert type(result) is datetime.date  # pylint: disable=unidiomatic-typecheck
+
+    assert type_system.convert_to_type(expected, datetime.date) is expected
+
+
+def test_time_formatting():
+    """Make sure times are formatted as ISO-8601 and epoch values."""
+
+    value = datetime.datetime(2023, 11, 14, 22, 13, 20, 500000, tzinfo=datetime.timezone.utc)
+
+    assert type_system.format_value(value, 'datetime') == '2023-11-14T22:13:20.500000+00:00'
+    assert type_system.format_value(value, 'datetime', 'epoch') == '1700000000.5'
+    assert type_system.format_value(value.replace(microsecond=0, tzinfo=None), 'datetime', 'epoch') == '1700000000'
+    assert type_system.format_value(datetime.date(2024, 1, 2), 'date', 'iso') == '2024-01-02'
+    assert type_system.format_value(datetime.date(1970, 1, 2), 'date', 'epoch') == '86400'
+
+    delta = datetime.timedelta(days=-1, hours=-2, seconds=-1.5)
+    assert type_system.format_value(delta, 'duration') == '-1d2h1s500ms'
+    assert type_system.format_value(delta, 'duration', 'iso') == '-P1DT2H1.5S'
+    assert type_system.format_value(delta, 'duration', 'seconds') == '-93601.5'
+
+    for text in ['-1d2h1s500ms', '-P1DT2H1.5S', '-93601.5']:
+        assert type_system.convert_to_type(text, 'duration') == delta
+
+    assert type_system.json_value(value, 'datetime') == '2023-11-14T22:13:20.500000+00:00'
+    assert type_system.json_value(delta, 'duration') == -93601.5
+
+
+class _Index:
+    """An integer from another library, like numpy.int64, that implements __index__."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __index__(self):
+        return self.value
+
+
+def test_numeric_protocols():
+    """Make sure integer and float accept numbers that are not builtin ints and floats."""
+
+    for type_obj in ('integer', int):
+        assert type_system.convert_to_type(_Index(5), type_obj) == 5
+        assert type_system.convert_to_type(decimal.Decimal('7'), type_obj) == 7
+        assert type_system.convert_to_type(fractions.Fraction(16, 2), type_obj) == 8
+        assert type_system.convert_to_type(9.0, type_obj) == 9
+
+        for value in [decimal.Decimal('7.5'), 2.5, float('inf'), float('nan'), object()]:
+            with pytest.raises(ValidationError):
+                type_system.convert_to_type(value, type_obj)
+
+    for type_obj in ('float', float):
+        assert type_system.convert_to_type(decimal.Decimal('1.25'), type_obj) == 1.25
+        assert type_system.convert_to_type(fractions.Fraction(1, 4), type_obj) == 0.25
+        assert type_system.convert_to_type(3, type_obj) == 3.0
+
+        with pytest.raises(ValidationError):
+            type_system.convert_to_type(10**400, type_obj)
+
+    convert = type_system.make_converter(int)
+    assert convert(_Index(2**40)) == 2**40
+
+
+def test_numeric_range_validators():
+    """Make sure the optional overflow checks work."""
+
+    integer = type_system.get_proxy_for_type('integer')
+    integer.validate_fits(255, 'uint8')
+    integer.validate_fits(-2**63, 'int64')
+
+    for value, int_type in [(256, 'uint8'), (-1, 'uint32'), (2**31, 'int32'), (1, 'int128')]:
+        with pytest.raises(ValueError):
+            integer.validate_fits(value, int_type)
+
+    float_type = type_system.get_proxy_for_type('float')
+    float_type.validate_finite(1e308)
+
+    with pytest.raises(ValueError):
+        float_type.validate_finite(type_system.convert_to_type(decimal.Decimal('1e400'), 'float'))
@@ -0,0 +1,123 @@
+"""Tests for shell tab completion."""
+
+# pylint: disable=unused-argument,redefined-outer-name
+
+import sys
+import enum
+import pytest
+from typedargs import param, context
+from typedargs.shell import HierarchicalShell
+from typedargs.completion import PrefixTrie
+
+
+@param("device", "string", ("list", ["alpha", "beta", "bravo"]))
+@param("force", "bool")
+@param("count", "integer")
+def flash(device, force=False, count=1):
+    """Flash a device."""
+
+
+class Speed(enum.Enum):
+    FAST = 1
+    SLOW = 2
+
+
+@param("speed", "enum(%s.Speed)" % __name__)
+@param("gear", Speed)
+def drive(speed, gear=Speed.SLOW):
+    """Drive somewhere."""
+
+
+@context("Sub")
+class SubContext:
+    """A nested context."""
+
+    @param("value", "integer")
+    def set_value(self, value):
+        """Set a value."""
+
+
+@pytest.fixture
+def shell():
+    """Create a shell with a completer."""
+
+    hshell = HierarchicalShell('Test Shell')
+    hshell.root_add('flash', flash)
+    hshell.root_add('sub', SubContext)
+    hshell.root_add('drive', drive)
+    hshell.root_add('lazy', 'typedargs_nonexistent_module,lazy_func')
+    hshell.enable_completion({'typedargs_nonexistent_module,lazy_func': {'mode': ['fast', 'slow'], 'verbose': None}},
+                             install=False)
+
+    return hshell
+
+
+def test_prefix_trie():
+    """Make sure the trie returns sorted prefix matches."""
+
+    trie = PrefixTrie(['back', 'bar', 'baz', 'foo'])
+    assert len(trie) == 4
+    assert 'bar' in trie
+    assert 'ba' not in trie
+    assert trie.complete('ba') == ('back', 'bar', 'baz')
+    assert trie.complete('bar') == ('bar',)
+    assert trie.complete('q') == ()
+    assert trie.complete('') == ('back', 'bar', 'baz', 'foo')
+
+
+def test_complete_names(shell):
+    """Make sure function, context and builtin names are completed."""
+
+    assert shell.completer.completions('') == ('back', 'cancel', 'drive', 'flash', 'help', 'jobs', 'lazy', 'profile', 'quit', 'spawn', 'stats', 'sub', 'time', 'wait')
+    assert shell.completer.completions('fl') == ('flash',)
+    assert shell.completer.completions('flash 1 -- ') == ('back', 'cancel', 'drive', 'flash', 'help', 'jobs', 'lazy', 'profile', 'quit', 'spawn', 'stats', 'sub', 'time', 'wait')
+
+    shell.root_add('flush', flash)
+    assert shell.completer.completions('fl') == ('flash', 'flush')
+
+
+def test_complete_flags(shell):
+    """Make sure --flag names are completed from parameter names."""
+
+    assert shell.completer.completions('flash --') == ('--count', '--device', '--force')
+    assert shell.completer.completions('flash --f') == ('--force',)
+
+
+def test_complete_values(shell):
+    """Make sure enumerable parameter values are completed."""
+
+    assert shell.completer.completions('flash ') == ('alpha', 'beta', 'bravo')
+    assert shell.completer.completions('flash b') == ('beta', 'bravo')
+    assert shell.completer.completions('flash alpha ') == ('false', 'true')
+    assert shell.completer.completions('flash --force ') == ('false', 'true')
+    assert shell.completer.completions('flash --device=br') == ('--device=bravo',)
+    assert shell.completer.completions('flash alpha true ') == ()
+    assert shell.completer.completions('drive ') == ('FAST', 'SLOW')
+    assert shell.completer.completions('drive --gear S') == ('SLOW',)
+
+
+def test_complete_lazy_entries(shell):
+    """Make sure completion of lazy entries uses the manifest and never imports."""
+
+    assert shell.completer.completions('lazy --') == ('--mode', '--verbose')
+    assert shell.completer.completions('lazy --mode ') == ('fast', 'slow')
+    assert shell.root['lazy'] == 'typedargs_nonexistent_module,lazy_func'
+    assert 'typedargs_nonexistent_module' not in sys.modules
+
+
+def test_complete_context(shell):
+    """Make sure we complete inside of the current context."""
+
+    shell.invoke_string('sub')
+    assert shell.completer.completions('se') == ('set_value',)
+    assert shell.completer.completions('set_value --') == ('--value',)
+
+
+def test_function_index_cache_bounded(shell):
+    """Make sure bound methods share a single cached index."""
+
+    shell.invoke_string('sub')
+    for _ in range(10):
+        assert shell.completer.completions('set_value --') == ('--value',)
+
+    assert len(shell.completer._function_indices) == 1  # pylint: disable=protected-access
@@ -10,11 +10,59 @@
 
 # pylint: disable=unused-argument,redefined-outer-name
 
+import io
+import enum
+import dataclasses
+from typing import List, Optional, Union, NamedTuple, Tuple
 import pytest
-from typedargs import type_system
+from typedargs import type_system, docannotate, typeinfo
 from typedargs.exceptions import ValidationError
 
 
+class Color(enum.Enum):
+    RED = 1
+    GREEN = 'g'
+    LIME = 'g'
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int = 0
+    label: Optional[str] = None
+
+
+@dataclasses.dataclass
+class Coordinate:
+    """A dataclass that is also a type class."""
+
+    x: int
+    y: int
+
+    @classmethod
+    def FromString(cls, value):
+        x, y = value.split(':')
+        return cls(int(x), int(y))
+
+    def __str__(self):
+        return "%d:%d" % (self.x, self.y)
+
+
+class Level(enum.Enum):
+    LOW = 1
+    HIGH = 2
+
+    @classmethod
+    def FromString(cls, value):
+        return cls[value.upper()]
+
+
+class Segment(NamedTuple):
+    start: Point
+    end: Point
+    tags: List[str] = []
+
+
 def test_splitting():
     """Make sure we properly split complex types."""
     base, is_complex, subs = type_system.split_type('map(string, integer)')
@@ -24,6 +72,10 @@ def test_splitting():
     assert subs[0] == 'string'
     assert subs[1] == 'integer'
 
+    base, is_complex, subs = type_system.split_type('map(string, optional(list(integer)))')
+    assert base == 'map'
+    assert subs == ['string', 'optional(list(integer))']
+
 
 def test_map_type():
     """Make sure the map type works."""
@@ -37,6 +89,44 @@ def test_map_formatting():
     formatted = type_system.format_value(val, 'map(string, integer)')
     assert formatted == 'hello: 5'
 
+    assert type_system.format_value({'b': 1, 'a': 2}, 'map(string, integer)', 'json') == '{"b":1,"a":2}'
+
+
+def test_map_conversion():
+    """Make sure maps convert keys and values from JSON and key=value strings."""
+
+    assert type_system.convert_to_type('a=1, b=0x10', 'map(string, integer)') == {'a': 1, 'b': 16}
+    assert type_system.convert_to_type('{"1": [1, 2]}', 'map(integer, list(integer))') == {1: [1, 2]}
+    assert type_system.convert_to_type({'1': '2'}, 'map(integer, integer)') == {1: 2}
+    assert type_system.convert_to_type('', 'map(string, integer)') == {}
+    assert type_system.convert_to_type(None, 'map(string, integer)') is None
+
+    for value in ('a', '[1]', 'a=x', 5):
+        with pytest.raises(ValidationError):
+            type_system.convert_to_type(value, 'map(string, integer)')
+
+
+def test_streamed_formatting():
+    """Make sure dicts can be written to a stream incrementally."""
+
+    val = {'b': 1, 'a': {'x': [1, 2]}}
+
+    for formatter in (None, 'compact', 'sorted'):
+        stream = io.StringIO()
+        type_system.write_value(val, 'basic_dict', stream, formatter)
+        assert stream.getvalue() == type_system.format_value(val, 'basic_dict', formatter)
+
+    assert type_system.format_value(val, 'basic_dict', 'compact') == '{"b":1,"a":{"x":[1,2]}}'
+    assert type_system.format_value(val, 'basic_dict', 'sorted') == '{"a":{"x":[1,2]},"b":1}'
+
+    stream = io.StringIO()
+    type_system.write_value({'b': 1, 'a': 2}, 'map(string, integer)', stream)
+    assert stream.getvalue() == 'b: 1\na: 2'
+
+    stream = io.StringIO()
+    type_system.write_value((1, 2), 'tuple(integer, ...)', stream)
+    assert stream.getvalue() == '(1, 2)'
+
 
 def test_list_type():
     """Make sure the list type works."""
@@ -74,3 +164,221 @@ def test_list_conversion():
 
     out = type_system.convert_to_type(None, 'list(integer)')
     assert out is None
+
+
+def test_trusted_formatting():
+    """Make sure values that already have the right type are formatted without conversion."""
+
+    events = []
+    type_system.hooks.register(events.append)
+
+    try:
+        formatted = type_system.format_trusted_value([[1, 2], [3]], List[List[int]])
+        assert formatted == "1\n2\n3"
+        assert [x.kind for x in events if x.kind == 'convert'] == []
+
+        # Values of the wrong type are still converted
+        assert type_system.format_trusted_value(['0x10', 2], 'list(integer)', 'compact') == "[16, 2]"
+        assert type_system.format_trusted_value(('1', '2'), 'list(integer)', 'compact') == "[1, 2]"
+        assert type_system.format_trusted_value({'a': 1}, 'map(string, integer)') == "a: 1"
+    finally:
+        type_system.hooks.clear()
+
+
+def test_union_types():
+    """Make sure optional and union types convert with the first matching branch."""
+
+    assert type_system.convert_to_type('5', 'optional(integer)') == 5
+    assert type_system.convert_to_type(None, 'optional(integer)') is None
+    assert type_system.convert_to_type('[1, 2]', 'optional(list(integer))') == [1, 2]
+    assert type_system.convert_to_type('0x10', 'union(integer, string)') == 16
+    assert type_system.convert_to_type('abc', 'union(integer, string)') == 'abc'
+    assert type_system.convert_to_type('7', Optional[int]) == 7
+    assert type_system.convert_to_type('abc', Union[int, str]) == 'abc'
+    assert type_system.format_value('abc', 'union(integer, string)') == 'abc'
+    assert type_system.format_value(None, 'optional(integer)') == 'None'
+
+    with pytest.raises(ValidationError):
+        type_system.convert_to_type('abc', 'optional(integer)')
+
+    with pytest.raises(ValueError):
+        type_system.convert_to_type('1', 'optional(integer, string)')
+
+
+def test_union_declared_order():
+    """Make sure the first matching branch wins whatever was converted before."""
+
+    for convert in (type_system.make_converter(Union[int, float]),
+                    lambda value: type_system.convert_to_type(value, Union[int, float])):
+        assert convert(2.0) == 2
+        assert convert(1.5) == 1.5
+        assert isinstance(convert(2.0), int)
+
+    convert = type_system.make_converter(Union[List[int], List[str]])
+    assert convert(['1']) == [1]
+    assert convert(['a']) == ['a']
+    assert convert(['1']) == [1]
+
+    events = []
+    type_system.hooks.register(events.append)
+
+    try:
+        assert type_system.make_converter('union(list(integer), integer)')(7) == 7
+        assert [x.success for x in events if x.type_name == 'list(integer)'] == [False]
+    finally:
+        type_system.hooks.clear()
+
+    with pytest.raises(ValidationError):
+        type_system.make_converter('union(list(integer), integer)')(1.5j)
+
+    proxy = type_system.get_proxy_for_type('union(list(integer), integer)')
+    assert proxy.subtypes == ('list(integer)', 'integer')
+
+
+def test_try_convert_classes(monkeypatch):
+    """Make sure failed class branches return the default without creating a ValidationError."""
+
+    created = []
+
+    class _RecordingError(ValidationError):
+        def __init__(self, *args, **kwargs):
+            created.append(args)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(typeinfo, 'ValidationError', _RecordingError)
+
+    assert type_system.try_convert('abc', int) is None
+    assert type_system.try_convert(1.5j, int, 'x') == 'x'
+    assert type_system.try_convert(5, int) == 5
+    assert type_system.try_convert('1:2', Coordinate) == Coordinate(1, 2)
+    assert type_system.try_convert('1', Coordinate) is None
+    assert type_system.convert_to_type('[1, 2]', Union[int, List[int]]) == [1, 2]
+    assert type_system.convert_to_type('0x10', Union[List[int], int]) == 16
+    assert created == []
+
+
+def test_enum_type():
+    """Make sure enum types look up members by name or value."""
+
+    type_name = 'enum(%s.Color)' % __name__
+
+    assert type_system.convert_to_type('red', type_name) is Color.RED
+    assert type_system.convert_to_type(' Green', type_name) is Color.GREEN
+    assert type_system.convert_to_type('lime', type_name) is Color.GREEN
+    assert type_system.convert_to_type('G', type_name) is Color.GREEN
+    assert type_system.convert_to_type('1', type_name) is Color.RED
+    assert type_system.convert_to_type(1, type_name) is Color.RED
+    assert type_system.convert_to_type(Color.RED, type_name) is Color.RED
+    assert type_system.format_value('green', type_name) == 'GREEN'
+    assert type_system.format_value('green', type_name, 'value') == 'g'
+    assert type_system.json_value(Color.RED, type_name) == 'RED'
+    assert type_system.get_proxy_for_type(type_name).completion_choices() == ('RED', 'GREEN')
+
+    with pytest.raises(ValidationError):
+        type_system.convert_to_type('blue', type_name)
+
+    with pytest.raises(ValueError):
+        type_system.get_proxy_for_type('enum(%s.test_enum_type)' % __name__)
+
+
+def test_enum_annotations():
+    """Make sure Enum subclasses can be used as type annotations."""
+
+    @docannotate
+    def func(color: Color) -> Color:
+        return color
+
+    assert func('RED') is Color.RED
+    assert func(Color.GREEN) is Color.GREEN
+    assert func.metadata.format_returnvalue(Color.GREEN) == 'GREEN'
+    assert type_system.format_trusted_value(Color.RED, Color) == 'RED'
+
+    with pytest.raises(ValidationError):
+        func('blue')
+
+
+def test_record_type():
+    """Make sure dataclasses and NamedTuples convert from dicts, sequences and JSON."""
+
+    type_name = 'record(%s.Point)' % __name__
+
+    assert type_system.convert_to_type('{"x": 1, "y": "0x10"}', type_name) == Point(1, 16)
+    assert type_system.convert_to_type([1, 2, 'a'], type_name) == Point(1, 2, 'a')
+    assert type_system.convert_to_type({'x': '3'}, Point) == Point(3)
+    assert type_system.convert_to_type('[[1, 2], {"x": 3}]', Segment) == Segment(Point(1, 2), Point(3))
+    assert type_system.format_value(Point(1, 2), Point) == '{"x":1,"y":2,"label":null}'
+    assert type_system.json_value(Segment(Point(1), Point(2), ['a']), Segment) == \
+        {'start': {'x': 1, 'y': 0, 'label': None}, 'end': {'x': 2, 'y': 0, 'label': None}, 'tags': ['a']}
+
+    for value in ('{"x": 1, "z": 2}', '{"y": 1}', '[1, 2, "a", 4]', '5', '{"x": "a"}'):
+        with pytest.raises(ValidationError):
+            type_system.convert_to_type(value, Point)
+
+
+def test_record_annotations():
+    """Make sure lists of records convert with compiled field converters."""
+
+    @docannotate
+    def func(points: List[Point]) -> Segment:
+        return Segment(points[0], points[-1])
+
+    points = [{'x': i, 'y': str(i)} for i in range(100)]
+    assert func(points) == Segment(Point(0, 0), Point(99, 99))
+    assert func('[[1], [2, 3]]') == Segment(Point(1), Point(2, 3))
+    assert func.metadata.format_returnvalue(Segment(Point(1), Point(2))) == \
+        '{"start":{"x":1,"y":0,"label":null},"end":{"x":2,"y":0,"label":null},"tags":[]}'
+
+    with pytest.raises(ValidationError):
+        func([{'x': 'a'}])
+
+
+def test_type_classes_not_mapped():
+    """Make sure dataclasses and enums that define FromString keep converting themselves."""
+
+    @docannotate
+    def func(coord: Coordinate, level: Level) -> Coordinate:
+        return Coordinate(coord.x + level.value, coord.y)
+
+    assert func('1:2', 'high') == Coordinate(3, 2)
+    assert func.metadata.format_returnvalue(Coordinate(1, 2)) == '1:2'
+    assert type_system.convert_to_type('1:2', Coordinate) == Coordinate(1, 2)
+    assert type_system.format_value(Coordinate(1, 2), Coordinate) == '1:2'
+
+    # They can still be used as records explicitly
+    type_name = 'record(%s.Coordinate)' % __name__
+    assert type_system.convert_to_type('[1, 2]', type_name) == Coordinate(1, 2)
+    assert type_system.format_value(Coordinate(1, 2), type_name) == '{"x":1,"y":2}'
+
+
+
+def test_tuple_type():
+    """Make sure fixed length and homogeneous tuples convert and format."""
+
+    assert type_system.convert_to_type("(1, 2.0, 'a')", 'tuple(integer, float, string)') == (1, 2.0, 'a')
+    assert type_system.convert_to_type("1, 2.5, a", 'tuple(integer, float, string)') == (1, 2.5, 'a')
+    assert type_system.convert_to_type(['0x10', 2], Tuple[int, int]) == (16, 2)
+    assert type_system.convert_to_type("[1, 2, 3]", 'tuple(integer, ...)') == (1, 2, 3)
+    assert type_system.convert_to_type("()", Tuple[int, ...]) == ()
+    assert type_system.format_value((1, 2.0, 'a'), Tuple[int, float, str]) == "(1, 2.0, a)"
+    assert type_system.json_value((1, 2), 'tuple(integer, ...)') == [1, 2]
+
+    with pytest.raises(ValidationError):
+        type_system.convert_to_type("(1, 2)", 'tuple(integer, float, string)')
+
+    with pytest.raises(ValidationError):
+        type_system.convert_to_type("a, b", 'tuple(integer, ...)')
+
+    with pytest.raises(ValueError):
+        type_system.get_proxy_for_type('tuple(..., integer)')
+
+
+def test_tuple_annotations():
+    """Make sure Tuple annotations convert arguments and format return values."""
+
+    @docannotate
+    def func(point: Tuple[float, float, float]) -> Tuple[float, float, float]:
+        return point
+
+    assert func("1.0, 2, 3.5") == (1.0, 2.0, 3.5)
+    assert func((1.0, "2", 3.5)) == (1.0, 2.0, 3.5)
+    assert func.metadata.format_returnvalue((1.0, 2.0, 3.5)) == "(1.0, 2.0, 3.5)"
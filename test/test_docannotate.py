@@ -9,7 +9,7 @@ from typedargs.exceptions import ValidationError, ArgumentError
 from typedargs.doc_annotate import parse_docstring
 from typedargs.doc_parser import ParsedDocstring
 from typedargs.basic_structures import ParameterInfo
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional, Union
 
 DOCSTRING1 = """Do something.
 
@@ -542,7 +542,7 @@ def test_docstring_validators_parsing():
     assert arg1_validators == [('validate_positive', []), ('validate_range', [1, 5])]
     assert arg2_validators == [('validate_list', [['a', 'b']])]
     assert arg3_validators == [('validate_valid', [None, True, 0.5])]
-    assert arg4_validators == []
+    assert arg4_validators == ()
 
 
 def test_docstring_validators_validation():
@@ -611,10 +611,29 @@ def test_annotations_complex_types():
 
     # check conversion from string
     assert [1, 2, 3] == func_list("[1, 2, 3]")
-    # assert {"foo": 1} == func_dict('{"foo": 1}')  # not supported yet by typedargs/types/map.py:map
+    assert {"foo": 1} == func_dict('{"foo": 1}')
+    assert {"foo": 1, "bar": 2} == func_dict('foo=1,bar=2')
 
     # check default formatting
     assert '1\n2\n3' == func_list.metadata.format_returnvalue([1, 2, 3])
     assert "foo: 1" == func_dict.metadata.format_returnvalue({"foo": 1})
 
 
+def test_annotations_union_types():
+    """Make sure @docannotate supports Optional and Union type annotations."""
+
+    @docannotate
+    def func(arg: Optional[int], other: Union[int, List[int]] = None) -> Optional[int]:
+        return arg
+
+    assert func("3") == 3
+    assert func.metadata.annotated_params['arg'].type_name == 'optional'
+    assert func(None) is None
+    assert func("3", "[1, 2]") == 3
+    assert func.metadata.format_returnvalue(None) == 'None'
+    assert func.metadata.format_returnvalue(5) == '5'
+
+    with pytest.raises(ValidationError):
+        func("abc")
+
+
@@ -0,0 +1,105 @@
+"""Tests for type system instrumentation hooks."""
+
+# pylint: disable=redefined-outer-name
+
+import pytest
+from typedargs import typeinfo, types, param
+from typedargs.exceptions import ValidationError
+from typedargs.hooks import HookRegistry, TypeTimingAggregator
+
+
+@pytest.fixture
+def type_system(monkeypatch):
+    """Use a fresh type system so hooks do not leak between tests."""
+
+    system = typeinfo.TypeSystem(types)
+    monkeypatch.setattr(typeinfo, 'type_system', system)
+    return system
+
+
+def test_inactive_by_default(type_system):
+    """Make sure no hooks are active until one is registered."""
+
+    assert type_system.hooks.active is False
+
+    events = []
+    hook = type_system.hooks.register(events.append)
+    assert type_system.hooks.active is True
+
+    type_system.hooks.unregister(hook)
+    assert type_system.hooks.active is False
+
+    type_system.convert_to_type('1', 'integer')
+    assert events == []
+
+
+def test_convert_and_format_events(type_system):
+    """Make sure conversion and formatting fire events with type names."""
+
+    events = []
+    type_system.hooks.register(events.append)
+
+    assert type_system.convert_to_type('0x10', 'integer') == 16
+    assert events[-1].kind == HookRegistry.CONVERT
+    assert events[-1].type_name == 'integer'
+    assert events[-1].success is True
+    assert events[-1].duration >= 0.0
+
+    with pytest.raises(ValidationError):
+        type_system.convert_to_type('hello', 'integer')
+
+    assert events[-1].success is False
+
+    del events[:]
+    assert type_system.format_value(16, 'integer', 'hex') == '0x10'
+    assert [(x.kind, x.type_name) for x in events] == [('convert', 'integer'), ('format', 'integer')]
+    assert events[-1].detail == 'hex'
+
+
+def test_validator_events(type_system):
+    """Make sure each validator fires an event named after it."""
+
+    @param("value", "integer", "positive")
+    def func(value):
+        return value
+
+    events = []
+    type_system.hooks.register(events.append)
+
+    func(5)
+    assert [(x.kind, x.type_name, x.detail, x.success) for x in events if x.kind == 'validate'] == [('validate', 'integer', 'validate_positive', True)]
+
+    with pytest.raises(ValidationError):
+        func(-1)
+
+    assert events[-1].kind == 'validate'
+    assert events[-1].success is False
+
+
+def test_aggregator(type_system):
+    """Make sure the aggregator reports types by cumulative time."""
+
+    aggregator = type_system.hooks.register(TypeTimingAggregator())
+
+    for _i in range(10):
+        type_system.convert_to_type('1', 'integer')
+
+    type_system.convert_to_type('["1", "2"]', 'list(integer)')
+
+    top = aggregator.top()
+    names = [x[0] for x in top]
+    assert 'integer' in names
+    assert 'list(integer)' in names
+
+    calls = {(x[0], x[1]): x[2] for x in top}
+    assert calls[('list(integer)', 'convert')] == 1
+    assert calls[('integer', 'convert')] >= 10
+
+    assert [x[4] for x in top] == sorted([x[4] for x in top], reverse=True)
+    assert len(aggregator.top(1)) == 1
+
+    table = aggregator.format()
+    assert table.splitlines()[0].split()[0] == 'type'
+
+    aggregator.reset()
+    assert aggregator.top() == []
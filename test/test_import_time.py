@@ -0,0 +1,60 @@
+"""Make sure importing typedargs stays cheap."""
+
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _imported_modules(code):
+    """Run code in a fresh interpreter and return the modules it imported."""
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+
+        modules.add(line.split('|')[-1].strip())
+
+    return modules
+
+
+def test_import_package():
+    """Importing the package should not import any of its submodules."""
+
+    modules = _imported_modules('import typedargs')
+
+    assert 'typedargs' in modules
+    assert 'typedargs.annotate' not in modules
+    assert 'typedargs.typeinfo' not in modules
+    assert 'typedargs.types' not in modules
+
+
+def test_import_decorator():
+    """Decorating a function should not import types or the docstring parser."""
+
+    modules = _imported_modules('from typedargs import param\n'
+                                '@param("a", "integer")\n'
+                                'def func(a):\n'
+                                '    pass\n')
+
+    assert 'typedargs.annotate' in modules
+    assert 'typedargs.types' not in modules
+    assert 'typedargs.doc_parser' not in modules
+    assert 'typedargs.terminal' not in modules
+
+
+def test_types_loaded_on_first_use():
+    """Make sure the builtin types are loaded once a type is needed."""
+
+    modules = _imported_modules('from typedargs import param\n'
+                                '@param("a", "integer")\n'
+                                'def func(a):\n'
+                                '    return a\n'
+                                'assert func("0x10") == 16\n')
+
+    assert 'typedargs.types' in modules
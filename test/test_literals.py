@@ -0,0 +1,61 @@
+"""Tests for the bounded literal parser."""
+
+import ast
+import pytest
+from typedargs import type_system
+from typedargs.exceptions import ValidationError
+from typedargs.literals import parse_literal, LiteralSyntaxError
+
+
+@pytest.mark.parametrize("text", [
+    "[1, 2, 3]", "[]", "()", "(1,)", "(1)", "1, 2", "1,", "[1, 2,]", "  [ 1 ,2 ] ",
+    "0x10", "-0x10", "+5", "-3", "0b101", "0o17", "1_000", "-2.5e3", ".5", "5.", "1e5",
+    "True", "None", "[True, False, None]", "['a', 'b']", "'a\\nb'", '"x\'y"', "'é'",
+    "[[1], [2, [3]]]", "{}", "{1, 2}", "{1}", "{'a': 1, 'b': [2, (3, 4)],}", "{'a': {'b': {}}}",
+])
+def test_matches_literal_eval(text):
+    """Make sure supported literals parse exactly like ast.literal_eval."""
+
+    # Before python 3.10 literal_eval rejects leading whitespace
+    expected = ast.literal_eval(text.strip())
+    parsed = parse_literal(text)
+
+    assert parsed == expected
+    assert type(parsed) == type(expected)  # pylint: disable=unidiomatic-typecheck
+
+
+@pytest.mark.parametrize("text", [
+    "", "[1 2]", "[1,,2]", "abc", "__import__('os')", "[1", "1]", "{1: 2, 3}", "{[1]: 2}",
+    "{[1]}", "010", "(,)", "1 + 2", "b'x'", "{1:}", "{,}", "1.2.3",
+])
+def test_invalid_literals(text):
+    """Make sure anything that is not a supported literal is rejected."""
+
+    with pytest.raises(LiteralSyntaxError):
+        parse_literal(text)
+
+
+def test_limits():
+    """Make sure long and deeply nested input is rejected."""
+
+    with pytest.raises(LiteralSyntaxError):
+        parse_literal("[1, 2, 3]", max_length=5)
+
+    assert parse_literal("[[[1]]]", max_depth=3) == [[[1]]]
+    with pytest.raises(LiteralSyntaxError):
+        parse_literal("[[[[1]]]]", max_depth=3)
+
+    with pytest.raises(LiteralSyntaxError):
+        parse_literal("[" * 10000 + "]" * 10000)
+
+
+def test_list_conversion():
+    """Make sure list conversion uses the bounded parser."""
+
+    assert type_system.convert_to_type("[1, 0x10, 3]", 'list(integer)') == [1, 16, 3]
+
+    with pytest.raises(ValidationError):
+        type_system.convert_to_type("[" * 10000 + "]" * 10000, 'list(integer)')
+
+    with pytest.raises(ValidationError):
+        type_system.convert_to_type("[1, __import__('os')]", 'list(integer)')
@@ -1,8 +1,15 @@
 """Tests of metadata extraction functionality."""
 
+import re
+import sys
+import inspect
 import pytest
+from typedargs import param
+from typedargs.types import string
 from typedargs.metadata import AnnotatedMetadata
-from typedargs.exceptions import ValidationError, ArgumentError
+from typedargs.basic_structures import EMPTY_VALIDATORS
+from typedargs.memory import measure_package, metadata_size, format_report
+from typedargs.exceptions import ValidationError, ArgumentError, TypeSystemError
 
 
 @pytest.fixture
@@ -27,3 +34,130 @@ def test_spec_check(func1):
 
     with pytest.raises(ArgumentError):
         func1.check_spec([1])
+
+
+def test_bind_arguments(func1):
+    """Make sure arguments are bound in order with defaults filled in."""
+
+    assert func1.spec_filled([1, 2], {})
+    assert func1.spec_filled([1], {'stream': 2})
+    assert func1.spec_filled([], {'stream': 2, 'group': 1, 'x': 3})
+    assert not func1.spec_filled([1], {'x': 2})
+
+    bound = func1.bind_arguments([1], {'stream': 2, 'x': 5})
+    assert bound.values == [1, 2, False, 5]
+    assert list(bound.items()) == [('group', 1), ('stream', 2), ('domain', False), ('x', 5)]
+
+    with pytest.raises(ArgumentError):
+        func1.bind_arguments([1, 2, 3, 4, 5])
+
+    with pytest.raises(ArgumentError):
+        func1.bind_arguments([1, 2], {'unknown': 3})
+
+    with pytest.raises(ArgumentError):
+        func1.bind_arguments([], {'stream': 2})
+
+
+def test_typed_wrapper():
+    """Make sure annotated wrappers keep the signature and convert every argument."""
+
+    @param("count", "integer", "positive")
+    @param("force", "bool")
+    def _flash(count, force='false', name="dev"):
+        """Flash a device."""
+        return count, force, name
+
+    assert _flash.__name__ == '_flash'
+    assert _flash.__doc__ == "Flash a device."
+    assert str(inspect.signature(_flash)) == "(count, force='false', name='dev')"
+    assert inspect.unwrap(_flash) is not _flash
+
+    assert _flash('0x10') == (16, False, 'dev')
+    assert _flash(force='true', count='2') == (2, True, 'dev')
+
+    with pytest.raises(ValidationError):
+        _flash('-1')
+
+    with pytest.raises(TypeError):
+        _flash(1, True, 'dev', 'extra')
+
+    _flash.metadata.add_param("name", None, "string", [("validate_list", [["dev", "prod"]])])
+    assert _flash(1, name='prod') == (1, False, 'prod')
+
+    with pytest.raises(ValidationError):
+        _flash(1, name='other')
+
+
+
+def test_prepared_validators(monkeypatch):
+    """Make sure validator arguments are prepared once per parameter."""
+
+    @param("serial", "string", ("fullmatch", r"[A-Z]{2}\d{4}"))
+    @param("prefix", "string", ("match", "dev-"))
+    @param("env", "string", ("list", ["dev", "prod"]))
+    def _device(serial, prefix="dev-1", env="dev"):
+        return serial, prefix, env
+
+    calls = []
+    monkeypatch.setattr(string, 'prepare_fullmatch', lambda pattern: calls.append(pattern) or (re.compile(pattern),))
+
+    assert _device("AB1234") == ("AB1234", "dev-1", "dev")
+    assert _device("CD5678", "dev-abc", "prod") == ("CD5678", "dev-abc", "prod")
+    assert calls == [r"[A-Z]{2}\d{4}"]
+
+    for args in [("AB12345",), ("AB1234", "prod-1"), ("AB1234", "dev-1", "test")]:
+        with pytest.raises(ValidationError):
+            _device(*args)
+
+    @param("serials", "list(string)", ("fullmatch", "[0-9]+"))
+    @param("tag", "string", ("match", "("))
+    def _bad(serials, tag=None):
+        return serials
+
+    with pytest.raises(ValidationError):
+        _bad(["12", "3a"])
+
+    with pytest.raises(ValidationError):
+        _bad(["12"], "x")
+
+
+def test_lazy_signature():
+    """Make sure the signature is only inspected when it is needed."""
+
+    @param("value", "integer")
+    @param("extra", "string")
+    def _lazy(self, value, *extra, flag):
+        return value
+
+    assert _lazy.metadata._spec is None  # pylint: disable=protected-access
+
+    with pytest.raises(TypeSystemError):
+        _lazy.metadata.add_param("flag", None, "bool", [])
+
+    with pytest.raises(TypeSystemError):
+        _lazy.metadata.add_param("missing", None, "bool", [])
+
+    assert _lazy.metadata._spec is None  # pylint: disable=protected-access
+
+    assert _lazy.metadata.arg_names == ['value']
+    assert _lazy.metadata.varargs == 'extra'
+    assert _lazy.metadata.signature() == "_lazy(integer value)"
+    assert _lazy.metadata._spec is not None  # pylint: disable=protected-access
+
+
+@param("value", "integer")
+def _measured(value):
+    return value
+
+
+def test_metadata_memory():
+    """Make sure we can measure metadata memory and that it is compact."""
+
+    assert not hasattr(_measured.metadata, '__dict__')
+    assert _measured.metadata.annotated_params['value'].validators is EMPTY_VALIDATORS
+
+    report = measure_package(sys.modules[__name__])
+    assert report.functions >= 1
+    assert report.total_bytes >= metadata_size(_measured.metadata)
+    assert report.by_module[__name__] == report.total_bytes
+    assert format_report(report).splitlines()[-1].startswith("%d annotated object(s)" % report.functions)
@@ -10,7 +10,9 @@
 
 # pylint: disable=unused-argument,redefined-outer-name
 
+import io
 import typedargs
+from typedargs.basic_structures import ReturnInfo
 
 
 def test_simplereturntype():
@@ -37,6 +39,23 @@ def test_complexreturntype():
     assert formed == "hello: 5"
 
 
+def test_write_returnvalue():
+    """Make sure return values can be written to a stream."""
+
+    @typedargs.return_type("basic_dict", "compact")
+    def returns_dict():  # pylint: disable=C0111,W0613
+        return {"hello": 5}
+
+    @typedargs.stringable
+    def returns_stringable(): # pylint: disable=C0111,W0613
+        return True
+
+    stream = io.StringIO()
+    assert returns_dict.metadata.write_returnvalue(returns_dict(), stream) is True
+    assert returns_stringable.metadata.write_returnvalue(True, stream) is True
+    assert stream.getvalue() == '{"hello":5}True'
+
+
 def test_stringable_returnvalue():
     """Make sure stringable works."""
 
@@ -47,3 +66,38 @@ def test_stringable_returnvalue():
     val = returns_stringable()
     formed = returns_stringable.metadata.format_returnvalue(val)
     assert formed == "True"
+
+
+def test_cached_formatters():
+    """Make sure formatters are resolved once and re-resolved when the return info changes."""
+
+    calls = []
+
+    def _printer(value):
+        calls.append(value)
+        return "value=%s" % value
+
+    @typedargs.returns(printer=_printer)
+    def returns_custom():  # pylint: disable=C0111,W0613
+        return 1
+
+    assert returns_custom.metadata.format_returnvalue(1) == "value=1"
+    assert returns_custom.metadata.format_returnvalue(2) == "value=2"
+    assert calls == [1, 2]
+
+    @typedargs.returns(printer=lambda: "constant")
+    def returns_constant():  # pylint: disable=C0111,W0613
+        return 1
+
+    assert returns_constant.metadata.format_returnvalue(1) == "constant"
+
+    returns_constant.metadata.typed_returnvalue("integer", "hex")
+    assert returns_constant.metadata.format_returnvalue(16) == "0x10"
+    assert returns_constant.metadata.format_returnvalue(17) == "0x11"
+
+    class _Formattable:
+        def format_short(self):  # pylint: disable=C0111,R0201
+            return "short"
+
+    returns_constant.metadata.return_info = ReturnInfo(None, None, ("short", []), True, None)
+    assert returns_constant.metadata.format_returnvalue(_Formattable()) == "short"
@@ -2,10 +2,17 @@
 
 # pylint: disable=unused-argument,redefined-outer-name
 
+import io
+import os
+import json
+import functools
+import threading
 import pytest
 from typedargs import param, return_type, context, annotated, stringable
 from typedargs.shell import HierarchicalShell
-from typedargs.exceptions import ValidationError
+from typedargs.typeinfo import type_system
+from typedargs.timing import PhaseTimer
+from typedargs.exceptions import ValidationError, ArgumentError, NotFoundError
 
 
 @param("arg1", "integer")
@@ -122,8 +129,15 @@ Defined Functions:
 
 Builtin Functions
  - back
+ - cancel
  - help
+ - jobs
+ - profile
  - quit
+ - spawn
+ - stats
+ - time
+ - wait
 
 """
     assert remained == []
@@ -168,7 +182,7 @@ def test_valid_identifiers(shell):
     """Regression test failed dict key addition on python 3."""
 
     idents = shell.valid_identifiers()
-    assert sorted(idents) == sorted(['func', 'func2', 'demo', 'back', 'help', 'quit'])
+    assert sorted(idents) == sorted(['func', 'func2', 'demo', 'back', 'help', 'quit', 'spawn', 'jobs', 'wait', 'cancel', 'time', 'profile', 'stats'])
 
 def test_negative_numbers(shell):
     """Make sure we correctly handle negative numbers not as flags."""
@@ -182,3 +196,261 @@ def test_equals_in_flag(shell):
 
     finished = shell.invoke_string("func 1 --arg2=name=value --")
     assert finished is True
+
+
+def test_init_commands(shell):
+    """Make sure init commands run when the context path ends with their key."""
+
+    calls = []
+
+    @param("name", "string")
+    def record(name):
+        calls.append(name)
+
+    shell.add_builtin('record', record)
+    shell.init_commands['Test'] = ['back']
+    shell.init_commands['root.Test'] = ['record --name=first']
+
+    shell.invoke_string('demo 1')
+    assert len(shell.contexts) == 1
+
+    shell.init_commands['st'] = ['record --name=suffix']
+    shell.init_commands['other'] = ['record --name=unused']
+    del shell.init_commands['Test']
+
+    shell.invoke_string('demo 1')
+    assert len(shell.contexts) == 2
+    assert shell.context_name() == 'Test'
+
+    # In place modification of commands must also be picked up
+    shell.init_commands['st'].append('record --name=appended')
+    shell.invoke_string('back demo 1')
+
+    assert calls == ['first', 'first', 'suffix', 'first', 'suffix', 'appended']
+
+
+def test_background_jobs(shell):
+    """Make sure commands can run in the background and be waited on."""
+
+    event = threading.Event()
+
+    @param("value", "integer")
+    @return_type("integer", "hex")
+    def blocking(value):
+        event.wait(5)
+        return value
+
+    shell.root_add('blocking', blocking)
+
+    assert shell.invoke_string('blocking 10 &') is True
+    val, _remained, _finished = shell.invoke_one('spawn func 1 -f'.split(' '))
+    assert val == "[2] func 1 -f"
+
+    jobs = shell.job_manager.jobs()
+    assert [x.id for x in jobs] == [1, 2]
+
+    event.set()
+    val, _remained, _finished = shell.invoke_one(['wait'])
+    assert val == "[1] done  blocking 10\n0xA\n[2] done  func 1 -f\n(1, True, 'hello')"
+    assert shell.job_manager.jobs() == []
+
+    with pytest.raises(ArgumentError):
+        shell.invoke_one('spawn back'.split(' '))
+
+    with pytest.raises(ArgumentError):
+        shell.invoke_one('spawn func 1 func2'.split(' '))
+
+    with pytest.raises(ValidationError):
+        shell.invoke_one('spawn func abc'.split(' '))
+
+    assert shell.job_manager.jobs() == []
+
+
+def test_quit_shuts_down_jobs(shell):
+    """Make sure background jobs are waited for when the shell exits."""
+
+    job = shell.spawn('func 1 -f'.split(' '))
+    shell.invoke_string('quit')
+
+    assert shell.finished()
+    assert job.future.done()
+    assert shell.job_manager._executor is None  # pylint: disable=protected-access
+
+
+def test_jsonl_output(shell):
+    """Make sure results can be streamed as JSON lines."""
+
+    @return_type("map(string, bytes)")
+    def get_blobs():
+        return {'a': b'\xab\xcd'}
+
+    @annotated
+    def fail():
+        raise RuntimeError("broken")
+
+    shell.root_add('blobs', get_blobs)
+    shell.root_add('fail', fail)
+
+    stream = io.StringIO()
+    shell.set_output_mode('jsonl', stream)
+
+    val, _remainder, _finished = shell.invoke_one('func 1 -f --arg2=x'.split(' '))
+    assert val is None
+
+    shell.invoke_string('blobs demo 2 get_arg back')
+
+    with pytest.raises(ValidationError):
+        shell.invoke_string('demo hello')
+
+    with pytest.raises(RuntimeError):
+        shell.invoke_string('fail')
+
+    shell.invoke_string('demo 2')
+
+    records = [json.loads(x) for x in stream.getvalue().splitlines()]
+    assert [x['function'] for x in records] == ['func', 'blobs', 'demo', 'get_arg', 'back', 'demo', 'fail', 'demo']
+    assert records[0]['args'] == ['1']
+    assert records[0]['kwargs'] == {'force': True, 'arg2': 'x'}
+    assert records[0]['result'] == "(1, True, 'x')"
+    assert records[1]['result'] == {'a': 'abcd'}
+    assert records[2]['result'] is None
+    assert records[3]['result'] == 2
+    assert records[5]['error']['type'] == 'ValidationError'
+    assert records[6]['error'] == {'reason': 'broken', 'type': 'RuntimeError', 'params': {}}
+    assert all(x['duration'] >= 0 for x in records)
+
+    shell.set_output_mode('text')
+    val, _remainder, _finished = shell.invoke_one(['get_arg'])
+    assert val == '0x2'
+
+
+
+def test_streamed_text_output(shell, capsys):
+    """Make sure interactive shells write results straight to stdout."""
+
+    @return_type("basic_dict", "sorted")
+    def get_dict():
+        return {'b': 1, 'a': [1, 2]}
+
+    shell.root_add('get_dict', get_dict)
+
+    stream = io.StringIO()
+    val, _remainder, _finished = shell.invoke_one(['get_dict'], stream)
+    assert val is None
+    assert stream.getvalue() == '{"a":[1,2],"b":1}\n'
+
+    type_system.interactive = True
+    try:
+        shell.invoke_string('get_dict func 1')
+    finally:
+        type_system.interactive = False
+
+    assert capsys.readouterr().out == '{"a":[1,2],"b":1}\n(1, False, \'hello\')\n'
+
+
+def test_builtin_time(shell):
+    """Make sure the time builtin reports each phase and runs the commands."""
+
+    val, _remained, finished = shell.invoke_one('time demo 2 get_arg'.split(' '))
+    assert finished is True
+    assert len(shell.contexts) == 2
+
+    lines = val.splitlines()
+    assert [x.split()[0] for x in lines[1:-1]] == ['parse', 'convert', 'execute', 'format', 'total']
+    assert lines[-1] == '2 invocation(s)'
+
+    with pytest.raises(ValidationError):
+        shell.invoke_one('time back demo -1'.split(' '))
+
+
+def test_builtin_time_decorators(shell):
+    """Make sure time runs the decorators that a function was defined with."""
+
+    calls = []
+
+    def _double(inner):
+        @functools.wraps(inner)
+        def _wrapper(value):
+            return inner(value * 2)
+
+        return _wrapper
+
+    @param("value", "integer")
+    @return_type("integer")
+    @_double
+    def doubled(value):
+        calls.append(value)
+        return value
+
+    shell.root_add('doubled', doubled)
+
+    val, _remained, _finished = shell.invoke_one(['doubled', '3'])
+    assert val == '6'
+
+    shell.invoke_one(['time', 'doubled', '3'])
+    assert calls == [6, 6]
+
+
+def test_invoke_one_timer(shell):
+    """Make sure a timer passed to invoke_one times the same call that is recorded in metrics."""
+
+    timer = PhaseTimer()
+
+    val, _remained, _finished = shell.invoke_one(['func', '1', '2'], timer=timer)
+    assert val is not None
+    assert timer.count == 1
+    assert timer.wall['execute'] > 0.0
+    assert shell.metrics.get('func').calls == 1
+
+
+def test_builtin_profile(shell, tmpdir):
+    """Make sure the profile builtin reports and saves profile entries."""
+
+    output = str(tmpdir.join('out.prof'))
+
+    val, _remained, _finished = shell.invoke_one(['profile', '--limit=5', '--output=' + output, 'func', '1'])
+    assert 'function calls' in val
+    assert os.path.isfile(output)
+
+    with pytest.raises(ArgumentError):
+        shell.invoke_one('profile --unknown=1 func 1'.split(' '))
+
+    with pytest.raises(ArgumentError):
+        shell.invoke_one('profile --sort=bogus func 1'.split(' '))
+
+
+def test_invocation_metrics(shell, tmpdir):
+    """Make sure calls, errors and latencies are recorded per function."""
+
+    shell.invoke_string('func 1')
+    shell.invoke_string('func 2')
+
+    with pytest.raises(ValidationError):
+        shell.invoke_string('demo -1')
+
+    with pytest.raises(NotFoundError):
+        shell.invoke_string('missing')
+
+    func_metrics = shell.metrics.get('func')
+    assert func_metrics.calls == 2
+    assert func_metrics.error_count == 0
+    assert sum(func_metrics.bucket_counts) == 2
+
+    assert shell.metrics.get('demo').errors == {'ValidationError': 1}
+    assert shell.metrics.get(shell.UNKNOWN_FUNCTION).errors == {'NotFoundError': 1}
+
+    val, _remained, _finished = shell.invoke_one(['stats'])
+    assert any(x.split()[:3] == ['func', '2', '0'] for x in val.splitlines())
+
+    path = str(tmpdir.join('metrics.prom'))
+    shell.invoke_string('stats save ' + path)
+
+    with open(path, "r") as infile:
+        exported = infile.read()
+
+    assert 'typedargs_shell_calls_total{function="func"} 2' in exported
+    assert 'typedargs_shell_errors_total{function="demo",error="ValidationError"} 1' in exported
+    assert 'typedargs_shell_latency_seconds_bucket{function="func",le="+Inf"} 2' in exported
+
+    shell.invoke_string('stats reset')
+    assert shell.metrics.get('func') is None
@@ -1,5 +1,5 @@
 import sys
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
 from typedargs import utils
 
 
@@ -13,6 +13,12 @@ def test_get_typing_type_name():
     assert 'Dict' == utils.get_typing_type_name(Dict)
     assert 'Dict' == utils.get_typing_type_name(Dict[str, int])
 
+    if sys.version_info >= (3, 7):
+        assert 'Optional' == utils.get_typing_type_name(Optional[int])
+        assert 'Union' == utils.get_typing_type_name(Union[int, str])
+        assert 'Optional' == utils.get_typing_type_name(Union[int, None])
+        assert 'Union' == utils.get_typing_type_name(Union[int, str, None])
+
 
 def test_get_typing_type_args():
     """Make sure we can get a correct type arguments of a type from typing module.
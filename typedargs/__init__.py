@@ -8,9 +8,40 @@
 # Modifications to this file from the original created at WellDone International
 # are copyright Arch Systems Inc.
 
-# External API functions from this package
+# External API functions from this package.  They are imported on first
+# access (PEP 562) so that importing typedargs itself stays cheap and each
+# decorator only pulls in the modules that it needs.
 
-from typedargs.annotate import (docannotate, param, returns, context, finalizer,
-                                takes_cmdline, annotated, return_type, stringable)
-from typedargs.typeinfo import type_system, iprint
-from .version import __version__
\ No newline at end of file
+import sys
+from .version import __version__
+
+_LAZY_ATTRIBUTES = {
+    'docannotate': 'typedargs.annotate',
+    'param': 'typedargs.annotate',
+    'returns': 'typedargs.annotate',
+    'context': 'typedargs.annotate',
+    'finalizer': 'typedargs.annotate',
+    'takes_cmdline': 'typedargs.annotate',
+    'annotated': 'typedargs.annotate',
+    'return_type': 'typedargs.annotate',
+    'stringable': 'typedargs.annotate',
+    'type_system': 'typedargs.typeinfo',
+    'iprint': 'typedargs.typeinfo'
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES) + ['__version__']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    __import__(module_name)
+    value = getattr(sys.modules[module_name], name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
\ No newline at end of file
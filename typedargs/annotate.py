@@ -9,9 +9,9 @@
 # are copyright Arch Systems Inc.
 
 import inspect
-from decorator import decorate
+import functools
 from typedargs.exceptions import ArgumentError
-from typedargs.utils import find_all, _check_and_execute, _parse_validators, context_name
+from typedargs.utils import find_all, _parse_validators, context_name
 from typedargs.metadata import AnnotatedMetadata
 from typedargs.typeinfo import type_system  #pylint: disable=W0611; this is needed for backward compatibility
 
@@ -116,6 +116,10 @@ def param(name, type_name, *validators, **kwargs):
             as extra arguments to the validator function, which is called as:
 
             validator(value, \\*extra_args)
+
+            If the type also has a prepare_name function, it is called once
+            with extra_args and returns the arguments actually passed to the
+            validator, for example compiled regular expressions.
         desc (string): An optional descriptioon for this parameter that must be
             passed as a keyword argument.
 
@@ -134,7 +138,7 @@ def param(name, type_name, *validators, **kwargs):
             return func
 
         func.decorated = True
-        return decorate(func, _check_and_execute)
+        return _typed_wrapper(func)
 
     return _param
 
@@ -154,7 +158,7 @@ def returns(desc=None, printer=None, data=True):
 
     def _returns(func):
         annotated(func)
-        func.custom_returnvalue(printer, desc)
+        func.metadata.custom_returnvalue(printer, desc)
         return func
 
     return _returns
@@ -265,10 +269,10 @@ def docannotate(func):
     func.decorated = True
 
     if cls:
-        setattr(cls, '__init__', decorate(func, _check_and_execute))
+        setattr(cls, '__init__', _typed_wrapper(func))
         return cls
 
-    return decorate(func, _check_and_execute)
+    return _typed_wrapper(func)
 
 
 def annotated(func, name=None):
@@ -300,6 +304,48 @@ def annotated(func, name=None):
     return func
 
 
+def _typed_wrapper(func):
+    """Wrap an annotated function so that its arguments are converted on every call.
+
+    The wrapper copies the function's attributes, including its metadata, and
+    points to it through __wrapped__ so that inspect.signature() reports the
+    original signature.  Each call binds the arguments and converts them
+    using the conversion plan cached in the function's metadata.
+    """
+
+    convert_call = func.metadata.convert_call
+
+    @functools.wraps(func)
+    def _call_typed(*args, **kwargs):
+        convargs, convkw = convert_call(args, kwargs)
+        return func(*convargs, **convkw)
+
+    _call_typed.__defaults__ = func.__defaults__
+    _call_typed.__kwdefaults__ = func.__kwdefaults__
+    return _call_typed
+
+
+# Every typed wrapper shares the code object of _call_typed, which identifies
+# them even when decorators applied on top of them copy their attributes
+_TYPED_WRAPPER_CODE = next(x for x in _typed_wrapper.__code__.co_consts if inspect.iscode(x))
+
+
+def unwrap_typed(func):
+    """Get the function called by a typed wrapper.
+
+    Only the wrapper added by typedargs is removed, any decorators that the
+    function was defined with are kept.
+
+    Returns:
+        callable: The wrapped function or func itself if it is not a typed wrapper.
+    """
+
+    if getattr(func, '__code__', None) is _TYPED_WRAPPER_CODE:
+        return func.__wrapped__
+
+    return func
+
+
 def short_description(func):
     """
     Given an object with a docstring, return the first line of the docstring
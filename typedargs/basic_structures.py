@@ -1,6 +1,19 @@
 """Basic structures used to describe parameters and return values."""
+import sys
 from typing import Optional
 
+# Most parameters have no validators so they all share this empty sequence
+EMPTY_VALIDATORS = ()
+
+
+def intern_type_name(type_name):
+    """Intern a type name so that all parameters of the same type share one string."""
+
+    if isinstance(type_name, str):
+        return sys.intern(type_name)
+
+    return type_name
+
 
 class ParameterInfo:
     """
@@ -10,11 +23,14 @@ class ParameterInfo:
         validators: list of validators
         desc: parameter description
     """
+
+    __slots__ = ('type_class', 'type_name', 'validators', 'desc')
+
     def __init__(self, type_class: Optional[type], type_name: Optional[str], validators: Optional[list], desc: Optional[str]):
 
         self.type_class = type_class
-        self.type_name = type_name
-        self.validators = validators
+        self.type_name = intern_type_name(type_name)
+        self.validators = validators if validators else EMPTY_VALIDATORS
         self.desc = desc
 
     def __eq__(self, other):
@@ -41,10 +57,13 @@ class ReturnInfo:
         is_data: True if annotated function returns any data
         desc: parameter description
     """
+
+    __slots__ = ('type_class', 'type_name', 'formatter', 'is_data', 'desc')
+
     def __init__(self, type_class: Optional[type], type_name: Optional[str], formatter: Optional[tuple], is_data: Optional[bool], desc: Optional[str]):
 
         self.type_class = type_class
-        self.type_name = type_name
+        self.type_name = intern_type_name(type_name)
         self.formatter = formatter
         self.is_data = is_data
         self.desc = desc
@@ -0,0 +1,432 @@
+"""Tab completion support for HierarchicalShell.
+
+Completions are served from prefix tries that are built once per context
+and once per function so that each keystroke only has to walk the
+characters that the user has typed so far.  Building the indices never
+resolves lazily loaded entries, so completion will not trigger any of
+the imports that HierarchicalShell defers until a function is invoked.
+"""
+
+from typedargs import utils
+from typedargs.exceptions import KeyValueException
+from typedargs.typeinfo import type_system
+
+
+class _TrieNode:
+    """A single node in a PrefixTrie."""
+
+    def __init__(self):
+        self.children = {}
+        self.word = None
+        self.matches = None
+
+
+class PrefixTrie:
+    """An immutable character trie that returns all words sharing a prefix.
+
+    The sorted list of words below each node is computed the first time
+    that node is queried and then cached, so repeated lookups of the
+    same prefix (as happens while a user is typing) cost only a walk
+    down the trie.
+
+    Args:
+        words (iterable(str)): The words that should be stored in the trie.
+    """
+
+    def __init__(self, words=()):
+        self._root = _TrieNode()
+        self._count = 0
+
+        for word in words:
+            node = self._root
+            for char in word:
+                child = node.children.get(char)
+                if child is None:
+                    child = _TrieNode()
+                    node.children[char] = child
+
+                node = child
+
+            if node.word is None:
+                node.word = word
+                self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, word):
+        node = self._find(word)
+        return node is not None and node.word is not None
+
+    def _find(self, prefix):
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+
+        return node
+
+    @classmethod
+    def _collect(cls, node):
+        words = []
+        stack = [node]
+
+        while len(stack) > 0:
+            curr = stack.pop()
+            if curr.word is not None:
+                words.append(curr.word)
+
+            stack.extend(curr.children.values())
+
+        return tuple(sorted(words))
+
+    def complete(self, prefix):
+        """Find all words that start with prefix.
+
+        Args:
+            prefix (str): The prefix that all returned words must share.
+
+        Returns:
+            tuple(str): A sorted tuple of all matching words.
+        """
+
+        node = self._find(prefix)
+        if node is None:
+            return ()
+
+        if node.matches is None:
+            node.matches = self._collect(node)
+
+        return node.matches
+
+
+class _FunctionIndex:
+    """Cached completion information for a single annotated function.
+
+    Args:
+        arg_names (list(str)): The names of the function's parameters in order.
+        choices (callable): A function that is called with a parameter name and
+            returns an iterable of possible values for it or None.
+    """
+
+    def __init__(self, arg_names, choices):
+        self.arg_names = list(arg_names)
+        self.flags = PrefixTrie("--" + x for x in self.arg_names)
+        self._choices = choices
+        self._value_tries = {}
+
+    def values(self, name):
+        """Return a trie of the enumerable values for a parameter or None."""
+
+        if name not in self._value_tries:
+            choices = self._choices(name)
+            if choices is not None:
+                choices = PrefixTrie(str(x) for x in choices)
+
+            self._value_tries[name] = choices
+
+        return self._value_tries[name]
+
+
+class ShellCompleter:
+    """A readline compatible completer for a HierarchicalShell.
+
+    The completer understands the names of functions and contexts in the
+    current context, builtin functions, --flag parameter names and the
+    values of parameters whose type can enumerate them, such as bool
+    parameters or parameters with a list validator.
+
+    Lazily loaded entries, which are stored as strings in dict contexts,
+    are never imported.  Their names are completed directly and their
+    parameters can be described with a static manifest.  Once an entry has
+    been loaded by the shell its cached metadata is used instead.
+
+    Args:
+        shell (HierarchicalShell): The shell that we are completing for.
+        manifest (dict): An optional dict that maps the lazy import string of
+            an entry (e.g. "package.module,function") to a description of its
+            parameters.  Each description is either a list of parameter names
+            or a dict of parameter name to a list of valid values (or None if
+            the values cannot be enumerated).
+    """
+
+    MAX_CACHED_CONTEXTS = 64
+    MAX_CACHED_FUNCTIONS = 256
+
+    def __init__(self, shell, manifest=None):
+        if manifest is None:
+            manifest = {}
+
+        self.shell = shell
+        self.manifest = manifest
+
+        self._builtins = None
+        self._context_indices = {}
+        self._function_indices = {}
+        self._manifest_indices = {}
+        self._matches = ()
+
+    def invalidate(self, context=None):
+        """Discard cached completion indices.
+
+        Args:
+            context (object): An optional context whose indices should be
+                discarded.  If not passed, all cached indices are discarded.
+        """
+
+        if context is None:
+            self._builtins = None
+            self._context_indices = {}
+            self._function_indices = {}
+            self._manifest_indices = {}
+            return
+
+        self._context_indices.pop(id(context), None)
+
+    def _builtin_trie(self):
+        if self._builtins is None or len(self._builtins) != len(self.shell.builtins):
+            self._builtins = PrefixTrie(self.shell.builtins)
+
+        return self._builtins
+
+    def _context_trie(self, context):
+        key = id(context)
+        cached = self._context_indices.get(key)
+
+        # Dict contexts can have entries added to them so make sure our
+        # cached index still covers all of the names in the context.
+        if cached is not None and cached[0] is context and cached[1] == _context_size(context):
+            return cached[2]
+
+        if len(self._context_indices) >= self.MAX_CACHED_CONTEXTS:
+            live = set(id(x) for x in self.shell.contexts)
+            self._context_indices = {k: v for k, v in self._context_indices.items() if k in live}
+
+        trie = PrefixTrie(utils.find_all(context))
+        self._context_indices[key] = (context, _context_size(context), trie)
+        return trie
+
+    def _function_index(self, func):
+        # Bound methods are created on each lookup but share the metadata of
+        # their function, so that is what the index is cached for.
+        metadata = func.metadata
+        key = id(metadata)
+        cached = self._function_indices.get(key)
+        if cached is not None and cached[0] is metadata:
+            return cached[1]
+
+        if len(self._function_indices) >= self.MAX_CACHED_FUNCTIONS:
+            self._function_indices = {}
+
+        index = _FunctionIndex(metadata.arg_names, lambda name: _param_choices(metadata, name))
+        self._function_indices[key] = (metadata, index)
+        return index
+
+    def _manifest_index(self, lazy_name):
+        if lazy_name in self._manifest_indices:
+            return self._manifest_indices[lazy_name]
+
+        desc = self.manifest.get(lazy_name)
+        index = None
+
+        if isinstance(desc, dict):
+            index = _FunctionIndex(desc, desc.get)
+        elif desc is not None:
+            index = _FunctionIndex(desc, lambda name: None)
+
+        self._manifest_indices[lazy_name] = index
+        return index
+
+    def _lookup(self, context, name):
+        """Find an entry in a context without triggering any lazy imports.
+
+        Returns:
+            (object, _FunctionIndex): The entry found, which is None if it
+                could not be found, and its function index, if any.
+        """
+
+        if name in self.shell.builtins:
+            func = self.shell.builtins[name]
+            return func, self._function_index(func)
+
+        if isinstance(context, dict):
+            entry = context.get(name)
+            if isinstance(entry, str):
+                return entry, self._manifest_index(entry)
+        else:
+            entry = getattr(context, name, None)
+
+        if entry is None or isinstance(entry, dict) or not hasattr(entry, 'metadata'):
+            return entry, None
+
+        if getattr(entry, 'takes_cmdline', False):
+            return entry, None
+
+        return entry, self._function_index(entry)
+
+    def _complete_names(self, context, prefix):
+        names = self._context_trie(context).complete(prefix) + self._builtin_trie().complete(prefix)
+        return tuple(sorted(set(names)))
+
+    def completions(self, line):
+        """Find all possible completions for the last word in a line.
+
+        Args:
+            line (str): The text of the line up to the cursor.
+
+        Returns:
+            tuple(str): The sorted possible completions of the last word.
+        """
+
+        words = line.split()
+        if len(words) == 0 or line[-1].isspace():
+            words.append('')
+
+        prefix = words.pop()
+        context = self.shell.contexts[-1] if len(self.shell.contexts) > 0 else self.shell.root
+
+        index = None
+        pos_count = 0
+        pending_flag = None
+
+        for word in words:
+            if pending_flag is not None:
+                pending_flag = None
+                continue
+
+            if index is not None:
+                if word == '--':
+                    index = None
+                    continue
+
+                if word.startswith('--'):
+                    if '=' not in word and word[2:] in index.arg_names:
+                        pending_flag = word[2:]
+                    continue
+
+                if pos_count < len(index.arg_names):
+                    pos_count += 1
+                    continue
+
+                # The previous function's arguments are full so this word starts a new function
+                index = None
+
+            entry, index = self._lookup(context, word)
+            pos_count = 0
+
+            if isinstance(entry, dict):
+                context = entry
+            elif index is None:
+                # Once we hit something that we cannot evaluate without invoking
+                # it, we can no longer predict what the following words mean.
+                return ()
+
+        if index is None:
+            return self._complete_names(context, prefix)
+
+        if pending_flag is not None:
+            return _complete_values(index, pending_flag, prefix)
+
+        if prefix.startswith('--'):
+            name, equals, value = prefix[2:].partition('=')
+            if equals:
+                return tuple('--%s=%s' % (name, x) for x in _complete_values(index, name, value))
+
+            return index.flags.complete(prefix)
+
+        if pos_count < len(index.arg_names):
+            return _complete_values(index, index.arg_names[pos_count], prefix)
+
+        return self._complete_names(context, prefix)
+
+    def complete(self, text, state):
+        """Readline completer entry point.
+
+        Args:
+            text (str): The word being completed.
+            state (int): The index of the completion that should be returned.
+
+        Returns:
+            str: The completion or None if there are no more completions.
+        """
+
+        if state == 0:
+            import readline
+
+            line = readline.get_line_buffer()[:readline.get_endidx()]
+            self._matches = self.completions(line)
+
+            # readline only replaces the text after the last delimiter
+            if not line.endswith(text):
+                self._matches = ()
+
+        if state < len(self._matches):
+            return self._matches[state]
+
+        return None
+
+    def install(self):
+        """Install this completer as the active readline completer.
+
+        Returns:
+            bool: True if readline was available and the completer was installed.
+        """
+
+        try:
+            import readline
+        except ImportError:
+            return False
+
+        readline.set_completer(self.complete)
+        readline.set_completer_delims(' \t\n')
+        readline.parse_and_bind('tab: complete')
+        return True
+
+
+def _context_size(context):
+    if isinstance(context, dict):
+        return len(context)
+
+    return None
+
+
+def _complete_values(index, name, prefix):
+    values = index.values(name)
+    if values is None:
+        return ()
+
+    return values.complete(prefix)
+
+
+def _param_choices(metadata, name):
+    """Find the enumerable values for an annotated parameter.
+
+    Values can be enumerated either from a list validator attached to the
+    parameter or from a type that defines a completion_choices function.
+    Only types that are already known to the type system, or that can be
+    built without type sources like enum(module.Class), are consulted so
+    that completion never loads external type sources.
+    """
+
+    arg_type = metadata.param_type(name)
+    if arg_type is None:
+        return None
+
+    for validator_name, extra_args in metadata.annotated_params[name].validators:
+        if validator_name == 'validate_list' and len(extra_args) == 1:
+            return extra_args[0]
+
+    if not (type_system.is_known_type(arg_type) or type_system.has_literal_subtypes(arg_type)):
+        return None
+
+    try:
+        proxy = type_system.get_proxy_for_type(arg_type)
+    except (KeyValueException, ValueError):
+        return None
+
+    choices = getattr(proxy, 'completion_choices', None)
+    if not callable(choices):
+        return None
+
+    return choices()
@@ -1,5 +1,4 @@
 """Experimental module for better google docstring parsing."""
-import ast
 import inspect
 from io import StringIO
 from collections import namedtuple
@@ -7,7 +6,7 @@ from typing import List, Tuple, Iterator
 from textwrap import fill, dedent
 from .basic_structures import ParameterInfo, ReturnInfo
 from .exceptions import ValidationError
-from .terminal import get_terminal_size
+from .literals import parse_literal
 
 
 
@@ -291,6 +290,7 @@ class ParsedDocstring:
 
         out = StringIO()
         if width is None:
+            from .terminal import get_terminal_size
             width, _height = get_terminal_size()
 
         for line in self.maindoc:
@@ -354,7 +354,7 @@ def _parse_param_validators(param_desc: str) -> List[Tuple[str, list]]:
 
         {nonnegative, range(1, 5), list(['a', 'b'], istrue(True))} Parameter descriptiom
 
-    Validator arguments in parenthesis should be valid python code.
+    Validator arguments in parenthesis should be python literals.
     Allowed validator argument types are: None, str, int, bool, float, list
 
     Args:
@@ -389,8 +389,8 @@ def _parse_param_validators(param_desc: str) -> List[Tuple[str, list]]:
                 raise ValidationError('Malformed validators notation.', param_desc=param_desc, validator=validator)
 
             try:
-                v_args = ast.literal_eval(v_args)
-            except (ValueError, SyntaxError):
+                v_args = parse_literal(v_args)
+            except ValueError:
                 raise ValidationError('Malformed validators notation. Cannot evaluate validator arguments', param_desc=param_desc, validator=validator)
 
             v_args = list(v_args) if isinstance(v_args, tuple) else [v_args]
@@ -0,0 +1,161 @@
+"""Instrumentation hooks for type conversion, validation and formatting.
+
+A HookRegistry is attached to every TypeSystem as its ``hooks`` attribute.
+Hooks are callables that receive a ConversionEvent after every conversion,
+validation or formatting operation.  When no hooks are registered, the only
+cost is checking a single boolean per operation.
+"""
+
+import time
+import inspect
+from collections import namedtuple
+
+
+ConversionEvent = namedtuple("ConversionEvent", ['kind', 'type_name', 'detail', 'duration', 'success'])
+
+
+class HookRegistry:
+    """A registry of callables that observe the type system hot paths."""
+
+    CONVERT = 'convert'
+    VALIDATE = 'validate'
+    FORMAT = 'format'
+
+    def __init__(self):
+        self._hooks = []
+        self.active = False
+
+    def register(self, hook):
+        """Register a hook that will be called with every ConversionEvent.
+
+        Args:
+            hook (callable): A function taking a single ConversionEvent.
+
+        Returns:
+            callable: The hook that was passed so this can be used as a decorator.
+        """
+
+        self._hooks = self._hooks + [hook]
+        self.active = True
+        return hook
+
+    def unregister(self, hook):
+        """Remove a previously registered hook."""
+
+        self._hooks = [x for x in self._hooks if x is not hook]
+        self.active = len(self._hooks) > 0
+
+    def clear(self):
+        """Remove all hooks."""
+
+        self._hooks = []
+        self.active = False
+
+    def timed(self, kind, type_or_name, detail, func, *args, **kwargs):
+        """Call func(*args, **kwargs) and report how long it took to all hooks.
+
+        Args:
+            kind (str): One of CONVERT, VALIDATE or FORMAT.
+            type_or_name (str or type): The type being operated on.
+            detail (str): An optional name of the validator or formatter used.
+            func (callable): The function to time.
+
+        Returns:
+            object: The return value of func.
+        """
+
+        start = time.perf_counter()
+
+        try:
+            retval = func(*args, **kwargs)
+        except BaseException:
+            self.fire(kind, type_or_name, detail, time.perf_counter() - start, False)
+            raise
+
+        self.fire(kind, type_or_name, detail, time.perf_counter() - start, True)
+        return retval
+
+    def fire(self, kind, type_or_name, detail, duration, success):
+        """Send an event to all registered hooks."""
+
+        event = ConversionEvent(kind, type_label(type_or_name), detail, duration, success)
+        for hook in self._hooks:
+            hook(event)
+
+
+class TypeTimingAggregator:
+    """A hook that accumulates the time spent per type and operation.
+
+    Time spent converting or formatting complex types includes the time
+    spent on their elements, which are also reported separately.
+
+    Usage:
+        aggregator = type_system.hooks.register(TypeTimingAggregator())
+        ...
+        print(aggregator.format())
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def __call__(self, event):
+        key = (event.type_name, event.kind)
+
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = [0, 0, 0.0]
+            self.stats[key] = stats
+
+        stats[0] += 1
+        if not event.success:
+            stats[1] += 1
+
+        stats[2] += event.duration
+
+    def reset(self):
+        """Discard all accumulated statistics."""
+
+        self.stats = {}
+
+    def top(self, count=10, kind=None):
+        """Get the types with the largest cumulative time.
+
+        Args:
+            count (int): The maximum number of entries to return.
+            kind (str): Only include a single kind of operation.
+
+        Returns:
+            list((str, str, int, int, float)): Tuples of type name, kind of
+                operation, number of calls, number of failures and cumulative
+                time in seconds sorted by cumulative time.
+        """
+
+        entries = [(key[0], key[1], val[0], val[1], val[2]) for key, val in self.stats.items()
+                   if kind is None or key[1] == kind]
+        entries.sort(key=lambda x: x[4], reverse=True)
+        return entries[:count]
+
+    def format(self, count=10, kind=None):
+        """Format a table of the types with the largest cumulative time.
+
+        Returns:
+            str
+        """
+
+        lines = ["%-32s %-9s %8s %8s %12s" % ("type", "kind", "calls", "failed", "total (ms)")]
+        for type_name, op_kind, calls, failures, total in self.top(count, kind):
+            lines.append("%-32s %-9s %8d %8d %12.3f" % (type_name, op_kind, calls, failures, total * 1000.0))
+
+        return "\n".join(lines)
+
+
+def type_label(type_or_name):
+    """Get a human readable name for a type or type name."""
+
+    if isinstance(type_or_name, str):
+        return type_or_name
+
+    if inspect.isclass(type_or_name) and inspect.getmodule(type_or_name) is not None and type_or_name.__module__ != 'typing':
+        return type_or_name.__name__
+
+    return str(type_or_name)
@@ -0,0 +1,118 @@
+"""Shell builtins that run and manage background jobs."""
+
+import inspect
+from typedargs.exceptions import ArgumentError, ValidationError
+from typedargs import annotate
+from typedargs import iprint
+
+
+class JobBuiltinsMixin:
+    """The spawn, jobs, wait and cancel builtins of HierarchicalShell.
+
+    Jobs are submitted to the shell's job_manager and use its contexts,
+    find_function and process_arguments to parse commands.
+    """
+
+    @annotate.takes_cmdline
+    @annotate.stringable
+    def _builtin_spawn(self, args):
+        """Run a single command in the background."""
+
+        job = self.spawn(args)
+        return "[%d] %s" % (job.id, job.command)
+
+    @annotate.takes_cmdline
+    @annotate.stringable
+    def _builtin_jobs(self, _args):
+        """List all background jobs."""
+
+        return "\n".join(job.format() for job in self.job_manager.jobs())
+
+    @annotate.takes_cmdline
+    @annotate.stringable
+    def _builtin_wait(self, args):
+        """Wait for background jobs to finish and show their results."""
+
+        job_ids = None
+        if len(args) > 0:
+            job_ids = [self._parse_job_id(x) for x in args]
+
+        jobs = self.job_manager.wait(job_ids)
+        return "\n".join(job.format_result() for job in jobs)
+
+    @annotate.takes_cmdline
+    @annotate.stringable
+    def _builtin_cancel(self, args):
+        """Cancel background jobs that have not started yet."""
+
+        if len(args) == 0:
+            raise ArgumentError("You must specify at least one job to cancel")
+
+        lines = []
+        for arg in args:
+            job_id = self._parse_job_id(arg)
+            if self.job_manager.cancel(job_id):
+                lines.append("[%d] cancelled" % job_id)
+            else:
+                lines.append("[%d] could not be cancelled since it is already running or finished" % job_id)
+
+        return "\n".join(lines)
+
+    @classmethod
+    def _parse_job_id(cls, arg):
+        try:
+            return int(arg.lstrip('%'))
+        except ValueError:
+            raise ArgumentError("Invalid job id", job_id=arg)
+
+    def spawn(self, line):
+        """Start a single command in the background.
+
+        The command's arguments are parsed, converted and validated in the
+        foreground so that errors are reported immediately and the function
+        is submitted to this shell's job manager with the converted values.  Background commands cannot change the
+        current context, so finalizers are not allowed and any context
+        returned from the function is not entered.
+
+        Args:
+            line (list): The command line to run, with the function listed first.
+
+        Returns:
+            BackgroundJob: The job that was started.
+        """
+
+        if len(line) == 0:
+            raise ArgumentError("You must specify a command to run in the background")
+
+        command = " ".join(line)
+        line = list(line)
+        funname = line.pop(0)
+
+        func = self.find_function(self.contexts[-1], funname)
+        if isinstance(func, dict):
+            raise ArgumentError("Cannot enter a context in the background", context=funname)
+
+        if func.finalizer is True:
+            raise ArgumentError("Cannot run a function that destroys its context in the background", function=funname)
+
+        if func.takes_cmdline is True:
+            return self.job_manager.submit(command, func, line)
+
+        posargs, kwargs, line = self.process_arguments(func, line)
+        if len(line) > 0:
+            raise ArgumentError("Only a single command can be run in the background", extra_arguments=line)
+
+        if inspect.isclass(func):
+            if not func.metadata.spec_filled(posargs, kwargs):
+                raise ValidationError("Not enough parameters specified to call function", function=func.metadata.name, signature=func.metadata.signature())
+        elif inspect.ismethod(func):
+            posargs, kwargs = func.metadata.convert_call([func.__self__] + posargs, kwargs)
+            posargs = posargs[1:]
+        else:
+            posargs, kwargs = func.metadata.convert_call(posargs, kwargs)
+
+        return self.job_manager.submit(command, func, *posargs, **kwargs)
+
+    def _report_finished_jobs(self):
+        for job in self.job_manager.finished():
+            iprint(job.format_result())
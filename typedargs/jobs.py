@@ -0,0 +1,233 @@
+"""Background job execution for HierarchicalShell."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError, wait as wait_futures
+from typedargs.exceptions import KeyValueException, NotFoundError
+
+
+class BackgroundJob:
+    """A single invocation running in the background.
+
+    Args:
+        job_id (int): The id of this job in its JobManager.
+        command (str): The command line that started this job.
+        func (callable): The annotated function that is running.
+        future (Future): The future that will hold the result of func.
+    """
+
+    def __init__(self, job_id, command, func, future):
+        self.id = job_id
+        self.command = command
+        self.func = func
+        self.future = future
+
+        self.result = None
+        self.error = None
+        self.formatted = threading.Event()
+
+    @property
+    def status(self):
+        """The current state of this job: running, done, failed or cancelled."""
+
+        if self.future.cancelled():
+            return 'cancelled'
+
+        if not self.future.done():
+            return 'running'
+
+        if self.error is not None:
+            return 'failed'
+
+        return 'done'
+
+    def _finish(self, future):
+        """Format the result of this job as soon as it completes."""
+
+        try:
+            self._format_result(future)
+        finally:
+            self.formatted.set()
+
+    def _format_result(self, future):
+        try:
+            value = future.result()
+        except CancelledError:
+            return
+        except KeyValueException as exc:
+            self.error = exc.format()
+            return
+        except Exception as exc:  #pylint:disable=broad-except; we report all errors from background jobs
+            self.error = "%s: %s" % (exc.__class__.__name__, str(exc))
+            return
+
+        if value is None:
+            return
+
+        try:
+            if self.func.metadata.returns_data():
+                self.result = self.func.metadata.format_returnvalue(value)
+            else:
+                self.result = "Context %s was not entered since it was created in the background" % str(value)
+        except KeyValueException as exc:
+            self.error = exc.format()
+
+    def format(self):
+        """Format a one line description of this job.
+
+        Returns:
+            str
+        """
+
+        return "[%d] %s  %s" % (self.id, self.status, self.command)
+
+    def format_result(self):
+        """Format the status of this job followed by its result or error.
+
+        Returns:
+            str
+        """
+
+        out = self.format()
+        if self.error is not None:
+            out += "\n" + self.error
+        elif self.result is not None:
+            out += "\n" + str(self.result)
+
+        return out
+
+
+class JobManager:
+    """Keeps track of background jobs submitted to an executor.
+
+    Args:
+        executor (concurrent.futures.Executor): An optional executor to submit
+            jobs to.  Both thread and process pools are supported, however when
+            a process pool is used the functions and their arguments must be
+            picklable.  If no executor is passed, a thread pool is created the
+            first time a job is submitted.
+        max_workers (int): The maximum number of worker threads to use if we
+            create our own thread pool.
+    """
+
+    def __init__(self, executor=None, max_workers=None):
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+        self._jobs = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """The executor that jobs are submitted to."""
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='typedargs-job')
+
+        return self._executor
+
+    def submit(self, command, func, *args, **kwargs):
+        """Run func(*args, **kwargs) in the background.
+
+        Args:
+            command (str): The command line that should be reported for this job.
+            func (callable): The annotated function to call.
+            *args: Positional arguments to pass to func.
+            **kwargs: Keyword arguments to pass to func.
+
+        Returns:
+            BackgroundJob: The job that was created.
+        """
+
+        future = self.executor.submit(func, *args, **kwargs)
+
+        with self._lock:
+            job = BackgroundJob(self._next_id, command, func, future)
+            self._jobs[job.id] = job
+            self._next_id += 1
+
+        future.add_done_callback(job._finish)  #pylint:disable=protected-access; the job formats its own result
+        return job
+
+    def jobs(self):
+        """Get all jobs that have not been reaped yet.
+
+        Returns:
+            list(BackgroundJob): The jobs sorted by id.
+        """
+
+        with self._lock:
+            return [self._jobs[x] for x in sorted(self._jobs)]
+
+    def get(self, job_id):
+        """Find a job by its id.
+
+        Raises:
+            NotFoundError: There is no job with the given id.
+        """
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+        if job is None:
+            raise NotFoundError("Background job not found", job_id=job_id)
+
+        return job
+
+    def wait(self, job_ids=None, timeout=None):
+        """Wait for jobs to finish and reap them.
+
+        Args:
+            job_ids (list(int)): The jobs to wait for.  If not passed, wait for
+                all jobs.
+            timeout (float): The maximum number of seconds to wait.
+
+        Returns:
+            list(BackgroundJob): The finished jobs that were reaped.
+        """
+
+        if job_ids is None:
+            jobs = self.jobs()
+        else:
+            jobs = [self.get(x) for x in job_ids]
+
+        wait_futures([x.future for x in jobs], timeout=timeout)
+
+        # Make sure done callbacks have formatted the results before returning them
+        finished = [x for x in jobs if x.future.done()]
+        for job in finished:
+            job.formatted.wait()
+
+        return self._reap(finished)
+
+    def finished(self):
+        """Reap all jobs that have finished.
+
+        Returns:
+            list(BackgroundJob): The jobs that were reaped.
+        """
+
+        return self._reap([x for x in self.jobs() if x.formatted.is_set()])
+
+    def cancel(self, job_id):
+        """Cancel a job that has not started running yet.
+
+        Returns:
+            bool: True if the job was cancelled.
+        """
+
+        return self.get(job_id).future.cancel()
+
+    def shutdown(self, wait=True):
+        """Shut down the executor if we created it."""
+
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _reap(self, jobs):
+        with self._lock:
+            for job in jobs:
+                self._jobs.pop(job.id, None)
+
+        return jobs
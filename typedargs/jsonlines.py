@@ -0,0 +1,73 @@
+"""Streaming JSON Lines output for machine readable shell sessions."""
+
+import json
+from binascii import hexlify
+
+
+def _json_default(obj):
+    """Serialize values that the json module does not know about."""
+
+    if isinstance(obj, (bytes, bytearray)):
+        return hexlify(obj).decode('utf-8')
+
+    return str(obj)
+
+
+class JSONLinesWriter:
+    """Write one compact JSON object per line to a stream.
+
+    Records are encoded incrementally and written in chunks so that large
+    results never need to be built up as a single string in memory.
+
+    Args:
+        stream (file-like): The text stream that records are written to.
+        chunk_size (int): The number of characters to buffer before writing
+            to the stream.
+    """
+
+    def __init__(self, stream, chunk_size=65536):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self._encoder = json.JSONEncoder(separators=(',', ':'), default=_json_default)
+
+    def write(self, record):
+        """Write a single record followed by a newline and flush the stream.
+
+        Args:
+            record (dict): The JSON serializable record to write.
+        """
+
+        write_chunks(self.stream, self._encoder.iterencode(record), self.chunk_size, suffix='\n')
+
+        flush = getattr(self.stream, 'flush', None)
+        if flush is not None:
+            flush()
+
+
+def write_chunks(stream, chunks, chunk_size=65536, suffix=''):
+    """Write an iterable of strings to a stream in chunks of about chunk_size characters.
+
+    This is used to write the output of JSONEncoder.iterencode without
+    joining it into a single string first.
+
+    Args:
+        stream (file-like): The text stream to write to.
+        chunks (iterable(str)): The strings to write.
+        chunk_size (int): The number of characters to buffer before writing.
+        suffix (str): An optional string written after all of the chunks.
+    """
+
+    buffered = []
+    size = 0
+
+    for chunk in chunks:
+        buffered.append(chunk)
+        size += len(chunk)
+
+        if size >= chunk_size:
+            stream.write("".join(buffered))
+            buffered = []
+            size = 0
+
+    buffered.append(suffix)
+    stream.write("".join(buffered))
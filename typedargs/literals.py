@@ -0,0 +1,301 @@
+"""A bounded parser for python literals.
+
+This is a replacement for ast.literal_eval for values that come from
+operators and docstrings.  It supports numbers (including hex, octal and
+binary integers), strings, lists, tuples, dicts, sets, True, False and None,
+like "[1, 0x10, 'a', {'b': (None, 2.5)}]".  Unlike ast.literal_eval it does
+not build a syntax tree, and it rejects input that is longer or more deeply
+nested than a configurable limit before doing any significant work.
+"""
+
+import re
+import ast
+
+DEFAULT_MAX_LENGTH = 1024 * 1024
+DEFAULT_MAX_DEPTH = 32
+
+_NUMBER = r"[-+]?(?:0[xX][0-9a-fA-F_]+|0[oO][0-7_]+|0[bB][01_]+|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][-+]?\d+)?)"
+_STRING = r"'(?:[^'\\\n]|\\.)*'|\"(?:[^\"\\\n]|\\.)*\""
+# Each match fills exactly one group: punctuation, string, number, name or
+# a character that cannot start any token.  findall is used since creating a
+# match object per token is a large part of the cost of tokenizing.
+_TOKEN = re.compile(r"\s*(?:([\[\](){},:])|(%s)|(%s)|([A-Za-z_]\w*)|(\S))" % (_STRING, _NUMBER))
+_NUMBER_ONLY = re.compile(_NUMBER)
+
+# Sequences that contain none of these have no strings or nested containers
+_NESTED_CHARS = frozenset('\'"()[]{}:')
+
+_NAMES = {'True': True, 'False': False, 'None': None}
+_CLOSING = {'[': ']', '(': ')', '{': '}'}
+
+class LiteralSyntaxError(ValueError):
+    """Raised when a string is not a supported literal or exceeds a parser limit."""
+
+
+def parse_literal(text, max_length=None, max_depth=None):
+    """Parse a string containing a python literal.
+
+    Like ast.literal_eval, several comma separated values at the top level
+    are returned as a tuple, so "1, 2" is parsed as (1, 2).
+
+    Args:
+        text (str): The string to parse.
+        max_length (int): The maximum number of characters in text.  Defaults
+            to DEFAULT_MAX_LENGTH.
+        max_depth (int): The maximum nesting depth of containers.  Defaults to
+            DEFAULT_MAX_DEPTH.
+
+    Returns:
+        object: The parsed value.
+
+    Raises:
+        LiteralSyntaxError: text is not a supported literal or exceeds one of
+            the limits.
+    """
+
+    if max_length is None:
+        max_length = DEFAULT_MAX_LENGTH
+    if max_depth is None:
+        max_depth = DEFAULT_MAX_DEPTH
+
+    if len(text) > max_length:
+        raise LiteralSyntaxError("literal is too long: %d characters, the maximum is %d" % (len(text), max_length))
+
+    flat = _parse_flat_sequence(text)
+    if flat is not None:
+        return flat
+
+    parser = _Parser(*_tokenize(text), max_depth=max_depth)
+    return parser.parse()
+
+
+def _parse_flat_sequence(text):
+    """Quickly parse a list or tuple of numbers, True, False and None.
+
+    Returns:
+        list or tuple: The parsed sequence or None if text is anything else.
+    """
+
+    stripped = text.strip()
+    opening = stripped[:1]
+    if opening not in ('[', '(') or stripped[-1:] != _CLOSING[opening]:
+        return None
+
+    inner = stripped[1:-1]
+    if not _NESTED_CHARS.isdisjoint(inner):
+        return None
+
+    parts = inner.split(',')
+    trailing_comma = len(parts) > 1 and parts[-1].strip() == ''
+    if trailing_comma or (len(parts) == 1 and parts[0].strip() == ''):
+        parts.pop()
+
+    try:
+        values = [int(x, 0) for x in parts]
+    except ValueError:
+        values = [_parse_flat_item(x) for x in parts]
+
+    if opening == '[':
+        return values
+
+    if len(values) == 1 and not trailing_comma:
+        return values[0]
+
+    return tuple(values)
+
+
+def _parse_flat_item(item):
+    item = item.strip()
+    if item in _NAMES:
+        return _NAMES[item]
+
+    if _NUMBER_ONLY.fullmatch(item) is None:
+        raise LiteralSyntaxError("invalid item in literal: %r" % item)
+
+    return _parse_number(item)
+
+
+def _tokenize(text):
+    """Split text into parallel lists of token kinds and values.
+
+    The kind of a punctuation token is the punctuation itself and the kind
+    of every other token is 'value'.  Values are already converted to python
+    objects.
+    """
+
+    kinds = []
+    values = []
+
+    for punct, string, number, name, invalid in _TOKEN.findall(text):
+        if punct:
+            kinds.append(punct)
+            values.append(None)
+            continue
+
+        if string:
+            value = _parse_string(string)
+        elif number:
+            value = _parse_number(number)
+        elif name in _NAMES:
+            value = _NAMES[name]
+        elif name:
+            raise LiteralSyntaxError("unsupported name in literal: %s" % name)
+        else:
+            raise LiteralSyntaxError("invalid character in literal: %r" % invalid)
+
+        kinds.append('value')
+        values.append(value)
+
+    return kinds, values
+
+
+def _parse_number(token):
+    try:
+        if token.lstrip('+-')[:2].lower() in ('0x', '0o', '0b') or not any(x in token for x in '.eE'):
+            return int(token, 0)
+
+        return float(token)
+    except ValueError:
+        raise LiteralSyntaxError("invalid number in literal: %s" % token)
+
+
+def _parse_string(token):
+    if '\\' not in token:
+        return token[1:-1]
+
+    # A single flat string literal is cheap and safe to evaluate and this
+    # handles every escape sequence exactly like python does.
+    try:
+        return ast.literal_eval(token)
+    except (ValueError, SyntaxError):
+        raise LiteralSyntaxError("invalid string in literal: %s" % token)
+
+
+class _Parser:
+    """A recursive descent parser over a list of tokens."""
+
+    def __init__(self, kinds, values, max_depth):
+        self.kinds = kinds
+        self.values = values
+        self.max_depth = max_depth
+        self.index = 0
+
+    def parse(self):
+        kinds = self.kinds
+        if len(kinds) == 0:
+            raise LiteralSyntaxError("empty literal")
+
+        value = self._value(0)
+
+        if self._peek() == ',':
+            values = [value]
+            while self._accept(','):
+                if self.index == len(kinds):
+                    break
+
+                values.append(self._value(0))
+
+            value = tuple(values)
+
+        if self.index != len(kinds):
+            raise LiteralSyntaxError("unexpected %r after the end of the literal" % (kinds[self.index],))
+
+        return value
+
+    def _peek(self):
+        if self.index < len(self.kinds):
+            return self.kinds[self.index]
+
+        return None
+
+    def _accept(self, punct):
+        if self.index < len(self.kinds) and self.kinds[self.index] == punct:
+            self.index += 1
+            return True
+
+        return False
+
+    def _value(self, depth):
+        index = self.index
+        if index >= len(self.kinds):
+            raise LiteralSyntaxError("unexpected end of literal")
+
+        self.index = index + 1
+        kind = self.kinds[index]
+        if kind == 'value':
+            return self.values[index]
+
+        if kind not in _CLOSING:
+            raise LiteralSyntaxError("unexpected %r in literal" % kind)
+
+        if depth >= self.max_depth:
+            raise LiteralSyntaxError("literal is nested more than %d levels deep" % self.max_depth)
+
+        if kind == '{':
+            return self._braces(depth + 1)
+
+        values, trailing_comma = self._items(_CLOSING[kind], depth + 1)
+        if kind == '[':
+            return values
+
+        if len(values) == 1 and not trailing_comma:
+            return values[0]
+
+        return tuple(values)
+
+    def _items(self, closing, depth):
+        """Parse comma separated values up to and including a closing bracket."""
+
+        values = []
+        trailing_comma = False
+
+        while not self._accept(closing):
+            if values and not trailing_comma:
+                raise LiteralSyntaxError("expected ',' or %r in literal" % closing)
+
+            values.append(self._value(depth))
+            trailing_comma = self._accept(',')
+
+        return values, trailing_comma
+
+    def _braces(self, depth):
+        if self._accept('}'):
+            return {}
+
+        first = self._value(depth)
+        if not self._accept(':'):
+            if self._accept('}'):
+                return _make_set([first])
+
+            if not self._accept(','):
+                raise LiteralSyntaxError("expected ',', ':' or '}' in literal")
+
+            values, _trailing_comma = self._items('}', depth)
+            return _make_set([first] + values)
+
+        result = {}
+        key = first
+        while True:
+            try:
+                result[key] = self._value(depth)
+            except TypeError:
+                raise LiteralSyntaxError("unhashable dict key in literal: %r" % (key,))
+
+            if not self._accept(',') or self._peek() == '}':
+                break
+
+            key = self._value(depth)
+            if not self._accept(':'):
+                raise LiteralSyntaxError("expected ':' after dict key in literal")
+
+        if not self._accept('}'):
+            raise LiteralSyntaxError("expected ',' or '}' in literal")
+
+        return result
+
+
+def _make_set(values):
+    try:
+        return set(values)
+    except TypeError:
+        raise LiteralSyntaxError("unhashable set item in literal")
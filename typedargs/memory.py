@@ -0,0 +1,175 @@
+"""Measure how much memory annotated function metadata uses.
+
+Usage:
+    python -m typedargs.memory PACKAGE [PACKAGE ...]
+"""
+
+import sys
+import types
+import pkgutil
+import importlib
+from collections import namedtuple
+from typedargs.metadata import AnnotatedMetadata
+
+
+MetadataMemory = namedtuple("MetadataMemory", ['functions', 'total_bytes', 'by_module'])
+
+# Objects that are owned by the annotated code itself rather than by its metadata
+_SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType)
+
+
+def metadata_size(metadata, seen=None):
+    """Estimate the number of bytes used by a single AnnotatedMetadata object.
+
+    All objects reachable from the metadata are included except for the
+    annotated function, classes and modules.  Objects that are found in seen
+    are not counted again, so passing the same set for several objects
+    counts shared objects, such as interned type names, only once.
+
+    Args:
+        metadata (AnnotatedMetadata): The metadata to measure.
+        seen (set): An optional set of ids of objects that were already counted.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+
+    if seen is None:
+        seen = set()
+
+    total = 0
+    pending = [metadata]
+
+    while pending:
+        obj = pending.pop()
+
+        if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES):
+            continue
+
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        elif not isinstance(obj, (str, bytes, int, float)):
+            pending.extend(_object_members(obj))
+
+    return total
+
+
+def _object_members(obj):
+    members = []
+
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, '__slots__', ()):
+            if hasattr(obj, slot):
+                members.append(getattr(obj, slot))
+
+    obj_dict = getattr(obj, '__dict__', None)
+    if obj_dict is not None:
+        members.append(obj_dict)
+
+    return members
+
+
+def _find_metadata(module):
+    """Yield all metadata objects for functions and classes defined in a module."""
+
+    for obj in list(vars(module).values()):
+        if getattr(obj, '__module__', None) != module.__name__:
+            continue
+
+        metadata = getattr(obj, 'metadata', None)
+        if isinstance(metadata, AnnotatedMetadata):
+            yield metadata
+
+        if isinstance(obj, type):
+            for member in vars(obj).values():
+                metadata = getattr(member, 'metadata', None)
+                if isinstance(metadata, AnnotatedMetadata):
+                    yield metadata
+
+
+def _iter_modules(package):
+    if isinstance(package, str):
+        package = importlib.import_module(package)
+
+    yield package
+
+    path = getattr(package, '__path__', None)
+    if path is None:
+        return
+
+    for info in pkgutil.walk_packages(path, package.__name__ + '.'):
+        yield importlib.import_module(info.name)
+
+
+def measure_package(package):
+    """Import a package and all of its submodules and measure their metadata.
+
+    Args:
+        package (str or module): The package or module to measure.
+
+    Returns:
+        MetadataMemory: The number of annotated functions and classes, the
+            total size of their metadata in bytes and the size by module name.
+    """
+
+    seen = set()
+    seen_metadata = set()
+    by_module = {}
+    functions = 0
+
+    for module in _iter_modules(package):
+        module_total = 0
+
+        for metadata in _find_metadata(module):
+            if id(metadata) in seen_metadata:
+                continue
+
+            seen_metadata.add(id(metadata))
+            functions += 1
+            module_total += metadata_size(metadata, seen)
+
+        if module_total > 0:
+            by_module[module.__name__] = module_total
+
+    return MetadataMemory(functions, sum(by_module.values()), by_module)
+
+
+def format_report(report):
+    """Format a MetadataMemory report as a table.
+
+    Returns:
+        str
+    """
+
+    lines = ["%-48s %12s" % ("module", "bytes")]
+    for name, size in sorted(report.by_module.items(), key=lambda x: x[1], reverse=True):
+        lines.append("%-48s %12d" % (name, size))
+
+    lines.append("%d annotated object(s), %d bytes total" % (report.functions, report.total_bytes))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Print a metadata memory report for each package named on the command line."""
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) == 0:
+        print("Usage: python -m typedargs.memory PACKAGE [PACKAGE ...]")
+        return 1
+
+    for package in argv:
+        print(format_report(measure_package(package)))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,14 +2,47 @@
 
 import inspect
 import logging
+from collections import namedtuple
 from typing import Union
-from typedargs import typeinfo, utils
+from typedargs import typeinfo
+from typedargs.statcache import stat_cache
 from .exceptions import TypeSystemError, ArgumentError, ValidationError, InternalError
 from .basic_structures import ParameterInfo, ReturnInfo
-from .doc_annotate import parse_docstring
 from .type_annotations_parser import parse_annotations
 
 
+_FunctionSpec = namedtuple("_FunctionSpec", ['signature', 'varargs', 'kwargs', 'arg_names', 'arg_defaults',
+                                             'has_self', 'type_annotations', 'arg_indices', 'required_names',
+                                             'positional_defaults', 'required_mask', 'simple'])
+
+_MISSING = object()
+
+
+class BoundArguments:
+    """Argument values bound to the positional parameters of a function.
+
+    Args:
+        names (tuple(str)): The parameter names in order.
+        values (list): The value for each parameter in order.
+    """
+
+    __slots__ = ('names', 'values')
+
+    def __init__(self, names, values):
+        self.names = names
+        self.values = values
+
+    def items(self):
+        """Iterate over (name, value) pairs in parameter order."""
+        return zip(self.names, self.values)
+
+    def as_dict(self):
+        """Return a dict of parameter name to value."""
+        return dict(zip(self.names, self.values))
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
 class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are required.
     """All of the associated metadata for an annotated function or class.
 
@@ -21,11 +54,11 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
             of this function
     """
 
-    def __init__(self, func, name=None):
-        self._logger = logging.getLogger(__name__)
+    __slots__ = ('annotated_params', '_return_info', 'name', 'load_from_doc', '_doc_parsed', '_func', '_spec',
+                 '_docstring', '_class_name', '_class_docstring', '_converters', '_call_plan', '_formatter')
 
+    def __init__(self, func, name=None):
         self.annotated_params = {}
-        self._has_self = False
 
         if inspect.isclass(func):
             # If we're annotating a class, the name of the class should be
@@ -41,10 +74,12 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
             if hasattr(func, 'metadata'):
                 self.annotated_params = func.metadata.annotated_params
 
-        signature = inspect.signature(func)
-        self.varargs, self.kwargs, self.arg_names, self.arg_defaults, self._has_self = _get_param_info(signature)
-        self._type_annotations = _get_type_annotations(signature)
+        # Inspecting the signature is deferred until it is first needed, just
+        # like parsing the docstring, since most functions are never called.
+        self._func = func
+        self._spec = None
 
+        self._formatter = None
         self.return_info = ReturnInfo(None, None, None, False, None)
 
         if name is None:
@@ -58,6 +93,67 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
         self._class_name = getattr(func, 'class_name', '')
         self._class_docstring = getattr(func, 'class_docstring', '')
 
+        self._converters = None
+        self._call_plan = None
+
+    def _load_spec(self):
+        signature = inspect.signature(self._func)
+        varargs, kwargs, arg_names, arg_defaults, has_self = _get_param_info(signature)
+
+        # Precompute the tables used to check and bind arguments on every call
+        params = signature.parameters.values()
+        positional_defaults = tuple(x.default for x in params if x.kind == x.POSITIONAL_OR_KEYWORD and x.default is not x.empty)
+        required_count = len(arg_names) - len(positional_defaults)
+        simple = all(x.kind == x.POSITIONAL_OR_KEYWORD for x in params)
+
+        self._spec = _FunctionSpec(signature, varargs, kwargs, arg_names, arg_defaults, has_self,
+                                   _get_type_annotations(signature), {name: i for i, name in enumerate(arg_names)},
+                                   tuple(arg_names[:required_count]), positional_defaults, (1 << required_count) - 1,
+                                   simple)
+        return self._spec
+
+    @property
+    def varargs(self):
+        """The name of the function's ``*args`` parameter or None."""
+        return (self._spec or self._load_spec()).varargs
+
+    @property
+    def kwargs(self):
+        """The name of the function's ``**kwargs`` parameter or None."""
+        return (self._spec or self._load_spec()).kwargs
+
+    @property
+    def arg_names(self):
+        """The names of the function's positional parameters, excluding self."""
+        return (self._spec or self._load_spec()).arg_names
+
+    @property
+    def arg_defaults(self):
+        """The default values of the function's trailing positional parameters."""
+        return (self._spec or self._load_spec()).arg_defaults
+
+    @property
+    def return_info(self):
+        """The ReturnInfo describing how the return value is formatted."""
+        return self._return_info
+
+    @return_info.setter
+    def return_info(self, value):
+        self._return_info = value
+        self._formatter = None
+
+    @property
+    def _has_self(self):
+        return (self._spec or self._load_spec()).has_self
+
+    @property
+    def _signature(self):
+        return (self._spec or self._load_spec()).signature
+
+    @property
+    def _type_annotations(self):
+        return (self._spec or self._load_spec()).type_annotations
+
     def _ensure_loaded(self):
 
         if not self.load_from_doc or self._doc_parsed:
@@ -72,6 +168,9 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
 
         # Parse docstring types info
         if self.load_from_doc:
+            # The docstring parser is only needed once a function is first used
+            from .doc_annotate import parse_docstring
+
             validate_type = not bool(self._type_annotations)
 
             # if there is no param type info in self._class_docstring then use self._docstring
@@ -121,7 +220,7 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
                         name = '{}.{}'.format(self._class_name, self.name)
                     else:
                         name = self.name
-                    self._logger.warning('Type info mismatch between docstring and type annotations in "%s"', name)
+                    logger.warning('Type info mismatch between docstring and type annotations in "%s"', name)
 
     def _add_annotation_info(self, params, return_info):
         """Add type information for params and return value of this function
@@ -147,12 +246,17 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
             bool: True if we have a filled spec, False otherwise.
         """
 
-        req_names = self.arg_names
-        if len(self.arg_defaults) > 0:
-            req_names = req_names[:-len(self.arg_defaults)]
+        spec = self._spec or self._load_spec()
+
+        missing = len(spec.required_names)
+        if kw_args:
+            arg_indices = spec.arg_indices
+            for name in kw_args:
+                index = arg_indices.get(name)
+                if index is not None and index < len(spec.required_names):
+                    missing -= 1
 
-        req = [x for x in req_names if x not in kw_args]
-        return len(req) <= len(pos_args)
+        return missing <= len(pos_args)
 
     def add_param(self, name, type_class, type_name, validators, desc=None):
         """Add type information for a parameter by name.
@@ -171,12 +275,25 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
         if name in self.annotated_params:
             raise TypeSystemError("Annotation specified multiple times for the same parameter", param=name)
 
-        if name not in self.arg_names and name != self.varargs and name != self.kwargs:
+        if self._spec is None:
+            valid_names = _code_param_names(self._func)
+        else:
+            valid_names = None
+
+        if valid_names is None:
+            valid_names = self.arg_names + [self.varargs, self.kwargs]
+
+        if name not in valid_names:
             raise TypeSystemError("Annotation specified for unknown parameter", param=name)
 
         info = ParameterInfo(type_class, type_name, validators, desc)
         self.annotated_params[name] = info
 
+        if self._converters:
+            self._converters.pop(name, None)
+
+        self._call_plan = None
+
     def typed_returnvalue(self, type_name, formatter=None):
         """Add type information to the return value of this function.
 
@@ -328,7 +445,52 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
         if not self.return_info.is_data:
             return None
 
-        validation_err = ValidationError('Cannot convert return value to string', value=value)
+        format_func = self._formatter
+        if format_func is None:
+            format_func = self._build_formatter()
+
+        return format_func(value)
+
+    def write_returnvalue(self, value, stream):
+        """Format the return value of this function and write it to a text stream.
+
+        Typed return values whose type can write values incrementally are
+        streamed without building the formatted string in memory.
+
+        Args:
+            value (object): The return value that we are supposed to format.
+            stream (file-like): The text stream to write to.
+
+        Returns:
+            bool: True if anything was written, False if this function
+                indicates that it does not return data.
+        """
+
+        self._ensure_loaded()
+
+        if not self.return_info.is_data:
+            return False
+
+        if self.return_info.type_class is not None:
+            value_type = self.return_info.type_class
+        else:
+            value_type = self.return_info.type_name
+
+        if value_type is not None:
+            formatter, sub_formatters = self.return_info.formatter if self.return_info.formatter else (None, [])
+            typeinfo.type_system.write_value(value, value_type, stream, formatter, sub_formatters)
+            return True
+
+        stream.write(self.format_returnvalue(value))
+        return True
+
+    def _build_formatter(self):
+        """Resolve the formatter for the return value once and cache it.
+
+        Returns:
+            callable: A function that takes the return value and returns it
+                formatted as a string.
+        """
 
         # If the return value is typed, use the type_system to format it
         if self.return_info.type_class is not None:
@@ -339,26 +501,57 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
         formatter, sub_formatters = self.return_info.formatter if self.return_info.formatter else (None, [])
 
         if value_type is not None:
-            return typeinfo.type_system.format_value(value, value_type, formatter, sub_formatters)
+            def _format_typed(value):
+                return typeinfo.type_system.format_trusted_value(value, value_type, formatter, sub_formatters)
+
+            format_func = _format_typed
 
         # Otherwise convert this value to a string with formatter function
-        if formatter in (None, 'default', 'str', 'string'):
-            formatter = str
+        elif formatter in (None, 'default', 'str', 'string') or formatter is str:
+            format_func = str
         elif callable(formatter):
-            formatter = formatter
+            format_func = _optional_arg_caller(formatter, sub_formatters)
         elif isinstance(formatter, str):
-            formatter_name = 'format_{}'.format(formatter)
-            if hasattr(value, formatter_name) and callable(getattr(value, formatter_name)):
-                formatter = getattr(value, formatter_name)
-            else:
-                raise validation_err
+            format_func = _method_formatter('format_{}'.format(formatter), sub_formatters)
+        else:
+            def _format_invalid(value):
+                raise ValidationError('Cannot convert return value to string', value=value)
+
+            format_func = _format_invalid
+
+        self._formatter = format_func
+        return format_func
+
+    def json_returnvalue(self, value):
+        """Convert the return value of this function into a JSON serializable object.
+
+        Typed return values are converted using their type's JSON
+        representation and ignore any formatter since they are meant to be
+        consumed by other programs.  Untyped return values are formatted as a
+        string just like format_returnvalue.
+
+        Args:
+            value (object): The return value that we are supposed to convert.
+
+        Returns:
+            object: The JSON serializable value, or None if this function indicates
+                that it does not return data
+        """
+
+        self._ensure_loaded()
+
+        if not self.return_info.is_data:
+            return None
+
+        if self.return_info.type_class is not None:
+            value_type = self.return_info.type_class
         else:
-            raise validation_err
+            value_type = self.return_info.type_name
 
-        if formatter is str:
-            return str(value)
+        if value_type is not None:
+            return typeinfo.type_system.json_value(value, value_type)
 
-        return utils.call_with_optional_arg(formatter, value, *sub_formatters)
+        return self.format_returnvalue(value)
 
     def convert_positional_argument(self, index, arg_value):
         """Convert and validate a positional argument.
@@ -398,46 +591,72 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
             ValidationError: If an argument is passed twice.
         """
 
-        if kwargs is None:
-            kwargs = {}
-
         if self.has_varargs() or self.has_kwargs():
             raise InternalError("check_spec cannot be called on a function that takes *args or **kwargs")
 
-        missing = object()
+        return self.bind_arguments(pos_args, kwargs).as_dict()
+
+    def bind_arguments(self, pos_args, kwargs=None):
+        """Bind positional and keyword arguments to this function's parameters.
+
+        Arguments are matched in a single pass using tables that are computed
+        once per function and missing arguments are filled in with their
+        default values.  Parameters that are not positional, like ``*args``,
+        are ignored.
+
+        Args:
+            pos_args (list): A list of arguments that will be passed as positional
+                arguments, not including self.
+            kwargs (dict): A dictionary of the keyword arguments that will be passed.
+
+        Returns:
+            BoundArguments: The value for every positional parameter.
+
+        Raises:
+            ArgumentError: If a positional or keyword argument does not fit in the spec.
+            ValidationError: If an argument is passed twice.
+        """
+
+        spec = self._spec or self._load_spec()
+        arg_names = spec.arg_names
+        num_args = len(arg_names)
 
-        arg_vals = [missing]*len(self.arg_names)
-        kw_indices = {name: i for i, name in enumerate(self.arg_names)}
+        if len(pos_args) > num_args:
+            raise ArgumentError("Too many positional arguments, first excessive argument=%s" % str(pos_args[num_args]))
 
-        for i, arg in enumerate(pos_args):
-            if i >= len(arg_vals):
-                raise ArgumentError("Too many positional arguments, first excessive argument=%s" % str(arg))
+        values = list(pos_args)
+        filled = (1 << len(values)) - 1
 
-            arg_vals[i] = arg
+        if len(values) < num_args:
+            values.extend([_MISSING] * (num_args - len(values)))
 
-        for arg, val in kwargs.items():
-            index = kw_indices.get(arg)
-            if index is None:
-                raise ArgumentError("Cannot find argument by name: %s" % arg)
+        if kwargs:
+            arg_indices = spec.arg_indices
+            for arg, val in kwargs.items():
+                index = arg_indices.get(arg)
+                if index is None:
+                    raise ArgumentError("Cannot find argument by name: %s" % arg)
 
-            if arg_vals[index] is not missing:
-                raise ValidationError("Argument %s passed twice" % arg)
+                bit = 1 << index
+                if filled & bit:
+                    raise ValidationError("Argument %s passed twice" % arg)
 
-            arg_vals[index] = val
+                filled |= bit
+                values[index] = val
 
-        # Fill in any default variables if their args are missing
-        if len(self.arg_defaults) > 0:
-            for i in range(0, len(self.arg_defaults)):
-                neg_index = -len(self.arg_defaults) + i
-                if arg_vals[neg_index] is missing:
-                    arg_vals[neg_index] = self.arg_defaults[i]
+        required_mask = spec.required_mask
+        if filled & required_mask != required_mask:
+            unfilled = ~filled & required_mask
+            index = (unfilled & -unfilled).bit_length() - 1
+            raise ArgumentError("Missing a required argument (position: %d, name: %s)" % (index, arg_names[index]))
 
-        # Now make sure there isn't a missing gap
-        if missing in arg_vals:
-            index = arg_vals.index(missing)
-            raise ArgumentError("Missing a required argument (position: %d, name: %s)" % (index, self.arg_names[index]))
+        # Fill in any default values if their args are missing
+        required_count = len(spec.required_names)
+        for i, default in enumerate(spec.positional_defaults, required_count):
+            if values[i] is _MISSING:
+                values[i] = default
 
-        return {name: val for name, val in zip(self.arg_names, arg_vals)}
+        return BoundArguments(arg_names, values)
 
     def convert_argument(self, arg_name, arg_value):
         """Given a parameter with type information, convert and validate it.
@@ -450,41 +669,230 @@ class AnnotatedMetadata: #pylint: disable=R0902; These instance variables are re
             object: The converted value.
         """
 
+        converter = self._get_converter(arg_name)
+        if converter is None:
+            return arg_value
+
+        return converter(arg_value)
+
+    def convert_call(self, args, kwargs):
+        """Bind, convert and validate all arguments of a call to this function.
+
+        Arguments are bound to the function's signature with defaults filled
+        in, so the function receives every positional parameter positionally,
+        and then each one is passed through the cached converter for its
+        parameter.  Functions that only have positional-or-keyword parameters
+        are bound with bind_arguments, everything else with inspect.  The
+        converters are built on the first call and rebuilt if more parameters
+        are annotated afterwards.
+
+        Args:
+            args (tuple): The positional arguments that were passed.
+            kwargs (dict): The keyword arguments that were passed.
+
+        Returns:
+            (list, dict): The converted positional and keyword arguments.
+
+        Raises:
+            TypeError: If the arguments do not match the function's signature.
+        """
+
+        plan = self._call_plan
+        if plan is None:
+            plan = self._build_call_plan()
+
+        converters, varargs_converter = plan
+        spec = self._spec
+        offset = 1 if spec.has_self else 0
+
+        if kwargs or len(args) != len(converters) + offset:
+            if spec.simple and len(args) >= offset:
+                try:
+                    bound = self.bind_arguments(args[offset:], kwargs)
+                except (ArgumentError, ValidationError) as exc:
+                    raise TypeError("%s(): %s" % (self.name, exc.msg)) from exc
+
+                args = list(args[:offset]) + bound.values
+                kwargs = {}
+            else:
+                bound = self._signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                args = bound.args
+                kwargs = bound.kwargs
+
+        convargs = list(args[:offset])
+        convargs.extend(arg if converter is None else converter(arg) for converter, arg in zip(converters, args[offset:] if offset else args))
+
+        num_params = len(converters) + offset
+        if len(args) > num_params:
+            extra_args = args[num_params:]
+            if varargs_converter is not None:
+                extra_args = [varargs_converter(arg) for arg in extra_args]
+
+            convargs.extend(extra_args)
+
+        if not kwargs:
+            return convargs, kwargs
+
+        convkw = {}
+        for key, val in kwargs.items():
+            converter = self._get_converter(key)
+            convkw[key] = val if converter is None else converter(val)
+
+        return convargs, convkw
+
+    def _build_call_plan(self):
         self._ensure_loaded()
 
-        arg_type = self.param_type(arg_name)
+        converters = [self._get_converter(name) for name in self.arg_names]
 
-        if arg_type is None:
-            return arg_value
+        varargs_converter = None
+        if self.varargs is not None:
+            varargs_converter = self._get_converter(self.varargs)
+
+        self._call_plan = (converters, varargs_converter)
+        return self._call_plan
+
+    def _get_converter(self, arg_name):
+        """Get the cached converter for a parameter or None if it has no type information."""
+
+        if self._converters is not None and arg_name in self._converters:
+            return self._converters[arg_name]
+
+        self._ensure_loaded()
+
+        if arg_name not in self.annotated_params:
+            return None
+
+        converter = self._make_converter(arg_name)
 
-        val = typeinfo.type_system.convert_to_type(arg_value, arg_type)
+        if self._converters is None:
+            self._converters = {}
+
+        self._converters[arg_name] = converter
+        return converter
+
+    def _make_converter(self, arg_name):
+        """Build a function that converts and validates a single argument.
+
+        The type's converter is created on first use so that types can keep
+        per parameter state.  The validator functions are looked up the first
+        time a value is converted successfully and reused for all later calls.
+
+        Returns:
+            callable: The converter or None if the parameter has no type.
+        """
+
+        arg_type = self.param_type(arg_name)
+        if arg_type is None:
+            return None
 
         validators = self.annotated_params[arg_name].validators
-        if len(validators) == 0:
+        resolved = []
+        converter = [None, None]
+
+        def _convert(arg_value):
+            system = typeinfo.type_system
+            if converter[0] is not system:
+                converter[1] = system.make_converter(arg_type)
+                converter[0] = system
+
+            val = converter[1](arg_value)
+
+            if len(validators) == 0:
+                return val
+
+            if not resolved:
+                resolved.extend(self._resolve_validators(arg_name, arg_type, validators))
+
+            # Run all of the validators that were defined for this argument.
+            # If the validation fails, they will raise an exception that we convert to
+            # an instance of ValidationError
+            # File system checks are shared by the validators of this value
+            hooks = system.hooks
+            try:
+                with stat_cache.scope():
+                    for validator_name, validator, extra_args in resolved:
+                        if hooks.active:
+                            hooks.timed(hooks.VALIDATE, arg_type, validator_name, validator, val, *extra_args)
+                        else:
+                            validator(val, *extra_args)
+            except (ValueError, TypeError) as exc:
+                raise ValidationError(exc.args[0], argument=arg_name, arg_value=val, arg_type=arg_type)
+
             return val
 
-        # Run all of the validators that were defined for this argument.
-        # If the validation fails, they will raise an exception that we convert to
-        # an instance of ValidationError
-        try:
-            # arg_type here could be: string | builtin type | complex type from typing module | user defined type class
-            checker_type = typeinfo.type_system.get_proxy_for_type(arg_type)
-            if checker_type is None:
-                checker_type = arg_type
+        return _convert
+
+    @classmethod
+    def _resolve_validators(cls, arg_name, arg_type, validators):
+        # arg_type here could be: string | builtin type | complex type from typing module | user defined type class
+        checker_type = typeinfo.type_system.get_proxy_for_type(arg_type)
+        if checker_type is None:
+            checker_type = arg_type
+
+        resolved = []
+        for validator_name, extra_args in validators:
+            validator = getattr(checker_type, validator_name, None)
+
+            if not callable(validator):
+                raise ValidationError("Could not find validator specified for argument",
+                                      argument=arg_name, validator_name=validator_name, arg_type=arg_type,
+                                      method=dir(checker_type), augmented_Type=checker_type)
+
+            # Types can process validator arguments once per parameter, like
+            # compiling a regular expression, with a prepare_<name> function.
+            if validator_name.startswith('validate_'):
+                prepare = getattr(checker_type, 'prepare_' + validator_name[9:], None)
+                if callable(prepare):
+                    try:
+                        extra_args = prepare(*extra_args)
+                    except (ValueError, TypeError) as exc:
+                        raise ValidationError("Invalid arguments for validator specified for argument",
+                                              argument=arg_name, validator_name=validator_name, arg_type=arg_type,
+                                              error_message=str(exc))
+
+            resolved.append((validator_name, validator, extra_args))
+
+        return resolved
+
+
+def _optional_arg_caller(func, sub_formatters):
+    """Build a function that calls func with the value only if func takes arguments."""
+
+    if not inspect.signature(func).parameters:
+        return lambda value: func()
 
-            for validator_name, extra_args in validators:
-                validator = getattr(checker_type, validator_name, None)
+    if sub_formatters:
+        return lambda value: func(value, *sub_formatters)
 
-                if not callable(validator):
-                    raise ValidationError("Could not find validator specified for argument",
-                                          argument=arg_name, validator_name=validator_name, arg_type=arg_type,
-                                          method=dir(checker_type), augmented_Type=checker_type)
+    return func
 
-                validator(val, *extra_args)
-        except (ValueError, TypeError) as exc:
-            raise ValidationError(exc.args[0], argument=arg_name, arg_value=val, arg_type=arg_type)
 
-        return val
+def _method_formatter(formatter_name, sub_formatters):
+    """Build a function that formats a value using one of its own methods.
+
+    The method depends on the value so it is looked up on every call but
+    whether it takes arguments is cached per value type.
+    """
+
+    takes_args = {}
+
+    def _format_with_method(value):
+        method = getattr(value, formatter_name, None)
+        if not callable(method):
+            raise ValidationError('Cannot convert return value to string', value=value)
+
+        value_type = type(value)
+        if value_type not in takes_args:
+            takes_args[value_type] = bool(inspect.signature(method).parameters)
+
+        if takes_args[value_type]:
+            return method(value, *sub_formatters)
+
+        return method()
+
+    return _format_with_method
 
 
 def _get_param_info(func_signature):
@@ -507,6 +915,44 @@ def _get_param_info(func_signature):
     return varargs, kwargs, arg_names, arg_defaults, has_self
 
 
+def _code_param_names(func):
+    """Get the parameter names that add_param accepts without inspecting the signature.
+
+    This reads the names directly from the function's code object, which is
+    much cheaper than building a Signature.  It returns None for anything that
+    is not a plain python function so that the caller falls back to the
+    signature.
+
+    Returns:
+        list(str): The positional-or-keyword parameter names, excluding a leading
+            self, followed by the names of the ``*args`` and ``**kwargs`` parameters.
+    """
+
+    code = getattr(func, '__code__', None)
+    if code is None or hasattr(func, '__wrapped__') or not inspect.isfunction(func):
+        return None
+
+    names = code.co_varnames
+    arg_count = code.co_argcount
+    kwonly_count = code.co_kwonlyargcount
+
+    posonly_count = getattr(code, 'co_posonlyargcount', 0)
+
+    param_names = list(names[posonly_count:arg_count])
+    if len(param_names) > 0 and param_names[0] == 'self' and posonly_count == 0:
+        param_names = param_names[1:]
+
+    index = arg_count + kwonly_count
+    if code.co_flags & inspect.CO_VARARGS:
+        param_names.append(names[index])
+        index += 1
+
+    if code.co_flags & inspect.CO_VARKEYWORDS:
+        param_names.append(names[index])
+
+    return param_names
+
+
 def _get_type_annotations(func_signature):
     type_annotations = {}
     for arg_name, arg_info in func_signature.parameters.items():
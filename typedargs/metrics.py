@@ -0,0 +1,205 @@
+"""Per-function call, error and latency metrics for HierarchicalShell."""
+
+import os
+import bisect
+import threading
+
+
+class FunctionMetrics:
+    """Counters and a latency histogram for a single function.
+
+    Args:
+        buckets (tuple(float)): The sorted upper bounds in seconds of each
+            histogram bucket.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.calls = 0
+        self.errors = {}
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.total_time = 0.0
+
+    def record(self, duration, error=None):
+        """Record a single call."""
+
+        self.calls += 1
+        self.total_time += duration
+        self.bucket_counts[bisect.bisect_left(self.buckets, duration)] += 1
+
+        if error is not None:
+            name = error.__class__.__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    @property
+    def error_count(self):
+        """The total number of calls that raised an exception."""
+
+        return sum(self.errors.values())
+
+    def quantile(self, fraction):
+        """Estimate a latency quantile from the histogram.
+
+        The estimate is the upper bound of the bucket that contains the
+        quantile, so it is never less than the true value.
+
+        Args:
+            fraction (float): The quantile to estimate between 0 and 1.
+
+        Returns:
+            float: The estimated latency in seconds or None if there have been
+                no calls or the quantile lies above the largest bucket.
+        """
+
+        if self.calls == 0:
+            return None
+
+        target = fraction * self.calls
+        seen = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            seen += count
+            if seen >= target:
+                return bound
+
+        return None
+
+
+class InvocationMetrics:
+    """Keeps track of calls, errors and latencies of shell invocations by function.
+
+    Args:
+        buckets (iterable(float)): Optional upper bounds in seconds for the
+            latency histogram buckets.  An implicit +Inf bucket is always added.
+    """
+
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, buckets=None):
+        if buckets is None:
+            buckets = self.DEFAULT_BUCKETS
+
+        self.buckets = tuple(sorted(buckets))
+        self._functions = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, duration, error=None):
+        """Record a single invocation.
+
+        Args:
+            name (str): The name of the function that was invoked.
+            duration (float): How long the invocation took in seconds.
+            error (Exception): The exception raised by the invocation, if any.
+        """
+
+        with self._lock:
+            metrics = self._functions.get(name)
+            if metrics is None:
+                metrics = FunctionMetrics(self.buckets)
+                self._functions[name] = metrics
+
+            metrics.record(duration, error)
+
+    def get(self, name):
+        """Get the metrics for a function or None if it has never been invoked.
+
+        Returns:
+            FunctionMetrics
+        """
+
+        return self._functions.get(name)
+
+    def reset(self):
+        """Discard all recorded metrics."""
+
+        with self._lock:
+            self._functions = {}
+
+    def format_table(self):
+        """Format a human readable table of all recorded metrics.
+
+        Returns:
+            str
+        """
+
+        lines = ["%-24s %8s %8s %10s %10s %10s %10s" % ("function", "calls", "errors", "mean (ms)", "p50 (ms)", "p90 (ms)", "p99 (ms)")]
+
+        with self._lock:
+            items = sorted(self._functions.items())
+
+        for name, metrics in items:
+            mean = metrics.total_time / metrics.calls * 1000.0
+            quantiles = [_format_ms(metrics.quantile(x)) for x in (0.5, 0.9, 0.99)]
+            lines.append("%-24s %8d %8d %10.3f %10s %10s %10s" % (name, metrics.calls, metrics.error_count, mean, *quantiles))
+
+            for error, count in sorted(metrics.errors.items()):
+                lines.append("  %-22s %17d" % (error, count))
+
+        return "\n".join(lines)
+
+    def format_prometheus(self, prefix='typedargs_shell'):
+        """Format all recorded metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): The prefix of all metric names.
+
+        Returns:
+            str
+        """
+
+        with self._lock:
+            items = sorted(self._functions.items())
+
+        calls = ["# HELP %s_calls_total Number of invocations by function." % prefix,
+                 "# TYPE %s_calls_total counter" % prefix]
+        errors = ["# HELP %s_errors_total Number of failed invocations by function and exception class." % prefix,
+                  "# TYPE %s_errors_total counter" % prefix]
+        latency = ["# HELP %s_latency_seconds Invocation latency by function." % prefix,
+                   "# TYPE %s_latency_seconds histogram" % prefix]
+
+        for name, metrics in items:
+            label = 'function="%s"' % _escape_label(name)
+
+            calls.append("%s_calls_total{%s} %d" % (prefix, label, metrics.calls))
+
+            for error, count in sorted(metrics.errors.items()):
+                errors.append('%s_errors_total{%s,error="%s"} %d' % (prefix, label, _escape_label(error), count))
+
+            cumulative = 0
+            for bound, count in zip(self.buckets, metrics.bucket_counts):
+                cumulative += count
+                latency.append('%s_latency_seconds_bucket{%s,le="%s"} %d' % (prefix, label, repr(float(bound)), cumulative))
+
+            latency.append('%s_latency_seconds_bucket{%s,le="+Inf"} %d' % (prefix, label, metrics.calls))
+            latency.append("%s_latency_seconds_sum{%s} %s" % (prefix, label, repr(metrics.total_time)))
+            latency.append("%s_latency_seconds_count{%s} %d" % (prefix, label, metrics.calls))
+
+        return "\n".join(calls + errors + latency) + "\n"
+
+    def dump_prometheus(self, path, prefix='typedargs_shell'):
+        """Atomically write all recorded metrics to a file in Prometheus text format.
+
+        The file is written to a temporary path first and then renamed so
+        that collectors such as the node_exporter textfile collector never
+        see a partially written file.
+
+        Args:
+            path (str): The path of the file to write.
+            prefix (str): The prefix of all metric names.
+        """
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, "w") as outfile:
+            outfile.write(self.format_prometheus(prefix))
+
+        os.replace(tmp_path, path)
+
+
+def _format_ms(value):
+    if value is None:
+        return "-"
+
+    return "%.3f" % (value * 1000.0)
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
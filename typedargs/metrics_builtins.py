@@ -0,0 +1,29 @@
+"""Shell builtins that show and export invocation metrics."""
+
+from typedargs.exceptions import ArgumentError
+from typedargs import annotate
+
+
+class MetricsBuiltinsMixin:
+    """The stats builtin of HierarchicalShell, which reports the shell's metrics."""
+
+    @annotate.takes_cmdline
+    @annotate.stringable
+    def _builtin_stats(self, args):
+        """Show call counts, errors and latencies of invoked functions.
+
+        Usage: stats [reset | save FILE]
+        """
+
+        if len(args) == 0:
+            return self.metrics.format_table()
+
+        if args == ['reset']:
+            self.metrics.reset()
+            return "Statistics reset"
+
+        if len(args) == 2 and args[0] == 'save':
+            self.metrics.dump_prometheus(args[1])
+            return "Statistics saved to %s" % args[1]
+
+        raise ArgumentError("Usage: stats [reset | save FILE]", arguments=args)
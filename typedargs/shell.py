@@ -12,14 +12,23 @@
 #Given a command line string, attempt to map it to a function and fill in
 #the parameters based on that function's annotated type information.
 
+import sys
+import time
 import inspect
 import shlex
 import platform
 import importlib
-from typedargs.exceptions import ArgumentError, NotFoundError, ValidationError
+from typedargs.exceptions import ArgumentError, NotFoundError, ValidationError, KeyValueException
 from typedargs import annotate, utils
 from typedargs import iprint
 from typedargs.typeinfo import type_system
+from typedargs.completion import ShellCompleter
+from typedargs.jobs import JobManager
+from typedargs.jsonlines import JSONLinesWriter
+from typedargs.metrics import InvocationMetrics
+from typedargs.job_builtins import JobBuiltinsMixin
+from typedargs.timing_builtins import TimingBuiltinsMixin
+from typedargs.metrics_builtins import MetricsBuiltinsMixin
 
 
 @annotate.context("root")
@@ -28,15 +37,138 @@ class InitialContext(dict):
     pass
 
 
-class HierarchicalShell:
-    """A hierarchical shell for navigating through python package API functions."""
+class InitCommandMap(dict):
+    """A dict of context path suffixes to initialization commands.
 
-    def __init__(self, name):
+    The map counts modifications so that HierarchicalShell knows when the
+    suffix index it builds from these commands needs to be rebuilt.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(InitCommandMap, self).__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super(InitCommandMap, self).__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super(InitCommandMap, self).__delitem__(key)
+        self.version += 1
+
+    def clear(self):
+        super(InitCommandMap, self).clear()
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return super(InitCommandMap, self).pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super(InitCommandMap, self).popitem()
+
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super(InitCommandMap, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super(InitCommandMap, self).update(*args, **kwargs)
+        self.version += 1
+
+
+class _InitCommandIndex:
+    """A reversed path trie that finds all init command keys that are suffixes of a path.
+
+    Keys are stored one character at a time starting from their last
+    character so that all of the keys matching a path can be found with a
+    single backwards walk over the path, which gives the same result as
+    checking path.endswith(key) for every key.  Matches are returned in
+    the insertion order of their keys.
+    """
+
+    def __init__(self, init_commands, split_line):
+        self._root = {}
+        self._split_line = split_line
+        self._tokens = {}
+
+        for order, key in enumerate(init_commands):
+            node = self._root
+            for char in reversed(key):
+                node = node.setdefault(char, {})
+
+            node.setdefault(None, []).append((order, key))
+
+    def _tokenize(self, key, cmds):
+        cmds = tuple(cmds)
+
+        cached = self._tokens.get(key)
+        if cached is None or cached[0] != cmds:
+            cached = (cmds, [self._split_line(cmd) for cmd in cmds])
+            self._tokens[key] = cached
+
+        return cached[1]
+
+    def match(self, path, init_commands):
+        """Find the pretokenized commands whose keys are suffixes of path.
+
+        Args:
+            path (str): The dotted path of the current context stack.
+            init_commands (dict): The init commands that this index was built from.
+
+        Returns:
+            list(list(str)): The tokenized commands to run in order.
+        """
+
+        matches = []
+        node = self._root
+
+        for i in range(len(path), -1, -1):
+            matches.extend(node.get(None, ()))
+            if i == 0:
+                break
+
+            node = node.get(path[i - 1])
+            if node is None:
+                break
+
+        if len(matches) > 1:
+            matches.sort()
+
+        commands = []
+        for _order, key in matches:
+            commands.extend(self._tokenize(key, init_commands[key]))
+
+        return commands
+
+
+class HierarchicalShell(JobBuiltinsMixin, TimingBuiltinsMixin, MetricsBuiltinsMixin):
+    """A hierarchical shell for navigating through python package API functions.
+
+    Args:
+        name (str): The name of this shell.
+        executor (concurrent.futures.Executor): An optional thread or process
+            pool used to run background jobs started with spawn or a trailing &.
+            If not passed, a thread pool is created when the first job is started
+            and shut down when the shell exits.
+    """
+
+    UNKNOWN_FUNCTION = "<unknown>"
+
+    def __init__(self, name, executor=None):
         self.name = name
-        self.init_commands = {}
+        self._init_commands = InitCommandMap()
+        self._init_index = None
+        self._init_index_version = None
+        self._context_paths = []
 
         self.root = InitialContext()
         self.contexts = [self.root]
+        self.completer = None
+        self.job_manager = JobManager(executor)
+        self.metrics = InvocationMetrics()
+        self._json_writer = None
+        self._init_depth = 0
 
         # Keep track of whether we are on windows because shlex does not dequote
         # strings the same on Windows as on other platforms
@@ -50,6 +182,53 @@ class HierarchicalShell:
         self.add_builtin('back', self._builtin_back)
         self.add_builtin('help', self._builtin_help)
         self.add_builtin('quit', self._builtin_quit)
+        self.add_builtin('spawn', self._builtin_spawn)
+        self.add_builtin('jobs', self._builtin_jobs)
+        self.add_builtin('wait', self._builtin_wait)
+        self.add_builtin('cancel', self._builtin_cancel)
+        self.add_builtin('time', self._builtin_time)
+        self.add_builtin('profile', self._builtin_profile)
+        self.add_builtin('stats', self._builtin_stats)
+
+    @property
+    def init_commands(self):
+        """Commands that are run whenever the context path ends with a given key.
+
+        Returns:
+            InitCommandMap: A dict of context path suffix to a list of command lines.
+        """
+
+        return self._init_commands
+
+    @init_commands.setter
+    def init_commands(self, value):
+        self._init_commands = InitCommandMap(value)
+
+    def set_output_mode(self, mode, stream=None):
+        """Choose how the results of invoked functions are reported.
+
+        In 'text' mode, results are formatted as human readable strings and
+        printed if the session is interactive.  In 'jsonl' mode, one JSON
+        object is written to stream per invocation with the function name, its
+        arguments, its result serialized according to its return type, the
+        time it took in seconds and any error that occurred.  Initialization
+        commands are not reported in either mode.
+
+        Args:
+            mode (str): Either 'text' or 'jsonl'.
+            stream (file-like): The stream to write JSON records to.  Defaults
+                to sys.stdout.
+        """
+
+        if mode == 'text':
+            self._json_writer = None
+        elif mode == 'jsonl':
+            if stream is None:
+                stream = sys.stdout
+
+            self._json_writer = JSONLinesWriter(stream)
+        else:
+            raise ArgumentError("Unknown output mode", mode=mode, known_modes=['text', 'jsonl'])
 
     def add_builtin(self, name, callable):
         """Add a builtin function callable from all contexts.
@@ -67,6 +246,7 @@ class HierarchicalShell:
     def root_update(self, dict_like):
         """Add entries to root from a dict_line object."""
         self.root.update(dict_like)
+        self._invalidate_completions(self.root)
 
     def root_add(self, name, value):
         """Add a single function to the root context.
@@ -78,6 +258,33 @@ class HierarchicalShell:
         """
 
         self.root[name] = value
+        self._invalidate_completions(self.root)
+
+    def enable_completion(self, manifest=None, install=True):
+        """Create a tab completer for this shell.
+
+        Completions are served from precomputed indices and never trigger
+        the lazy loading of functions added as strings.  The parameters of
+        lazily loaded functions can be described ahead of time in a manifest.
+
+        Args:
+            manifest (dict): An optional map of lazy import strings to
+                parameter descriptions.  See ShellCompleter for the format.
+            install (bool): Whether to install the completer into readline.
+
+        Returns:
+            ShellCompleter: The completer that was created.
+        """
+
+        self.completer = ShellCompleter(self, manifest)
+        if install:
+            self.completer.install()
+
+        return self.completer
+
+    def _invalidate_completions(self, context):
+        if self.completer is not None:
+            self.completer.invalidate(context)
 
     def context_name(self):
         """Get the string name of the current context."""
@@ -146,20 +353,59 @@ class HierarchicalShell:
         commands.
         """
 
-        path = ".".join([annotate.context_name(x) for x in self.contexts])
+        path = self._context_path()
+
+        if self._init_index is None or self._init_index_version != self._init_commands.version:
+            self._init_index = _InitCommandIndex(self._init_commands, self._split_line)
+            self._init_index_version = self._init_commands.version
+
+        commands = self._init_index.match(path, self._init_commands)
+        if len(commands) == 0:
+            return
 
         #Make sure we don't clutter up the output with return values from
         #initialization functions
         old_interactive = type_system.interactive
         type_system.interactive = False
 
-        for key, cmds in self.init_commands.items():
-            if path.endswith(key):
-                for cmd in cmds:
-                    line = self._split_line(cmd)
-                    self.invoke(line)
+        self._init_depth += 1
 
-        type_system.interactive = old_interactive
+        try:
+            for line in commands:
+                self.invoke(list(line))
+        finally:
+            self._init_depth -= 1
+            type_system.interactive = old_interactive
+
+    def _context_path(self):
+        """Get the dotted path of the current context stack.
+
+        The path of each level of the stack is cached along with the context
+        that produced it so only contexts that were pushed since the last
+        call need to have their names appended.
+        """
+
+        paths = self._context_paths
+        contexts = self.contexts
+
+        depth = 0
+        limit = min(len(paths), len(contexts))
+        while depth < limit and paths[depth][0] is contexts[depth]:
+            depth += 1
+
+        del paths[depth:]
+
+        for con in contexts[depth:]:
+            name = annotate.context_name(con)
+            if len(paths) > 0:
+                name = paths[-1][1] + '.' + name
+
+            paths.append((con, name))
+
+        if len(paths) == 0:
+            return ""
+
+        return paths[-1][1]
 
     @annotate.finalizer
     def _builtin_back(self):
@@ -408,7 +654,7 @@ class HierarchicalShell:
 
         return next_arg
 
-    def invoke_one(self, line):
+    def invoke_one(self, line, stream=None, timer=None):
         """Invoke a function given a list of arguments with the function listed first.
 
         The function is searched for using the current context on the context stack
@@ -417,6 +663,12 @@ class HierarchicalShell:
 
         Args:
             line (list): The list of command line arguments.
+            stream (file-like): An optional text stream.  If given, data returned from
+                the function is written directly to it, followed by a newline, rather than
+                being formatted as a string and returned.  Types that support it write
+                large values incrementally.
+            timer (PhaseTimer): An optional timer that the time spent parsing, converting,
+                executing and formatting this call is added to.
 
         Returns:
             (object, list, bool): A tuple containing the return value of the function, if any,
@@ -425,47 +677,179 @@ class HierarchicalShell:
                 did not consume all arguments.
         """
 
+        if timer is not None:
+            timer.start()
+
         funname = line.pop(0)
+        start = time.perf_counter()
 
         context = self.contexts[-1]
-        func = self.find_function(context, funname)
+
+        try:
+            func = self.find_function(context, funname)
+        except NotFoundError as exc:
+            # Don't create a new set of metrics for every mistyped name
+            self.metrics.record(self.UNKNOWN_FUNCTION, time.perf_counter() - start, exc)
+            raise
+
+        try:
+            val, line, finished = self._invoke_found(funname, func, line, start, stream, timer)
+        except Exception as exc:
+            self.metrics.record(funname, time.perf_counter() - start, exc)
+            raise
+
+        self.metrics.record(funname, time.perf_counter() - start)
+
+        # Wait for background jobs and stop their threads once the shell exits
+        if len(self.contexts) == 0:
+            self.job_manager.shutdown()
+
+        return val, line, finished
+
+    def _invoke_found(self, funname, func, line, start, stream=None, timer=None):
+        """Invoke a function that has already been found in the current context.
+
+        See invoke_one for a description of the arguments and return value.
+        """
+
+        writer = self._json_writer if self._init_depth == 0 else None
+        if writer is not None:
+            record = {'function': funname}
 
         #If this is a context derived from a module or package, just jump to it
         #since there is no initialization function
         if isinstance(func, dict):
             self.contexts.append(func)
             self._check_initialize_context()
+
+            if timer is not None:
+                timer.lap('parse')
+
+            if writer is not None:
+                record['args'] = []
+                record['result'] = None
+                record['duration'] = time.perf_counter() - start
+                writer.write(record)
+
             return None, line, False
 
-        # If the function wants arguments directly, do not parse them, otherwise turn them
-        # into positional and kw arguments
-        if func.takes_cmdline is True:
-            val = func(line)
-            line = []
+        try:
+            # If the function wants arguments directly, do not parse them, otherwise turn them
+            # into positional and kw arguments
+            if func.takes_cmdline is True:
+                if writer is not None:
+                    record['args'] = list(line)
+
+                if timer is not None:
+                    timer.lap('parse')
+
+                val = func(line)
+                line = []
+            else:
+                posargs, kwargs, line = self.process_arguments(func, line)
+                if writer is not None:
+                    record['args'] = list(posargs)
+                    record['kwargs'] = dict(kwargs)
+
+                #We need to check for not enough args for classes before calling or the call won't make it all the way to __init__
+                if inspect.isclass(func) and not func.metadata.spec_filled(posargs, kwargs):
+                    raise ValidationError("Not enough parameters specified to call function", function=func.metadata.name, signature=func.metadata.signature())
+
+                if timer is not None:
+                    timer.lap('parse')
+                    val = self._timed_call(func, posargs, kwargs, timer)
+                else:
+                    val = func(*posargs, **kwargs)
+
+            if timer is not None:
+                timer.lap('execute')
+
+            if writer is not None:
+                val, finished = self._process_result(func, val, as_json=True)
+            else:
+                val, finished = self._process_result(func, val, stream=stream)
+
+            if timer is not None:
+                timer.lap('format')
+        except Exception as exc:
+            if writer is not None:
+                if isinstance(exc, KeyValueException):
+                    record['error'] = exc.to_dict()
+                else:
+                    record['error'] = {'reason': str(exc), 'type': exc.__class__.__name__, 'params': {}}
+
+                record['duration'] = time.perf_counter() - start
+                writer.write(record)
+
+            raise
+
+        if writer is not None:
+            record['result'] = val
+            record['duration'] = time.perf_counter() - start
+            writer.write(record)
+            val = None
+
+        return val, line, finished
+
+    @classmethod
+    def _timed_call(cls, func, posargs, kwargs, timer):
+        """Call a function, converting its arguments before its typed wrapper is called.
+
+        This lets the time spent converting arguments be reported separately
+        from the time spent executing.  Class constructors convert their
+        arguments internally so that time is reported as execution time.
+        """
+
+        if inspect.isclass(func):
+            return func(*posargs, **kwargs)
+
+        if inspect.ismethod(func):
+            posargs = [func.__self__] + posargs
+            raw_func = annotate.unwrap_typed(func.__func__)
         else:
-            posargs, kwargs, line = self.process_arguments(func, line)
+            raw_func = annotate.unwrap_typed(func)
 
-            #We need to check for not enough args for classes before calling or the call won't make it all the way to __init__
-            if inspect.isclass(func) and not func.metadata.spec_filled(posargs, kwargs):
-                raise ValidationError("Not enough parameters specified to call function", function=func.metadata.name, signature=func.metadata.signature())
+        convargs, convkw = func.metadata.convert_call(posargs, kwargs)
+        timer.lap('convert')
+        return raw_func(*convargs, **convkw)
 
-            val = func(*posargs, **kwargs)
+    def _process_result(self, func, val, as_json=False, stream=None):
+        """Update our current context if a function destroyed it or returned a new one.
 
-        # Update our current context if this function destroyed it or returned a new one.
-        finished = True
+        Args:
+            func (callable): The annotated function that was invoked.
+            val (object): The value returned from func.
+            as_json (bool): Convert data return values to JSON serializable
+                objects rather than formatting them as strings.
+            stream (file-like): Write data return values to this text stream
+                rather than formatting them as strings.
+
+        Returns:
+            (object, bool): The formatted return value, if any, and whether the
+                function did not create a new context.
+        """
 
         if func.finalizer is True:
             self.contexts.pop()
-        elif val is not None:
-            if func.metadata.returns_data():
-                val = func.metadata.format_returnvalue(val)
-            else:
-                self.contexts.append(val)
-                self._check_initialize_context()
-                finished = False
-                val = None
+            return val, True
 
-        return val, line, finished
+        if val is None:
+            return None, True
+
+        if func.metadata.returns_data():
+            if as_json:
+                return func.metadata.json_returnvalue(val), True
+
+            if stream is not None:
+                func.metadata.write_returnvalue(val, stream)
+                stream.write('\n')
+                return None, True
+
+            return func.metadata.format_returnvalue(val), True
+
+        self.contexts.append(val)
+        self._check_initialize_context()
+        return None, False
 
     def invoke(self, line):
         """Invoke a one or more function given a list of arguments.
@@ -485,8 +869,12 @@ class HierarchicalShell:
 
         finished = True
 
+        # Results are written straight to stdout so that large values are
+        # not formatted in memory first
+        stream = sys.stdout if type_system.interactive else None
+
         while len(line) > 0:
-            val, line, finished = self.invoke_one(line)
+            val, line, finished = self.invoke_one(line, stream)
             if val is not None:
                 iprint(val)
 
@@ -514,5 +902,14 @@ class HierarchicalShell:
         if line[0] == u'#':
             return True
 
+        self._report_finished_jobs()
+
         args = self._split_line(line)
+
+        # A trailing & runs the command in the background
+        if len(args) > 0 and args[-1] == '&':
+            job = self.spawn(args[:-1])
+            iprint("[%d] %s" % (job.id, job.command))
+            return True
+
         return self.invoke(args)
@@ -0,0 +1,105 @@
+"""A cache of file system metadata shared by the path validators of a call.
+
+Validating a path argument can take several system calls, like checking
+that its parent directory exists and then that it is writable, and the same
+path is often validated by several validators in a single invocation.  On
+network file systems each of these calls can take milliseconds, so results
+are cached while the validators of a call run.
+"""
+
+import os
+import stat
+import threading
+import contextlib
+
+
+class StatCache:
+    """Caches os.stat and os.access results while a scope is open.
+
+    Results are only cached between entering and leaving scope(), which
+    validation does around all of the validators of a value, and the cache is
+    emptied when the outermost scope is left so that changes to the file
+    system are noticed by the next call.  Failed checks, like a path that
+    does not exist, are never cached.  The cache can be shared between
+    threads.
+
+    Args:
+        max_entries (int): The number of entries after which the cache is
+            emptied to bound its memory use.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._depth = 0
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def scope(self):
+        """Cache results until the outermost open scope is left."""
+
+        with self._lock:
+            self._depth += 1
+
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._entries = {}
+
+    def _lookup(self, key, func, *args):
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        result = func(*args)
+        if not result:
+            return result
+
+        with self._lock:
+            if self._depth > 0:
+                if len(self._entries) >= self.max_entries:
+                    self._entries = {}
+
+                self._entries[key] = result
+
+        return result
+
+    def stat(self, path):
+        """Get the os.stat() result for a path or None if it does not exist."""
+
+        return self._lookup(('stat', path), _stat_or_none, path)
+
+    def access(self, path, mode):
+        """Check os.access(path, mode) for the current user."""
+
+        return self._lookup(('access', path, mode), os.access, path, mode)
+
+    def is_file(self, path):
+        """Check if path exists and is a regular file."""
+
+        info = self.stat(path)
+        return info is not None and stat.S_ISREG(info.st_mode)
+
+    def is_dir(self, path):
+        """Check if path exists and is a directory."""
+
+        info = self.stat(path)
+        return info is not None and stat.S_ISDIR(info.st_mode)
+
+    def clear(self):
+        """Forget all cached results."""
+
+        self._entries = {}
+
+
+def _stat_or_none(path):
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
+stat_cache = StatCache()
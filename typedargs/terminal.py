@@ -9,7 +9,6 @@ import os
 import shlex
 import struct
 import platform
-import subprocess
 
 
 def get_terminal_size():
@@ -61,6 +60,7 @@ def _get_terminal_size_tput():
     # get terminal width
     # src: http://stackoverflow.com/questions/263890/how-do-i-find-the-width-height-of-a-terminal-window
     try:
+        import subprocess
         cols = int(subprocess.check_output(shlex.split('tput cols')))
         rows = int(subprocess.check_output(shlex.split('tput lines')))
         return (cols, rows)
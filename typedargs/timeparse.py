@@ -0,0 +1,283 @@
+"""Parsing and formatting of the time formats used by the datetime types.
+
+The datetime, date and duration types accept several input formats: ISO-8601
+strings, epoch seconds or milliseconds and relative times like "-5m".  Each
+format has a parser that returns NO_MATCH instead of raising when a string
+is not in its format, so detecting the format of a value is cheap.  Parsers
+are always tried in the same order so that strings that are valid in several
+formats, like "20230101" which is both epoch seconds and a compact ISO-8601
+date, are always converted the same way.
+
+Datetimes created from epoch and relative times are timezone aware and in
+UTC.  ISO-8601 strings keep the timezone they were given in, if any, and
+naive datetimes are treated as UTC when they are formatted as epoch times.
+"""
+
+import re
+import sys
+import datetime
+
+NO_MATCH = object()
+
+# Epoch values with a larger magnitude than this are in milliseconds.  As
+# seconds it would be a date more than 3000 years in the future.
+EPOCH_MS_THRESHOLD = 1e11
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+_UNITS = {
+    'ms': 'milliseconds',
+    's': 'seconds',
+    'm': 'minutes',
+    'h': 'hours',
+    'd': 'days',
+    'w': 'weeks'
+}
+
+_NUMBER = r"(?:\d+(?:\.\d*)?|\.\d+)"
+_EPOCH = re.compile(r"[-+]?%s" % _NUMBER)
+_UNIT_DURATION = re.compile(r"([-+])?((?:%s(?:ms|s|m|h|d|w))+)" % _NUMBER)
+_UNIT_PART = re.compile(r"(%s)(ms|s|m|h|d|w)" % _NUMBER)
+_CLOCK_DURATION = re.compile(r"(?:([-+]?\d+) days?, )?(\d+):(\d\d):(\d\d(?:\.\d+)?)")
+_ISO_DURATION = re.compile(r"([-+])?P(?:(%s)W)?(?:(%s)D)?(?:T(?:(%s)H)?(?:(%s)M)?(?:(%s)S)?)?"
+                           % ((_NUMBER,) * 5), re.IGNORECASE)
+
+# datetime.fromisoformat only accepts a trailing Z from python 3.11 on
+_NEEDS_Z_FIXUP = sys.version_info < (3, 11)
+
+
+def make_parsing_converter(parsers, convert_object, type_name):
+    """Create a converter that parses strings with the first matching parser.
+
+    Args:
+        parsers (list of callable): Functions that take a stripped string and
+            return the converted value or NO_MATCH.  They are tried in order,
+            so earlier parsers take precedence for ambiguous strings.
+        convert_object (callable): Converts values that are not strings.
+        type_name (str): The type name used in error messages.
+
+    Returns:
+        callable: A function that takes a single value and returns the
+            converted value.  Values outside of the range of the datetime
+            classes raise ValueError.
+    """
+
+    def _convert(value):
+        if value is None:
+            return None
+
+        try:
+            if not isinstance(value, str):
+                return convert_object(value)
+
+            text = value.strip()
+            for parser in parsers:
+                result = parser(text)
+                if result is not NO_MATCH:
+                    return result
+        except (OverflowError, OSError):
+            raise ValueError("%r is out of range for a %s" % (value, type_name))
+
+        raise ValueError("%r is not a valid %s" % (value, type_name))
+
+    return _convert
+
+
+def parse_epoch(text):
+    """Parse epoch seconds or milliseconds into a UTC datetime."""
+
+    if _EPOCH.fullmatch(text) is None:
+        return NO_MATCH
+
+    if '.' in text:
+        return epoch_to_datetime(float(text))
+
+    return epoch_to_datetime(int(text))
+
+
+def epoch_to_datetime(number):
+    """Convert epoch seconds or milliseconds into a UTC datetime."""
+
+    if abs(number) >= EPOCH_MS_THRESHOLD:
+        return EPOCH + datetime.timedelta(milliseconds=number)
+
+    return EPOCH + datetime.timedelta(seconds=number)
+
+
+def parse_iso_datetime(text):
+    """Parse an ISO-8601 datetime with datetime.fromisoformat."""
+
+    if _NEEDS_Z_FIXUP and text[-1:] in ('Z', 'z'):
+        text = text[:-1] + '+00:00'
+
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return NO_MATCH
+
+
+def parse_iso_date(text):
+    """Parse an ISO-8601 date, or the date part of an ISO-8601 datetime."""
+
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        pass
+
+    value = parse_iso_datetime(text)
+    if value is NO_MATCH:
+        return NO_MATCH
+
+    return value.date()
+
+
+def parse_relative(text):
+    """Parse 'now' or a duration in units relative to now, like '-5m'."""
+
+    if text.lower() == 'now':
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    delta = parse_unit_duration(text)
+    if delta is NO_MATCH:
+        return NO_MATCH
+
+    return datetime.datetime.now(datetime.timezone.utc) + delta
+
+
+def parse_unit_duration(text):
+    """Parse a duration in units like '5m', '-1h30m' or '250ms'."""
+
+    match = _UNIT_DURATION.fullmatch(text)
+    if match is None:
+        return NO_MATCH
+
+    delta = datetime.timedelta()
+    for number, unit in _UNIT_PART.findall(match.group(2)):
+        delta += datetime.timedelta(**{_UNITS[unit]: float(number)})
+
+    if match.group(1) == '-':
+        return -delta
+
+    return delta
+
+
+def parse_seconds(text):
+    """Parse a duration given as a number of seconds."""
+
+    if _EPOCH.fullmatch(text) is None:
+        return NO_MATCH
+
+    return datetime.timedelta(seconds=float(text))
+
+
+def parse_clock_duration(text):
+    """Parse a duration like '1:30:00' or '2 days, 1:30:00' as printed by str(timedelta)."""
+
+    match = _CLOCK_DURATION.fullmatch(text)
+    if match is None:
+        return NO_MATCH
+
+    days, hours, minutes, seconds = match.groups()
+    return datetime.timedelta(days=int(days or 0), hours=int(hours), minutes=int(minutes),
+                              seconds=float(seconds))
+
+
+def parse_iso_duration(text):
+    """Parse an ISO-8601 duration like 'PT5M' or 'P1DT2H'.
+
+    Years and months are not supported since their length varies.
+    """
+
+    match = _ISO_DURATION.fullmatch(text)
+    if match is None or text[-1:] in ('P', 'p', 'T', 't'):
+        return NO_MATCH
+
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = datetime.timedelta(weeks=float(weeks or 0), days=float(days or 0), hours=float(hours or 0),
+                               minutes=float(minutes or 0), seconds=float(seconds or 0))
+
+    if sign == '-':
+        return -delta
+
+    return delta
+
+
+def format_seconds(delta):
+    """Format a timedelta as a number of seconds, without a fraction if it is whole."""
+
+    if delta.microseconds == 0:
+        return str(delta.days * 86400 + delta.seconds)
+
+    return repr(delta.total_seconds())
+
+
+def datetime_to_epoch(value):
+    """Get the timedelta from the epoch to a datetime, treating naive datetimes as UTC."""
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+
+    return value - EPOCH
+
+
+def format_unit_duration(delta):
+    """Format a timedelta in units, like '1d2h', '-5m' or '1s500ms'.
+
+    The result can be parsed again by parse_unit_duration.
+    """
+
+    sign = ''
+    if delta < datetime.timedelta():
+        sign = '-'
+        delta = -delta
+
+    minutes, seconds = divmod(delta.seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    micros = delta.microseconds
+
+    parts = ["%d%s" % (count, unit) for count, unit in ((delta.days, 'd'), (hours, 'h'), (minutes, 'm'))
+             if count]
+
+    if micros % 1000 != 0:
+        parts.append(("%d.%06d" % (seconds, micros)).rstrip('0') + 's')
+    else:
+        if seconds:
+            parts.append("%ds" % seconds)
+        if micros:
+            parts.append("%dms" % (micros // 1000))
+
+    if not parts:
+        return '0s'
+
+    return sign + ''.join(parts)
+
+
+def format_iso_duration(delta):
+    """Format a timedelta as an ISO-8601 duration like 'P1DT2H30M'."""
+
+    sign = ''
+    if delta < datetime.timedelta():
+        sign = '-'
+        delta = -delta
+
+    minutes, seconds = divmod(delta.seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+
+    result = sign + 'P'
+    if delta.days:
+        result += '%dD' % delta.days
+
+    time_part = ''
+    if hours:
+        time_part += '%dH' % hours
+    if minutes:
+        time_part += '%dM' % minutes
+    if delta.microseconds:
+        time_part += ("%d.%06d" % (seconds, delta.microseconds)).rstrip('0') + 'S'
+    elif seconds or (not time_part and not delta.days):
+        time_part += '%dS' % seconds
+
+    if time_part:
+        result += 'T' + time_part
+
+    return result
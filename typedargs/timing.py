@@ -0,0 +1,98 @@
+"""Helpers for timing and profiling shell invocations."""
+
+import io
+import time
+import cProfile
+import pstats
+
+# The keys that pstats can sort profile entries by
+PROFILE_SORT_KEYS = tuple(sorted(pstats.Stats.sort_arg_dict_default))
+
+
+class PhaseTimer:
+    """Accumulate wall and CPU time spent in each phase of an invocation.
+
+    Phases are measured back to back: calling start() begins measuring and
+    each call to lap() attributes the time since the previous call to the
+    named phase.  CPU time is measured for the calling thread only, so work
+    done by background jobs at the same time is not included.
+    """
+
+    PHASES = ('parse', 'convert', 'execute', 'format')
+
+    def __init__(self):
+        self.wall = {x: 0.0 for x in self.PHASES}
+        self.cpu = {x: 0.0 for x in self.PHASES}
+        self.count = 0
+
+        self._last_wall = None
+        self._last_cpu = None
+
+    def start(self):
+        """Start timing a new invocation."""
+
+        self.count += 1
+        self._last_wall = time.perf_counter()
+        self._last_cpu = time.thread_time()
+
+    def lap(self, phase):
+        """Attribute the time since the last lap to a phase."""
+
+        now_wall = time.perf_counter()
+        now_cpu = time.thread_time()
+
+        self.wall[phase] += now_wall - self._last_wall
+        self.cpu[phase] += now_cpu - self._last_cpu
+
+        self._last_wall = now_wall
+        self._last_cpu = now_cpu
+
+    def format(self):
+        """Format a table of the time spent in each phase.
+
+        Returns:
+            str: The table with times in milliseconds.
+        """
+
+        lines = ["%-10s %12s %12s" % ("phase", "wall (ms)", "cpu (ms)")]
+
+        for phase in self.PHASES:
+            lines.append("%-10s %12.3f %12.3f" % (phase, self.wall[phase] * 1000.0, self.cpu[phase] * 1000.0))
+
+        lines.append("%-10s %12.3f %12.3f" % ("total", sum(self.wall.values()) * 1000.0, sum(self.cpu.values()) * 1000.0))
+        lines.append("%d invocation(s)" % self.count)
+        return "\n".join(lines)
+
+
+def profile_call(func, *args, sort='cumulative', limit=25, output=None, **kwargs):
+    """Run a function under cProfile and format its top entries.
+
+    Args:
+        func (callable): The function to profile.
+        *args: Positional arguments to pass to func.
+        sort (str): The pstats key to sort entries by.
+        limit (int): The number of entries to include.
+        output (str): An optional path to save the raw profile data to so
+            that it can be loaded later with pstats or other tools.
+        **kwargs: Keyword arguments to pass to func.
+
+    Returns:
+        (object, str): The return value of func and the formatted profile.
+    """
+
+    profiler = cProfile.Profile()
+
+    profiler.enable()
+    try:
+        retval = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+
+    if output is not None:
+        profiler.dump_stats(output)
+
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats(sort).print_stats(limit)
+
+    return retval, out.getvalue()
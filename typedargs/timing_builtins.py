@@ -0,0 +1,63 @@
+"""Shell builtins that time and profile commands."""
+
+from typedargs.exceptions import ArgumentError
+from typedargs import annotate
+from typedargs import iprint
+from typedargs.timing import PhaseTimer, profile_call, PROFILE_SORT_KEYS
+
+
+class TimingBuiltinsMixin:
+    """The time and profile builtins of HierarchicalShell.
+
+    Commands are run with the shell's invoke_one and invoke methods.
+    """
+
+    @annotate.takes_cmdline
+    @annotate.stringable
+    def _builtin_time(self, args):
+        """Run commands and report the time spent parsing, converting, executing and formatting."""
+
+        if len(args) == 0:
+            raise ArgumentError("Usage: time <command...>")
+
+        timer = PhaseTimer()
+        line = list(args)
+
+        while len(line) > 0:
+            val, line, _finished = self.invoke_one(line, timer=timer)
+            if val is not None:
+                iprint(val)
+
+        return timer.format()
+
+    @annotate.takes_cmdline
+    @annotate.stringable
+    def _builtin_profile(self, args):
+        """Run commands under cProfile and report the top entries.
+
+        Usage: profile [--sort=KEY] [--limit=N] [--output=FILE] <command...>
+        """
+
+        options = {'sort': 'cumulative', 'limit': '25', 'output': None}
+
+        line = list(args)
+        while len(line) > 0 and line[0].startswith('--'):
+            name, _equals, value = line.pop(0)[2:].partition('=')
+            if name not in options or value == '':
+                raise ArgumentError("Unknown profile option, usage: profile [--sort=KEY] [--limit=N] [--output=FILE] <command...>", option=name)
+
+            options[name] = value
+
+        if len(line) == 0:
+            raise ArgumentError("Usage: profile [--sort=KEY] [--limit=N] [--output=FILE] <command...>")
+
+        if options['sort'] not in PROFILE_SORT_KEYS:
+            raise ArgumentError("Unknown profile sort key", sort=options['sort'], known_keys=list(PROFILE_SORT_KEYS))
+
+        try:
+            limit = int(options['limit'])
+        except ValueError:
+            raise ArgumentError("Invalid profile entry limit", limit=options['limit'])
+
+        _finished, report = profile_call(self.invoke, line, sort=options['sort'], limit=limit, output=options['output'])
+        return report
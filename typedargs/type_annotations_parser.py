@@ -7,9 +7,14 @@ from typedargs.basic_structures import ParameterInfo, ReturnInfo
 
 
 def _get_type_name(type_class):
+    # Unions have no __name__ before python 3.10
+    if getattr(type_class, '__origin__', None) is typing.Union:
+        from typedargs.utils import get_typing_type_name
+        return get_typing_type_name(type_class).lower()
+
     type_name = getattr(type_class, '__name__', None)
 
-    if inspect.getmodule(type_class) == typing and type_name in ('Dict', 'List', 'Tuple'):
+    if inspect.getmodule(type_class) == typing and type_name in ('Dict', 'List', 'Tuple', 'Optional', 'Union'):
         type_name = type_name.lower()
 
     return type_name
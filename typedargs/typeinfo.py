@@ -20,7 +20,8 @@ import sys
 import typing
 
 from typedargs.exceptions import ValidationError, ArgumentError, KeyValueException
-from typedargs import types, utils
+from typedargs import utils
+from typedargs.hooks import HookRegistry
 
 
 class TypeSystem:
@@ -40,8 +41,15 @@ class TypeSystem:
         self.type_factories = {}
         self._mapped_builtin_types = {}
         self._mapped_complex_types = {}
+        self._mapped_base_classes = {}
+        self._class_type_factories = []
+        self._unmapped_classes = set()
         self._complex_type_proxies = {}
+        self._format_functions = {}
+        self._trusted_classes = {}
         self.logger = logging.getLogger(__name__)
+        self.hooks = HookRegistry()
+        self._deferred_type_modules = []
 
         for arg in args:
             self.load_type_module(arg)
@@ -77,6 +85,27 @@ class TypeSystem:
 
         self._lazy_type_sources.append((source, name))
 
+    def defer_type_module(self, module_name):
+        """Register a module of types that is only imported when first needed.
+
+        The module is imported and loaded with load_type_module the first
+        time any type is looked up or injected, so that creating a
+        TypeSystem does not require importing all of its type modules.
+
+        Args:
+            module_name (str): The importable name of the module.
+        """
+
+        self._deferred_type_modules.append(module_name)
+
+    def _load_deferred_type_modules(self):
+        module_names = self._deferred_type_modules
+        self._deferred_type_modules = []
+
+        for module_name in module_names:
+            __import__(module_name)
+            self.load_type_module(sys.modules[module_name])
+
     def _get_type_and_proxy(self, type_or_name):
         """
         Normally, we expect that the type objects contain a certain set of methods
@@ -110,6 +139,14 @@ class TypeSystem:
         modify the conversion process, \\**kwargs is passed
         through to the underlying conversion function
         """
+
+        if self.hooks.active:
+            return self.hooks.timed(HookRegistry.CONVERT, type_or_name, None, self._convert_to_type,
+                                    value, type_or_name, **kwargs)
+
+        return self._convert_to_type(value, type_or_name, **kwargs)
+
+    def _convert_to_type(self, value, type_or_name, **kwargs):
         type_obj, proxy_obj = self._get_type_and_proxy(type_or_name)
 
         # Legacy types supported conversion from binary
@@ -121,12 +158,17 @@ class TypeSystem:
         if type_obj is not None and not utils.is_class_from_typing(type_obj):
             # When we have a proper modern type class that supports isinstance()
             # checks, we can just verify if we actually need to do anything
-            if value is None or isinstance(value, type_obj):
+            if value is None or _is_converted(value, type_obj, proxy_obj):
                 return value
 
             # If the value is not already the right type, we only support converting
-            # from string.
+            # from string, unless the class was handled by a type factory or its
+            # type sets ACCEPTS_NON_STRINGS, since their convert functions also
+            # accept other values.
             if not isinstance(value, str):
+                if type_obj in self._complex_type_proxies or getattr(proxy_obj, 'ACCEPTS_NON_STRINGS', False):
+                    return self._convert_with_proxy(value, type_obj, proxy_obj, **kwargs)
+
                 raise ValidationError("Value was not the right type and was not a string",
                                       expected_type=type_obj, value=value)
 
@@ -137,12 +179,152 @@ class TypeSystem:
         # implicitly checks if the value is already converted and just returns
         # it.
 
+        return self._convert_with_proxy(value, type_or_name, proxy_obj, **kwargs)
+
+    @classmethod
+    def _convert_with_proxy(cls, value, type_or_name, proxy_obj, **kwargs):
         try:
             return proxy_obj.convert(value, **kwargs)
         except (ValueError, TypeError) as exc:
             raise ValidationError("Could not convert value", type=type_or_name, value=value,
                                   error_message=str(exc))
 
+    def try_convert(self, value, type_or_name, default=None):
+        """Convert value to type 'type_or_name' or return default if it cannot be.
+
+        This is meant for callers that expect conversions to fail regularly,
+        like when trying several candidate types in turn, so no
+        ValidationError is created for values that cannot be converted.
+
+        Returns:
+            object: The converted value or default.
+        """
+
+        if self.hooks.active:
+            try:
+                return self.hooks.timed(HookRegistry.CONVERT, type_or_name, None, self._convert_to_type, value, type_or_name)
+            except (ValueError, TypeError, KeyValueException):
+                return default
+
+        try:
+            type_obj, proxy_obj = self._get_type_and_proxy(type_or_name)
+
+            # Call converters directly so that their errors are not wrapped in
+            # a ValidationError that we would just discard.
+            if (type_obj is None or utils.is_class_from_typing(type_obj)) and not isinstance(value, bytearray):
+                return proxy_obj.convert(value)
+
+            if type_obj is not None:
+                return self._try_convert_class(value, type_obj, proxy_obj, default)
+
+            return self._convert_to_type(value, type_or_name)
+        except (ValueError, TypeError, KeyValueException):
+            return default
+
+    def _try_convert_class(self, value, type_obj, proxy_obj, default):
+        """Convert a value to a class like _convert_to_type but return default if it cannot be."""
+
+        if value is None or _is_converted(value, type_obj, proxy_obj):
+            return value
+
+        if not isinstance(value, str):
+            if type_obj in self._complex_type_proxies or getattr(proxy_obj, 'ACCEPTS_NON_STRINGS', False):
+                return proxy_obj.convert(value)
+
+            return default
+
+        converting_obj = proxy_obj
+        if converting_obj is None:
+            converting_obj = type_obj
+
+        if inspect.isclass(converting_obj) and type_obj not in self._complex_type_proxies:
+            from_string = getattr(converting_obj, 'FromString', None)
+            if from_string is None:
+                return default
+
+            return from_string(value)
+
+        converted_value = converting_obj.convert(value)
+        if not isinstance(converted_value, type_obj):
+            return default
+
+        return converted_value
+
+    def make_converter(self, type_or_name):
+        """Create a function that converts values to type 'type_or_name'.
+
+        Types can keep per call site state, like caches of how previous values
+        were converted, by defining a make_converter() method that returns a
+        function taking a single value.  Classes handled by a type factory are
+        converted by calling their convert function directly, builtin classes
+        like int are converted without looking up their type on each call and
+        all other types by calling convert_to_type.
+
+        Returns:
+            callable: A function that takes a value and returns the converted value.
+        """
+
+        proxy_obj = None
+        if isinstance(type_or_name, str) or utils.is_class_from_typing(type_or_name):
+            proxy_obj = self.get_proxy_for_type(type_or_name)
+        elif inspect.isclass(type_or_name) and self.is_known_type(type_or_name):
+            proxy_obj = self._mapped_builtin_types.get(type_or_name)
+            if proxy_obj is not None and not hasattr(proxy_obj, 'make_converter'):
+                return self._make_builtin_converter(type_or_name, proxy_obj)
+
+            if proxy_obj is None:
+                proxy_obj = self._complex_type_proxies.get(type_or_name)
+
+        factory = getattr(proxy_obj, 'make_converter', None)
+        if factory is not None:
+            convert = factory()
+        elif type_or_name in self._complex_type_proxies and not utils.is_class_from_typing(type_or_name):
+            convert = proxy_obj.convert
+        else:
+            return lambda value: self.convert_to_type(value, type_or_name)
+
+        hooks = self.hooks
+
+        def _convert(value):
+            try:
+                if hooks.active:
+                    return hooks.timed(HookRegistry.CONVERT, type_or_name, None, convert, value)
+
+                return convert(value)
+            except (ValueError, TypeError) as exc:
+                raise ValidationError("Could not convert value", type=type_or_name, value=value,
+                                      error_message=str(exc))
+
+        return _convert
+
+    def _make_builtin_converter(self, type_obj, proxy_obj):
+        """Compile the conversion that _convert_to_type does for a builtin class."""
+
+        hooks = self.hooks
+        accepts_non_strings = getattr(proxy_obj, 'ACCEPTS_NON_STRINGS', False)
+        convert_subclasses = getattr(proxy_obj, 'CONVERT_SUBCLASSES', False)
+
+        def _convert(value):
+            if value is None or (value.__class__ is type_obj if convert_subclasses else isinstance(value, type_obj)):
+                if hooks.active:
+                    hooks.fire(HookRegistry.CONVERT, type_obj, None, 0.0, True)
+
+                return value
+
+            if hooks.active:
+                return hooks.timed(HookRegistry.CONVERT, type_obj, None, self._convert_to_type, value, type_obj)
+
+            if not isinstance(value, str):
+                if accepts_non_strings:
+                    return self._convert_with_proxy(value, type_obj, proxy_obj)
+
+                raise ValidationError("Value was not the right type and was not a string",
+                                      expected_type=type_obj, value=value)
+
+            return self._try_convert_from_string(value, type_obj, proxy_obj)
+
+        return _convert
+
     def convert_from_binary(self, binvalue, type, **kwargs):
         """
         Convert binary data to type 'type'.
@@ -184,8 +366,112 @@ class TypeSystem:
         And format, if given, must specify a valid formatting option for the specified type.
         """
 
+        if self.hooks.active:
+            return self.hooks.timed(HookRegistry.FORMAT, type_or_name, formatter, self._format_value,
+                                    value, type_or_name, formatter, sub_formatters, **kwargs)
+
+        return self._format_value(value, type_or_name, formatter, sub_formatters, **kwargs)
+
+    def _format_value(self, value, type_or_name, formatter=None, sub_formatters=None, **kwargs):
+        typed_val = self.convert_to_type(value, type_or_name, **kwargs)
+        return self._format_typed_value(typed_val, type_or_name, formatter, sub_formatters, **kwargs)
+
+    def format_trusted_value(self, value, type_or_name, formatter=None, sub_formatters=None, **kwargs):
+        """Format a value that is expected to already have the right type.
+
+        This is used for function return values and the elements of
+        containers, which normally already have the right type.  If value is
+        an instance of the python class that type_or_name maps to, it is
+        formatted without being converted first.  Otherwise this behaves
+        exactly like format_value.
+
+        Types opt in by defining MAPPED_BUILTIN_TYPE, or CONTAINER_TYPE for
+        complex types, and their convert function must return instances of
+        that class unchanged.
+        """
+
+        trusted_class = self._trusted_classes.get(type_or_name, _UNKNOWN)
+        if trusted_class is _UNKNOWN:
+            trusted_class = self._get_trusted_class(type_or_name)
+            self._trusted_classes[type_or_name] = trusted_class
+
+        if trusted_class is None or not isinstance(value, trusted_class):
+            return self.format_value(value, type_or_name, formatter, sub_formatters, **kwargs)
+
+        if self.hooks.active:
+            return self.hooks.timed(HookRegistry.FORMAT, type_or_name, formatter, self._format_typed_value,
+                                    value, type_or_name, formatter, sub_formatters, **kwargs)
+
+        return self._format_typed_value(value, type_or_name, formatter, sub_formatters, **kwargs)
+
+    def write_value(self, value, type_or_name, stream, formatter=None, sub_formatters=None, **kwargs):
+        """Format a value and write it to a text stream.
+
+        Types can write large values incrementally, rather than building the
+        whole formatted string in memory, by defining a
+        stream_<formatter>(value, stream, **kwargs) function, where the
+        default formatter is called stream_default.  All other formatters
+        are written as a single string from format_value.
+
+        Args:
+            value (object): The value to format.
+            type_or_name (str or type): The type of value.
+            stream (file-like): The text stream to write to.
+            formatter (str): An optional name of the format to use.
+        """
+
         typed_val = self.convert_to_type(value, type_or_name, **kwargs)
 
+        proxy = self.get_proxy_for_type(type_or_name)
+        name = 'default' if formatter in (None, 'default', 'str', 'string') else formatter
+        writer = getattr(proxy, 'stream_%s' % name, None)
+
+        if callable(writer):
+            if self.hooks.active:
+                self.hooks.timed(HookRegistry.FORMAT, type_or_name, formatter, writer, typed_val, stream, **kwargs)
+            else:
+                writer(typed_val, stream, **kwargs)
+            return
+
+        stream.write(self._format_typed_value(typed_val, type_or_name, formatter, sub_formatters, **kwargs))
+
+    def _get_trusted_class(self, type_or_name):
+        """Find the python class whose instances need no conversion to type_or_name."""
+
+        if inspect.isclass(type_or_name) and not utils.is_class_from_typing(type_or_name) \
+                and not self.is_known_type(type_or_name):
+            return type_or_name
+
+        proxy = self.get_proxy_for_type(type_or_name)
+
+        trusted_class = getattr(proxy, 'CONTAINER_TYPE', None)
+        if trusted_class is None:
+            trusted_class = getattr(proxy, 'MAPPED_BUILTIN_TYPE', None)
+
+        return trusted_class
+
+    def _format_typed_value(self, typed_val, type_or_name, formatter=None, sub_formatters=None, **kwargs):
+        key = (type_or_name, formatter)
+        format_info = self._format_functions.get(key)
+        if format_info is None:
+            format_info = self._get_format_function(type_or_name, formatter)
+            self._format_functions[key] = format_info
+
+        format_func, is_default = format_info
+        if is_default:
+            return format_func(typed_val, **kwargs)
+
+        sub_formatters = sub_formatters if sub_formatters else []
+        return format_func(typed_val, *sub_formatters, **kwargs)
+
+    def _get_format_function(self, type_or_name, formatter):
+        """Find the function that formats a type with a given formatter.
+
+        Returns:
+            (callable, bool): The format function and whether it is a default
+                formatter, which is not passed any sub formatters.
+        """
+
         typeobj = self.get_proxy_for_type(type_or_name)
         if typeobj is None:
             typeobj = type_or_name
@@ -194,10 +480,9 @@ class TypeSystem:
         # otherwise if no format is specified, just convert the value to a string
         if formatter in (None, 'default', 'str', 'string'):
             if hasattr(typeobj, 'default_formatter'):
-                format_func = getattr(typeobj, 'default_formatter')
-                return format_func(typed_val, **kwargs)
+                return getattr(typeobj, 'default_formatter'), True
 
-            return str(typed_val)
+            return _format_as_str, True
 
         format_func = "format_%s" % str(formatter)
         format_func = getattr(typeobj, format_func, None)
@@ -205,8 +490,41 @@ class TypeSystem:
         if not callable(format_func):
             raise ArgumentError("Unknown format for type", type=type_or_name, formatter=formatter, formatter_function=format_func)
 
-        sub_formatters = sub_formatters if sub_formatters else []
-        return format_func(typed_val, *sub_formatters, **kwargs)
+        return format_func, False
+
+    def json_value(self, value, type_or_name, **kwargs):
+        """Convert a typed value into an object that can be serialized as JSON.
+
+        Types can control how their values are represented by defining a
+        json_value function, for example bytes are represented as hex strings
+        and maps as JSON objects.  Values of types without a json_value function
+        are passed through if they are native JSON values and otherwise
+        formatted as strings with the type's default formatter.
+
+        Args:
+            value (object): The value to convert.
+            type_or_name (str or type): The type of value.
+
+        Returns:
+            object: A str, int, float, bool, None, list or dict.
+        """
+
+        typed_val = self.convert_to_type(value, type_or_name, **kwargs)
+        if typed_val is None:
+            return None
+
+        typeobj = self.get_proxy_for_type(type_or_name)
+        if typeobj is None:
+            typeobj = type_or_name
+
+        encoder = getattr(typeobj, 'json_value', None)
+        if callable(encoder):
+            return encoder(typed_val)
+
+        if isinstance(typed_val, (str, int, float, bool)):
+            return typed_val
+
+        return self.format_value(typed_val, type_or_name, **kwargs)
 
     @classmethod
     def _validate_type(cls, typeobj):
@@ -227,6 +545,9 @@ class TypeSystem:
             raise ArgumentError("type is invalid, does not have default_formatter function", type=typeobj, methods=dir(typeobj))
 
     def _is_known_type_factory(self, class_or_name):
+        if self._deferred_type_modules:
+            self._load_deferred_type_modules()
+
         if class_or_name in self.type_factories or class_or_name in self._mapped_complex_types:
             return True
         return False
@@ -237,10 +558,67 @@ class TypeSystem:
         Returns:
             bool: True if the type is a known instantiated simple type, False otherwise
         """
+
+        if self._deferred_type_modules:
+            self._load_deferred_type_modules()
+
         if type_or_name in self.known_types or type_or_name in self._mapped_builtin_types or type_or_name in self._complex_type_proxies:
             return True
+
+        if inspect.isclass(type_or_name) and type_or_name not in self._unmapped_classes:
+            return self._instantiate_class_type(type_or_name)
+
+        return False
+
+    def _instantiate_class_type(self, type_class):
+        """Instantiate a type for a class that is handled by a type factory.
+
+        Factories handle all subclasses of their MAPPED_BASE_CLASS and all
+        classes for which their handles_class function returns True, except
+        classes that define FromString since they are already usable as type
+        classes.  Classes that no factory handles are remembered so that they
+        are only checked once.
+
+        Returns:
+            bool: True if a type was instantiated, False if no factory handles the class.
+        """
+
+        if hasattr(type_class, 'FromString'):
+            self._unmapped_classes.add(type_class)
+            return False
+
+        for base_class, factory in self._mapped_base_classes.items():
+            if type_class is not base_class and issubclass(type_class, base_class):
+                self.inject_type(type_class, factory.Build(type_class, type_system=self))
+                return True
+
+        for factory in self._class_type_factories:
+            if factory.handles_class(type_class):
+                self.inject_type(type_class, factory.Build(type_class, type_system=self))
+                return True
+
+        self._unmapped_classes.add(type_class)
         return False
 
+    def has_literal_subtypes(self, type_or_name):
+        """Check if a type name is built by a known factory from something other than type names.
+
+        For example enum(module.Class) takes the path of a class.  Such types
+        can be instantiated without loading any external type sources.
+
+        Returns:
+            bool
+        """
+
+        if not isinstance(type_or_name, str):
+            return False
+
+        base, is_complex, _ = self.split_type(type_or_name)
+        if not (is_complex and self._is_known_type_factory(base)):
+            return False
+
+        return getattr(self._get_known_type_factory(base), 'LITERAL_SUBTYPES', False)
+
     def split_type(self, type_or_name):
         """
         Given a potentially complex type, split it into its base type and specializers
@@ -250,13 +628,16 @@ class TypeSystem:
             if '(' not in name:
                 return name, False, []
 
-            base, sub = name.split('(')
+            base, _, sub = name.partition('(')
             if len(sub) == 0 or sub[-1] != ')':
                 raise ArgumentError("syntax error in complex type, no matching ) found", passed_type=type_or_name, basetype=base, subtype_string=sub)
 
             sub = sub[:-1]
 
-            subs = sub.split(',')
+            subs = _split_top_level(sub)
+            if subs is None:
+                raise ArgumentError("syntax error in complex type, unbalanced parentheses", passed_type=type_or_name, basetype=base, subtype_string=sub)
+
             return base, True, subs
         elif utils.is_class_from_typing(type_or_name):
             base = getattr(typing, utils.get_typing_type_name(type_or_name))
@@ -276,8 +657,13 @@ class TypeSystem:
 
         base_type = self._get_known_type_factory(base)
 
-        # Make sure all of the subtypes are valid
-        for sub_type in subtypes:
+        # Make sure all of the subtypes are valid unless the factory takes
+        # something other than type names.  ... is used by homogeneous tuples.
+        checked_subtypes = [x for x in subtypes if x is not Ellipsis and x != '...']
+        if getattr(base_type, 'LITERAL_SUBTYPES', False):
+            checked_subtypes = []
+
+        for sub_type in checked_subtypes:
             try:
                 self.get_proxy_for_type(sub_type)
             except KeyValueException as exc:
@@ -313,6 +699,10 @@ class TypeSystem:
         Returns:
             type proxy object or None
         """
+
+        if self._deferred_type_modules:
+            self._load_deferred_type_modules()
+
         if type_or_name in self.known_types:
             return self.known_types[type_or_name]
         if type_or_name in self._mapped_builtin_types:
@@ -422,6 +812,13 @@ class TypeSystem:
 
         type_or_name could be a string name or a type from typing module
         """
+
+        if self._deferred_type_modules:
+            self._load_deferred_type_modules()
+
+        self._format_functions = {}
+        self._trusted_classes = {}
+
         # if type_or_name is a type from typing module
         if not isinstance(type_or_name, str):
             if type_or_name in self._complex_type_proxies:
@@ -444,6 +841,15 @@ class TypeSystem:
             if mapped_complex_type:
                 self._mapped_complex_types[mapped_complex_type] = typeobj
 
+            mapped_base_class = getattr(typeobj, 'MAPPED_BASE_CLASS', None)
+            if mapped_base_class:
+                self._mapped_base_classes[mapped_base_class] = typeobj
+
+            if callable(getattr(typeobj, 'handles_class', None)):
+                self._class_type_factories.append(typeobj)
+
+            self._unmapped_classes = set()
+
         elif inspect.isclass(typeobj):
             self.known_types[name] = typeobj
         else:
@@ -527,6 +933,57 @@ class TypeSystem:
         return converted_value
 
 
+_UNKNOWN = object()
+
+
+def _split_top_level(sub):
+    """Split a list of subtypes on the commas that are not nested in parentheses.
+
+    Returns:
+        list(str): The subtypes or None if the parentheses are not balanced.
+    """
+
+    if '(' not in sub and ')' not in sub:
+        return sub.split(',')
+
+    subs = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(sub):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth < 0:
+                return None
+        elif char == ',' and depth == 0:
+            subs.append(sub[start:i])
+            start = i + 1
+
+    if depth != 0:
+        return None
+
+    subs.append(sub[start:])
+    return subs
+
+
+def _is_converted(value, type_obj, proxy_obj):
+    """Check if a value is already of a class and needs no conversion.
+
+    Types set CONVERT_SUBCLASSES when instances of subclasses must still be
+    converted, like a datetime that is a date but also has a time.
+    """
+
+    if getattr(proxy_obj, 'CONVERT_SUBCLASSES', False):
+        return value.__class__ is type_obj
+
+    return isinstance(value, type_obj)
+
+
+def _format_as_str(value, **_kwargs):
+    return str(value)
+
+
 def iprint(stringable):
     """
     A simple function to only print text if in an interactive session.
@@ -538,6 +995,7 @@ def iprint(stringable):
 
 #In order to support function annotations that must be resolved to types when modules
 #are imported, create a default TypeSystem object that is used globally to store type
-#information
+#information.  The builtin types are only imported once the first type is looked up.
 
-type_system = TypeSystem(types)  # pylint: disable=invalid-name
+type_system = TypeSystem()  # pylint: disable=invalid-name
+type_system.defer_type_module('typedargs.types')
@@ -16,6 +16,13 @@ from . import bool
 from . import float
 from . import bytes
 from . import basic_dict
+from . import datetime
+from . import date
+from . import duration
 
 from .map import map
 from .list import list
+from .union import union, optional
+from .enum import enum
+from .record import record
+from .tuple import tuple
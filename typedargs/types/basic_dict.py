@@ -2,6 +2,7 @@
 
 import json
 from typedargs.exceptions import ValidationError
+from typedargs.jsonlines import write_chunks
 
 
 MAPPED_BUILTIN_TYPE = dict
@@ -27,5 +28,36 @@ def _json_formatter(arg):
     return str(arg)
 
 
+def json_value(arg):
+    return arg
+
+
+# Encoders are shared since creating one for every value is a large part of
+# the cost of formatting small dicts
+_PRETTY_ENCODER = json.JSONEncoder(sort_keys=True, indent=4, separators=(',', ': '), default=_json_formatter)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'), default=_json_formatter)
+_SORTED_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'), default=_json_formatter)
+
+
 def default_formatter(arg, **kwargs):
-    return json.dumps(arg, sort_keys=True, indent=4, separators=(',', ': '), default=_json_formatter)
+    return _PRETTY_ENCODER.encode(arg)
+
+
+def format_compact(arg, **kwargs):
+    return _COMPACT_ENCODER.encode(arg)
+
+
+def format_sorted(arg, **kwargs):
+    return _SORTED_ENCODER.encode(arg)
+
+
+def stream_default(arg, stream, **kwargs):
+    write_chunks(stream, _PRETTY_ENCODER.iterencode(arg))
+
+
+def stream_compact(arg, stream, **kwargs):
+    write_chunks(stream, _COMPACT_ENCODER.iterencode(arg))
+
+
+def stream_sorted(arg, stream, **kwargs):
+    write_chunks(stream, _SORTED_ENCODER.iterencode(arg))
@@ -30,5 +30,9 @@ def convert(arg, **kwargs):
     return bool(arg)
 
 
+def completion_choices():
+    return ('true', 'false')
+
+
 def default_formatter(arg, **kwargs):
     return str(arg)
@@ -35,6 +35,10 @@ def default_formatter(arg, **kwargs):
     return str(arg)
 
 
+def json_value(arg):
+    return hexlify(arg).decode('utf-8')
+
+
 def format_repr(arg):
     return repr(arg)
 
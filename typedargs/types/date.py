@@ -0,0 +1,68 @@
+# pylint: disable=unused-argument,missing-docstring
+
+# date.py
+# a calendar date given as ISO-8601, epoch seconds or milliseconds or relative to today
+import datetime
+from typedargs import timeparse
+
+MAPPED_BUILTIN_TYPE = datetime.date
+ACCEPTS_NON_STRINGS = True
+CONVERT_SUBCLASSES = True
+
+
+def _parse_epoch(text):
+    value = timeparse.parse_epoch(text)
+    if value is timeparse.NO_MATCH:
+        return value
+
+    return value.date()
+
+
+def _parse_relative(text):
+    if text.lower() == 'today':
+        return datetime.datetime.now(datetime.timezone.utc).date()
+
+    value = timeparse.parse_relative(text)
+    if value is timeparse.NO_MATCH:
+        return value
+
+    return value.date()
+
+
+_PARSERS = (_parse_epoch, timeparse.parse_iso_date, _parse_relative)
+
+
+def _convert_object(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return timeparse.epoch_to_datetime(value).date()
+
+    raise TypeError("Unknown argument type")
+
+
+_convert = timeparse.make_parsing_converter(_PARSERS, _convert_object, 'date')
+
+
+def convert(arg, **kwargs):
+    return _convert(arg)
+
+
+def json_value(arg):
+    return arg.isoformat()
+
+
+# Formatting functions
+def default_formatter(arg, **kwargs):
+    return arg.isoformat()
+
+
+def format_iso(arg, **kwargs):
+    return arg.isoformat()
+
+
+def format_epoch(arg, **kwargs):
+    midnight = datetime.datetime.combine(arg, datetime.time())
+    return timeparse.format_seconds(timeparse.datetime_to_epoch(midnight))
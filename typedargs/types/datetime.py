@@ -0,0 +1,46 @@
+# pylint: disable=unused-argument,missing-docstring
+
+# datetime.py
+# a point in time given as ISO-8601, epoch seconds or milliseconds or relative to now
+import datetime
+from typedargs import timeparse
+
+MAPPED_BUILTIN_TYPE = datetime.datetime
+ACCEPTS_NON_STRINGS = True
+
+_PARSERS = (timeparse.parse_epoch, timeparse.parse_iso_datetime, timeparse.parse_relative)
+
+
+def _convert_object(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time())
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return timeparse.epoch_to_datetime(value)
+
+    raise TypeError("Unknown argument type")
+
+
+_convert = timeparse.make_parsing_converter(_PARSERS, _convert_object, 'datetime')
+
+
+def convert(arg, **kwargs):
+    return _convert(arg)
+
+
+def json_value(arg):
+    return arg.isoformat()
+
+
+# Formatting functions
+def default_formatter(arg, **kwargs):
+    return arg.isoformat()
+
+
+def format_iso(arg, **kwargs):
+    return arg.isoformat()
+
+
+def format_epoch(arg, **kwargs):
+    return timeparse.format_seconds(timeparse.datetime_to_epoch(arg))
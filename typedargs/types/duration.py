@@ -0,0 +1,62 @@
+# pylint: disable=unused-argument,missing-docstring
+
+# duration.py
+# a length of time given in units like 1h30m, as seconds, as H:MM:SS or as ISO-8601
+import datetime
+from typedargs import timeparse
+
+MAPPED_BUILTIN_TYPE = datetime.timedelta
+ACCEPTS_NON_STRINGS = True
+
+_PARSERS = (timeparse.parse_unit_duration, timeparse.parse_seconds, timeparse.parse_clock_duration,
+            timeparse.parse_iso_duration)
+
+
+def _convert_object(value):
+    if isinstance(value, datetime.timedelta):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.timedelta(seconds=value)
+
+    raise TypeError("Unknown argument type")
+
+
+_convert = timeparse.make_parsing_converter(_PARSERS, _convert_object, 'duration')
+
+
+def convert(arg, **kwargs):
+    return _convert(arg)
+
+
+def json_value(arg):
+    return arg.total_seconds()
+
+
+# Validation Functions
+def validate_positive(arg):
+    if arg is None:
+        return
+
+    if arg <= datetime.timedelta():
+        raise ValueError("duration is not positive")
+
+
+def validate_nonnegative(arg):
+    if arg is None:
+        return
+
+    if arg < datetime.timedelta():
+        raise ValueError("duration is negative")
+
+
+# Formatting functions
+def default_formatter(arg, **kwargs):
+    return timeparse.format_unit_duration(arg)
+
+
+def format_iso(arg, **kwargs):
+    return timeparse.format_iso_duration(arg)
+
+
+def format_seconds(arg, **kwargs):
+    return timeparse.format_seconds(arg)
@@ -0,0 +1,92 @@
+# pylint: disable=unused-argument,missing-docstring
+
+# enum.py
+# complex type for enum.Enum subclasses
+from enum import Enum
+from typedargs.utils import find_class
+
+
+class enum:  # pylint: disable=C0103
+    """Members of an enum.Enum subclass, looked up by name or value.
+
+    Names and values are matched case insensitively using lookup tables
+    that are built once when the type is instantiated.  The type can be
+    referred to as enum(module.Class) or by annotating a parameter with an
+    Enum subclass.
+    """
+
+    MAPPED_BASE_CLASS = Enum
+
+    # The subtype of enum(module.Class) is the path of a class, not a type name
+    LITERAL_SUBTYPES = True
+
+    def __init__(self, enum_class, **kwargs):
+        self.type_system = kwargs['type_system']
+        self.enum_class = enum_class
+        self.CONTAINER_TYPE = enum_class  # pylint: disable=invalid-name
+
+        members = list(enum_class)
+
+        self._by_name = {}
+        for name, member in enum_class.__members__.items():
+            self._by_name.setdefault(name.lower(), member)
+
+        self._by_value = {}
+        self._by_value_name = {}
+        for member in members:
+            self._by_value_name.setdefault(str(member.value).lower(), member)
+
+            try:
+                self._by_value.setdefault(member.value, member)
+            except TypeError:
+                pass
+
+        self._names = {member: member.name for member in members}
+        self._choices = tuple(member.name for member in members)
+
+    @staticmethod
+    def Build(*types, **kwargs):
+        if len(types) != 1:
+            raise ValueError("enum must be created with 1 argument, an Enum subclass")
+
+        enum_class = types[0]
+        if isinstance(enum_class, str):
+            enum_class = find_class(enum_class)
+
+        if not isinstance(enum_class, type) or not issubclass(enum_class, Enum):
+            raise ValueError("enum must be created with an Enum subclass, got %r" % (enum_class,))
+
+        return enum(enum_class, **kwargs)
+
+    def convert(self, value, **kwargs):
+        if value is None or isinstance(value, self.enum_class):
+            return value
+
+        if isinstance(value, str):
+            key = value.strip().lower()
+            member = self._by_name.get(key)
+            if member is None:
+                member = self._by_value_name.get(key)
+        else:
+            try:
+                member = self._by_value.get(value)
+            except TypeError:
+                member = None
+
+        if member is None:
+            raise ValueError("%r is not a valid %s, choices are: %s" % (value, self.enum_class.__name__, ", ".join(self._choices)))
+
+        return member
+
+    def completion_choices(self):
+        return self._choices
+
+    def json_value(self, value):
+        return self._names[value]
+
+    def default_formatter(self, value, **kwargs):
+        return self._names[value]
+
+    def format_value(self, value, **kwargs):
+        return str(value.value)
+
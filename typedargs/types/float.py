@@ -8,14 +8,28 @@
 
 # pylint: disable=unused-argument,missing-docstring
 
+import math
+import numbers
+import decimal
+
 MAPPED_BUILTIN_TYPE = float
+ACCEPTS_NON_STRINGS = True
+
 
-def convert(arg):
+def convert(arg, **kwargs):
     if arg is None:
         return None
 
-    if isinstance(arg, (str, int, float)):
-        return float(arg)
+    if arg.__class__ is float:
+        return arg
+
+    # numbers.Real covers numpy floating point and integer scalars and
+    # fractions, which all convert directly without a string round trip
+    if isinstance(arg, (str, int, float, numbers.Real, decimal.Decimal)):
+        try:
+            return float(arg)
+        except OverflowError:
+            raise ValueError("value is too large for a float: %r" % (arg,))
 
     raise TypeError("Unknown argument type")
 
@@ -37,6 +51,14 @@ def validate_nonnegative(arg):
         raise ValueError("value is negative")
 
 
+def validate_finite(arg):
+    if arg is None:
+        return
+
+    if not math.isfinite(arg):
+        raise ValueError("value is not finite")
+
+
 def validate_range(arg, lower, upper):
     if arg is None:
         return
@@ -10,10 +10,27 @@
 
 # integer type
 
+import numbers
+import decimal
+
 MAPPED_BUILTIN_TYPE = int
 MAPPED_TYPE_NAMES = ('int', )
-
-def convert(arg):
+ACCEPTS_NON_STRINGS = True
+
+# The ranges of fixed width integers checked by validate_fits
+_FIXED_WIDTH_RANGES = {
+    'int8': (-2**7, 2**7 - 1),
+    'int16': (-2**15, 2**15 - 1),
+    'int32': (-2**31, 2**31 - 1),
+    'int64': (-2**63, 2**63 - 1),
+    'uint8': (0, 2**8 - 1),
+    'uint16': (0, 2**16 - 1),
+    'uint32': (0, 2**32 - 1),
+    'uint64': (0, 2**64 - 1),
+}
+
+
+def convert(arg, **kwargs):
     if arg is None:
         return None
 
@@ -22,6 +39,24 @@ def convert(arg):
     if isinstance(arg, int):
         return arg
 
+    # Integers from other libraries, like numpy.int64, implement __index__
+    # which converts them exactly without formatting them as strings
+    index = getattr(type(arg), '__index__', None)
+    if index is not None:
+        return index(arg)
+
+    # Other numbers are accepted only if they have an exact integer value
+    if isinstance(arg, (numbers.Real, decimal.Decimal)):
+        try:
+            value = int(arg)
+        except (OverflowError, ValueError):
+            raise ValueError("value is not a finite number: %r" % (arg,))
+
+        if value != arg:
+            raise ValueError("value is not an integer: %r" % (arg,))
+
+        return value
+
     raise TypeError("Unknown argument type")
 
 
@@ -50,6 +85,18 @@ def validate_nonnegative(arg):
         raise ValueError("value is negative")
 
 
+def validate_fits(arg, int_type):
+    if arg is None:
+        return
+
+    if int_type not in _FIXED_WIDTH_RANGES:
+        raise ValueError("unknown integer type %s, expected one of %s" % (int_type, ", ".join(_FIXED_WIDTH_RANGES)))
+
+    lower, upper = _FIXED_WIDTH_RANGES[int_type]
+    if arg < lower or arg > upper:
+        raise ValueError("value does not fit in %s: [%d, %d]" % (int_type, lower, upper))
+
+
 # Formatting functions
 def default_formatter(arg, **kwarg):
     return str(arg)
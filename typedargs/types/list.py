@@ -10,13 +10,23 @@
 
 # list.py
 
-import ast
+import builtins
+import threading
 import collections
 from typing import List
+from typedargs.literals import parse_literal
+
+# The number of threads used to validate the elements of lists whose element
+# type sets PARALLEL_VALIDATION, like path
+MAX_VALIDATION_THREADS = 16
+
+_validation_pool = None
+_validation_pool_lock = threading.Lock()
 
 
 class list:  # pylint: disable=C0103
     MAPPED_COMPLEX_TYPE = List
+    CONTAINER_TYPE = builtins.list
 
     def __init__(self, valuetype, **kwargs):
 
@@ -35,11 +45,7 @@ class list:  # pylint: disable=C0103
             return value
 
         converted = []
-        if isinstance(value, str):
-            old_value = value
-            value = ast.literal_eval(value)
-            if not isinstance(value, collections.abc.Sequence):
-                raise ValueError("converted list from a string but it did not produce a sequence: %s" % old_value)
+        value = _parse_sequence(value)
 
         for val in value:
             conv = self.type_system.convert_to_type(val, self.valuetype, **kwargs)
@@ -47,10 +53,46 @@ class list:  # pylint: disable=C0103
 
         return converted
 
+    def make_converter(self):
+        """Create a converter that converts elements with a single compiled converter."""
+
+        convert_item = self.type_system.make_converter(self.valuetype)
+
+        def _convert(value):
+            if value is None:
+                return value
+
+            return [convert_item(val) for val in _parse_sequence(value)]
+
+        return _convert
+
+    def __getattr__(self, name):
+        # Validators of the element type validate every element of the list
+        # and its prepare functions process their arguments
+        if not name.startswith(('validate_', 'prepare_')):
+            raise AttributeError(name)
+
+        element_type = self.type_system.get_proxy_for_type(self.valuetype)
+        if element_type is None:
+            element_type = self.valuetype
+
+        validator = getattr(element_type, name, None)
+        if not callable(validator):
+            raise AttributeError(name)
+
+        if name.startswith('prepare_'):
+            return validator
+
+        parallel = getattr(element_type, 'PARALLEL_VALIDATION', False)
+        return lambda value, *args: _validate_elements(validator, parallel, value, args)
+
+    def json_value(self, value):
+        return [self.type_system.json_value(val, self.valuetype) for val in value]
+
     def default_formatter(self, value, **kwargs):
         lines = []
         for val in value:
-            line = self.type_system.format_value(val, self.valuetype, **kwargs)
+            line = self.type_system.format_trusted_value(val, self.valuetype, **kwargs)
             lines.append(line)
 
         return "\n".join(lines)
@@ -58,7 +100,52 @@ class list:  # pylint: disable=C0103
     def format_compact(self, value, **kwargs):
         lines = []
         for val in value:
-            line = self.type_system.format_value(val, self.valuetype, **kwargs)
+            line = self.type_system.format_trusted_value(val, self.valuetype, **kwargs)
             lines.append(line)
 
         return "[" + ", ".join(lines) + "]"
+
+
+def _parse_sequence(value):
+    if not isinstance(value, str):
+        return value
+
+    parsed = parse_literal(value)
+    if not isinstance(parsed, collections.abc.Sequence):
+        raise ValueError("converted list from a string but it did not produce a sequence: %s" % value)
+
+    return parsed
+
+
+def _validate_elements(validator, parallel, value, args):
+    """Run a validator on every element, in parallel if the element type allows it."""
+
+    if value is None:
+        return
+
+    def _check(item):
+        index, val = item
+        try:
+            validator(val, *args)
+        except (ValueError, TypeError) as exc:
+            message = exc.args[0] if exc.args else str(exc)
+            raise ValueError("%s (list element %d: %r)" % (message, index, val))
+
+    if parallel and len(value) > 1:
+        for _result in _get_validation_pool().map(_check, enumerate(value)):
+            pass
+    else:
+        for item in enumerate(value):
+            _check(item)
+
+
+def _get_validation_pool():
+    global _validation_pool  # pylint: disable=global-statement
+
+    with _validation_pool_lock:
+        if _validation_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _validation_pool = ThreadPoolExecutor(max_workers=MAX_VALIDATION_THREADS,
+                                                  thread_name_prefix='typedargs-validate')
+
+        return _validation_pool
@@ -10,17 +10,22 @@
 
 # map.py
 # a complex type wrapping a python dictionary
+import json
 from typing import Dict
+from typedargs.jsonlines import write_chunks
 
 
 class map:  # pylint: disable=C0103
     MAPPED_COMPLEX_TYPE = Dict
+    CONTAINER_TYPE = dict
 
     def __init__(self, keytype, valuetype, **kwargs):
 
         self.keytype = keytype
         self.valuetype = valuetype
         self.type_system = kwargs['type_system']
+        self._convert_key = self.type_system.make_converter(keytype)
+        self._convert_value = self.type_system.make_converter(valuetype)
 
     @staticmethod
     def Build(*types, **kwargs):
@@ -29,22 +34,66 @@ class map:  # pylint: disable=C0103
 
         return map(types[0], types[1], **kwargs)
 
-    @classmethod
-    def convert(cls, value, **kwargs):
-        if isinstance(value, dict):
+    def convert(self, value, **kwargs):
+        """Convert a dict or a string to a dict with converted keys and values.
+
+        Strings can either be JSON objects or comma separated key=value pairs
+        like "a=1,b=2".  Keys and values are converted from strings by their
+        types.
+        """
+
+        if value is None:
             return value
 
-        raise ValueError("Converting to map from string not yet supported")
+        if isinstance(value, str):
+            value = _parse_map(value)
+        elif not isinstance(value, dict):
+            raise ValueError("Cannot convert %s to a map" % type(value).__name__)
+
+        convert_key = self._convert_key
+        convert_value = self._convert_value
+        return {convert_key(key): convert_value(val) for key, val in value.items()}
+
+    def make_converter(self):
+        return self.convert
+
+    def json_value(self, value):
+        out = {}
+        for key, val in value.items():
+            keyval = self.type_system.json_value(key, self.keytype)
+            if not isinstance(keyval, str):
+                keyval = self.type_system.format_trusted_value(key, self.keytype)
+
+            out[keyval] = self.type_system.json_value(val, self.valuetype)
+
+        return out
 
     def default_formatter(self, value, **kwargs):
         forms = []
         for key, val in value.items():
-            keyform = self.type_system.format_value(key, self.keytype)
-            valform = self.type_system.format_value(val, self.valuetype)
+            keyform = self.type_system.format_trusted_value(key, self.keytype)
+            valform = self.type_system.format_trusted_value(val, self.valuetype)
             forms.append("%s: %s" % (keyform, valform))
 
         return "\n".join(forms)
 
+    def format_json(self, value, **kwargs):
+        return _COMPACT_ENCODER.encode(self.json_value(value))
+
+    def stream_default(self, value, stream, **kwargs):
+        write_chunks(stream, self._iter_lines(value))
+
+    def stream_json(self, value, stream, **kwargs):
+        write_chunks(stream, _COMPACT_ENCODER.iterencode(self.json_value(value)))
+
+    def _iter_lines(self, value):
+        separator = ""
+        for key, val in value.items():
+            keyform = self.type_system.format_trusted_value(key, self.keytype)
+            valform = self.type_system.format_trusted_value(val, self.valuetype)
+            yield "%s%s: %s" % (separator, keyform, valform)
+            separator = "\n"
+
     def format_one_line(self, value: dict, key_formatter: str = None, val_formatter: str = None, **kwargs) -> str:
         """Get string representation for the passed dict object.
 
@@ -59,7 +108,35 @@ class map:  # pylint: disable=C0103
 
         str_items = []
         for key, val in value.items():
-            keyform = self.type_system.format_value(key, self.keytype, key_formatter)
-            valform = self.type_system.format_value(val, self.valuetype, val_formatter)
+            keyform = self.type_system.format_trusted_value(key, self.keytype, key_formatter)
+            valform = self.type_system.format_trusted_value(val, self.valuetype, val_formatter)
             str_items.append("{}: {};".format(keyform, valform))
         return ' '.join(sorted(str_items))
+
+
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+
+def _parse_map(value):
+    """Parse a JSON object or comma separated key=value pairs into a dict."""
+
+    text = value.strip()
+    if text.startswith('{'):
+        parsed = json.loads(text)
+        if not isinstance(parsed, dict):
+            raise ValueError("converted map from a string but it did not produce a JSON object: %s" % value)
+
+        return parsed
+
+    parsed = {}
+    if text == '':
+        return parsed
+
+    for item in text.split(','):
+        key, sep, val = item.partition('=')
+        if not sep:
+            raise ValueError("expected key=value pairs separated by commas, got %r" % item)
+
+        parsed[key.strip()] = val.strip()
+
+    return parsed
@@ -8,7 +8,12 @@
 
 # pylint: disable=unused-argument,missing-docstring
 
-import os.path
+import os
+from typedargs.statcache import stat_cache
+
+# Validators check the file system, so validating list(path) values checks
+# all of the paths in parallel
+PARALLEL_VALIDATION = True
 
 
 def convert(arg):
@@ -22,13 +27,10 @@ def validate_readable(arg):
     if arg is None:
         raise ValueError("Path must be readable")
 
-    if not os.path.isfile(arg):
+    if not stat_cache.is_file(arg):
         raise ValueError("Path is not a file")
 
-    try:
-        file = open(arg, "r")
-        file.close()
-    except:
+    if not stat_cache.access(arg, os.R_OK):
         raise ValueError("Path could not be opened for reading")
 
 
@@ -36,7 +38,7 @@ def validate_exists(arg):
     if arg is None:
         raise ValueError("Path must exist")
 
-    if not os.path.exists(arg):
+    if stat_cache.stat(arg) is None:
         raise ValueError("Path must exist")
 
 
@@ -45,7 +47,7 @@ def validate_writeable(arg):
         raise ValueError("Path must be writable")
 
     parent = os.path.dirname(arg)
-    if not os.path.isdir(parent):
+    if not stat_cache.is_dir(parent):
         raise ValueError("Parent directory does not exist and path must be writeable")
 
 
@@ -0,0 +1,172 @@
+# pylint: disable=unused-argument,missing-docstring
+
+# record.py
+# complex type for dataclasses and typing.NamedTuple classes
+import json
+import typing
+import dataclasses
+from typedargs.utils import find_class
+
+
+class record:  # pylint: disable=C0103
+    """Instances of a dataclass or NamedTuple class.
+
+    Values can be converted from instances, dicts, tuples or lists of field
+    values, or from strings containing a JSON object or array.  The field
+    type hints are resolved once when the type is instantiated and a
+    converter for each field is compiled the first time a value is
+    converted.  Fields without a type hint, or annotated with typing.Any,
+    are passed through unchanged.
+
+    The type can be referred to as record(module.Class) or by annotating a
+    parameter with the class.
+    """
+
+    # The subtype of record(module.Class) is the path of a class, not a type name
+    LITERAL_SUBTYPES = True
+
+    def __init__(self, record_class, **kwargs):
+        self.type_system = kwargs['type_system']
+        self.record_class = record_class
+        self.CONTAINER_TYPE = record_class  # pylint: disable=invalid-name
+
+        hints = typing.get_type_hints(record_class)
+
+        if dataclasses.is_dataclass(record_class):
+            fields = [x for x in dataclasses.fields(record_class) if x.init]
+            names = tuple(x.name for x in fields)
+            required = frozenset(x.name for x in fields if x.default is dataclasses.MISSING
+                                 and x.default_factory is dataclasses.MISSING)
+        else:
+            names = tuple(record_class._fields)
+            required = frozenset(x for x in names if x not in record_class._field_defaults)
+
+        self.field_names = names
+        self.field_types = tuple(_usable_hint(hints.get(name)) for name in names)
+        self._required = required
+        self._names = frozenset(names)
+        self._converters = None
+
+    @staticmethod
+    def handles_class(type_class):
+        # Classes with FromString are type classes that convert themselves,
+        # they are only used as records when named explicitly
+        if hasattr(type_class, 'FromString'):
+            return False
+
+        return _is_record_class(type_class)
+
+    @staticmethod
+    def Build(*types, **kwargs):
+        if len(types) != 1:
+            raise ValueError("record must be created with 1 argument, a dataclass or NamedTuple class")
+
+        record_class = types[0]
+        if isinstance(record_class, str):
+            record_class = find_class(record_class)
+
+        if not isinstance(record_class, type) or not _is_record_class(record_class):
+            raise ValueError("record must be created with a dataclass or NamedTuple class, got %r" % (record_class,))
+
+        return record(record_class, **kwargs)
+
+    def _compile(self):
+        """Build a (name, trusted class, converter) tuple for each field."""
+
+        converters = []
+        for name, field_type in zip(self.field_names, self.field_types):
+            if field_type is None:
+                converters.append((name, object, None))
+                continue
+
+            # Values that already have exactly the field's class need no conversion
+            trusted_class = field_type if isinstance(field_type, type) else None
+            converters.append((name, trusted_class, self.type_system.make_converter(field_type)))
+
+        self._converters = tuple(converters)
+        return self._converters
+
+    def convert(self, value, **kwargs):
+        if value is None or isinstance(value, self.record_class):
+            return value
+
+        if isinstance(value, str):
+            value = json.loads(value)
+
+        converters = self._converters
+        if converters is None:
+            converters = self._compile()
+
+        if isinstance(value, dict):
+            return self._convert_dict(value, converters)
+
+        if isinstance(value, (tuple, list)):
+            return self._convert_sequence(value, converters)
+
+        raise ValueError("cannot convert %r to %s, expected a dict, tuple or JSON string" % (value, self.record_class.__name__))
+
+    def _convert_dict(self, value, converters):
+        if not self._names.issuperset(value):
+            unknown = sorted(str(x) for x in value if x not in self._names)
+            raise ValueError("unknown fields for %s: %s" % (self.record_class.__name__, ", ".join(unknown)))
+
+        args = {}
+        for name, trusted_class, convert in converters:
+            if name not in value:
+                if name in self._required:
+                    raise ValueError("missing required field for %s: %s" % (self.record_class.__name__, name))
+                continue
+
+            val = value[name]
+            if convert is not None and val.__class__ is not trusted_class:
+                val = convert(val)
+
+            args[name] = val
+
+        return self.record_class(**args)
+
+    def _convert_sequence(self, value, converters):
+        if len(value) > len(converters):
+            raise ValueError("too many fields for %s: expected at most %d, got %d" % (self.record_class.__name__, len(converters), len(value)))
+
+        args = []
+        for val, (name, trusted_class, convert) in zip(value, converters):
+            if convert is not None and val.__class__ is not trusted_class:
+                val = convert(val)
+
+            args.append(val)
+
+        for name, _trusted_class, _convert in converters[len(value):]:
+            if name in self._required:
+                raise ValueError("missing required field for %s: %s" % (self.record_class.__name__, name))
+
+        return self.record_class(*args)
+
+    def json_value(self, value):
+        out = {}
+        for name, field_type in zip(self.field_names, self.field_types):
+            val = getattr(value, name)
+            if field_type is not None:
+                val = self.type_system.json_value(val, field_type)
+
+            out[name] = val
+
+        return out
+
+    def default_formatter(self, value, **kwargs):
+        return json.dumps(self.json_value(value), separators=(',', ':'), default=str)
+
+    def format_pretty(self, value, **kwargs):
+        return json.dumps(self.json_value(value), indent=4, separators=(',', ': '), default=str)
+
+
+def _usable_hint(hint):
+    if hint is None or hint is typing.Any:
+        return None
+
+    return hint
+
+
+def _is_record_class(type_class):
+    return dataclasses.is_dataclass(type_class) or \
+        (issubclass(type_class, tuple) and hasattr(type_class, '_fields') and hasattr(type_class, '_field_defaults'))
@@ -8,6 +8,8 @@
 
 # pylint: disable=unused-argument,missing-docstring
 
+import re
+
 MAPPED_BUILTIN_TYPE = str
 MAPPED_TYPE_NAMES = ('str',)
 
@@ -18,6 +20,16 @@ def convert(arg):
     return str(arg)
 
 
+# Validator arguments are fixed when a function is annotated so the
+# prepare_<name> functions below process them once per parameter, before the
+# first call to the matching validator.
+def prepare_list(choices):
+    try:
+        return (_Choices(choices),)
+    except TypeError:
+        return (choices,)
+
+
 def validate_list(arg, choices):
     """
     Make sure the argument is in the list of choices passed to the function
@@ -27,6 +39,32 @@ def validate_list(arg, choices):
         raise ValueError('Value not in list: %s' % str(choices))
 
 
+def prepare_match(pattern):
+    return (_compile(pattern),)
+
+
+def validate_match(arg, pattern):
+    """
+    Make sure the beginning of the argument matches a regular expression
+    """
+
+    if _compile(pattern).match(arg) is None:
+        raise ValueError("Value does not match pattern: %s" % _pattern_text(pattern))
+
+
+def prepare_fullmatch(pattern):
+    return (_compile(pattern),)
+
+
+def validate_fullmatch(arg, pattern):
+    """
+    Make sure the entire argument matches a regular expression
+    """
+
+    if _compile(pattern).fullmatch(arg) is None:
+        raise ValueError("Value does not match pattern: %s" % _pattern_text(pattern))
+
+
 def validate_not_empty(arg):
     """
     Make sure the string is not empty
@@ -42,3 +80,31 @@ def default_formatter(arg, **kwargs):
 
 def format_repr(arg, **kwargs):
     return repr(arg)
+
+
+class _Choices(frozenset):
+    """A frozenset of choices that prints like the list it was created from."""
+
+    __slots__ = ('_text',)
+
+    def __new__(cls, choices):
+        obj = super().__new__(cls, choices)
+        obj._text = str(choices)
+        return obj
+
+    def __str__(self):
+        return self._text
+
+
+def _compile(pattern):
+    if isinstance(pattern, str):
+        try:
+            return re.compile(pattern)
+        except re.error as exc:
+            raise ValueError("invalid regular expression %r: %s" % (pattern, exc))
+
+    return pattern
+
+
+def _pattern_text(pattern):
+    return getattr(pattern, 'pattern', pattern)
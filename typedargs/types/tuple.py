@@ -0,0 +1,112 @@
+# pylint: disable=unused-argument,missing-docstring
+
+# tuple.py
+# a complex type for fixed length and homogeneous tuples
+import builtins
+from typing import Tuple
+from typedargs.literals import parse_literal
+
+
+# Strings containing these need to be parsed as python literals
+_LITERAL_CHARS = frozenset('\'"()[]{}')
+
+
+def _is_ellipsis(subtype):
+    return subtype is Ellipsis or subtype == '...'
+
+
+class tuple:  # pylint: disable=C0103
+    """A tuple with a fixed type per position or a variable number of values of one type.
+
+    tuple(integer, float, string) and Tuple[int, float, str] have exactly
+    three values while tuple(integer, ...) and Tuple[int, ...] have any
+    number of integers.  Values are converted from sequences or from strings
+    like "(1, 2.0, 'a')" or "1, 2.0, a".
+    """
+
+    MAPPED_COMPLEX_TYPE = Tuple
+    CONTAINER_TYPE = builtins.tuple
+
+    def __init__(self, *subtypes, **kwargs):
+        self.type_system = kwargs['type_system']
+        self.homogeneous = len(subtypes) == 2 and _is_ellipsis(subtypes[1])
+
+        if self.homogeneous:
+            self.subtypes = (subtypes[0],)
+        else:
+            self.subtypes = builtins.tuple(subtypes)
+
+        self._converters = builtins.tuple(self.type_system.make_converter(x) for x in self.subtypes)
+
+    @staticmethod
+    def Build(*types, **kwargs):
+        if len(types) == 0:
+            raise ValueError("tuple must be created with at least 1 argument")
+
+        if any(_is_ellipsis(x) for x in types) and (len(types) != 2 or not _is_ellipsis(types[1])):
+            raise ValueError("... is only allowed as the second argument of a homogeneous tuple")
+
+        return tuple(*types, **kwargs)
+
+    def convert(self, value, **kwargs):
+        if value is None:
+            return value
+
+        if isinstance(value, str):
+            value = _parse_tuple(value)
+
+        if self.homogeneous:
+            convert = self._converters[0]
+            return builtins.tuple(convert(val) for val in value)
+
+        if len(value) != len(self._converters):
+            raise ValueError("expected a tuple with %d values, got %d" % (len(self._converters), len(value)))
+
+        return builtins.tuple(convert(val) for convert, val in zip(self._converters, value))
+
+    def make_converter(self):
+        return self.convert
+
+    def _types_for(self, value):
+        if self.homogeneous:
+            return self.subtypes * len(value)
+
+        return self.subtypes
+
+    def json_value(self, value):
+        return [self.type_system.json_value(val, subtype) for subtype, val in zip(self._types_for(value), value)]
+
+    def default_formatter(self, value, **kwargs):
+        forms = [self.type_system.format_trusted_value(val, subtype, **kwargs)
+                 for subtype, val in zip(self._types_for(value), value)]
+
+        return "(" + ", ".join(forms) + ")"
+
+
+def _parse_tuple(value):
+    """Split a string like "(1, 2.0, 'a')" into its values.
+
+    Strings without quotes or nested brackets are split on commas directly
+    and each value is converted from its string form.  Anything else is
+    parsed as a python literal.
+    """
+
+    text = value.strip()
+    if text[:1] in '([' and text[-1:] == {'(': ')', '[': ']'}.get(text[:1]):
+        text = text[1:-1]
+
+    if _LITERAL_CHARS.isdisjoint(text):
+        if text.strip() == '':
+            return ()
+
+        parts = text.split(',')
+        if parts[-1].strip() == '':
+            parts.pop()
+
+        return [part.strip() for part in parts]
+
+    parsed = parse_literal(value)
+    if not isinstance(parsed, (builtins.tuple, builtins.list)):
+        parsed = (parsed,)
+
+    return parsed
@@ -0,0 +1,90 @@
+# pylint: disable=unused-argument,missing-docstring
+
+# union.py
+# complex types for values that can have one of several types
+from typing import Union, Optional
+
+# Returned by TypeSystem.try_convert when a branch does not match so that no
+# exception needs to be constructed for each failed branch.
+_NO_MATCH = object()
+
+
+def _is_none_type(type_or_name):
+    return type_or_name is type(None) or type_or_name is None
+
+
+class union:  # pylint: disable=C0103
+    """A value that has the first matching type out of several types.
+
+    Branches are always tried in the order they are declared, so the first
+    branch that accepts a value determines its type.  Failed branches are
+    detected with TypeSystem.try_convert, which does not raise.
+    """
+
+    MAPPED_COMPLEX_TYPE = Union
+
+    def __init__(self, *subtypes, **kwargs):
+        self.type_system = kwargs['type_system']
+        self.subtypes = tuple(x for x in subtypes if not _is_none_type(x))
+        self.allow_none = len(self.subtypes) != len(subtypes)
+
+        if len(self.subtypes) == 0:
+            raise ValueError("union must be created with at least one type that is not None")
+
+    @staticmethod
+    def Build(*types, **kwargs):
+        if len(types) < 1:
+            raise ValueError("union must be created with at least 1 argument")
+
+        return union(*types, **kwargs)
+
+    def make_converter(self):
+        return self.convert
+
+    def convert(self, value, **kwargs):
+        if value is None:
+            return None
+
+        try_convert = self.type_system.try_convert
+
+        for subtype in self.subtypes:
+            converted = try_convert(value, subtype, _NO_MATCH)
+            if converted is not _NO_MATCH:
+                return converted
+
+        raise ValueError("value %r did not match any of the types %s" % (value, ", ".join(str(x) for x in self.subtypes)))
+
+    def _branch_for(self, value):
+        """Find the first branch that a typed value belongs to."""
+
+        for subtype in self.subtypes:
+            if self.type_system.try_convert(value, subtype, _NO_MATCH) is not _NO_MATCH:
+                return subtype
+
+        raise ValueError("value %r did not match any of the types %s" % (value, ", ".join(str(x) for x in self.subtypes)))
+
+    def json_value(self, value):
+        if value is None:
+            return None
+
+        return self.type_system.json_value(value, self._branch_for(value))
+
+    def default_formatter(self, value, **kwargs):
+        if value is None:
+            return str(None)
+
+        return self.type_system.format_trusted_value(value, self._branch_for(value), **kwargs)
+
+
+class optional(union):  # pylint: disable=C0103
+    """A value that either has a single type or is None."""
+
+    MAPPED_COMPLEX_TYPE = Optional
+
+    @staticmethod
+    def Build(*types, **kwargs):
+        subtypes = [x for x in types if not _is_none_type(x)]
+        if len(subtypes) != 1:
+            raise ValueError("optional must be created with 1 argument, a value type")
+
+        return optional(subtypes[0], None, **kwargs)
@@ -4,7 +4,7 @@ import sys
 import typing
 
 from .exceptions import ValidationError
-from .metadata import AnnotatedMetadata
+from . import metadata
 
 
 class BasicContext(dict):
@@ -12,30 +12,6 @@ class BasicContext(dict):
     pass
 
 
-def _check_and_execute(func, *args, **kwargs):
-    """
-    Check the type of all parameters with type information, converting
-    as appropriate and then execute the function.
-    """
-
-    convargs = []
-
-    #Convert and validate all arguments
-    for i, arg in enumerate(args):
-        val = func.metadata.convert_positional_argument(i, arg)
-        convargs.append(val)
-
-    convkw = {}
-    for key, val in kwargs.items():
-        convkw[key] = func.metadata.convert_argument(key, val)
-
-    if not func.metadata.spec_filled(convargs, convkw):
-        raise ValidationError("Not enough parameters specified to call function", function=func.metadata.name, signature=func.metadata.signature())
-
-    retval = func(*convargs, **convkw)
-    return retval
-
-
 def _parse_validators(valids):
     """Parse a list of validator names or n-tuples, checking for errors.
 
@@ -116,7 +92,7 @@ def find_all(container):
         # If we are in a dict context then strings point to lazily loaded modules so include them too.
         if isinstance(container, dict) and isinstance(obj, str):
             built_context[name] = obj
-        elif hasattr(obj, 'metadata') and isinstance(getattr(obj, 'metadata'), AnnotatedMetadata):
+        elif hasattr(obj, 'metadata') and isinstance(getattr(obj, 'metadata'), metadata.AnnotatedMetadata):
             built_context[name] = obj
 
     return built_context
@@ -138,6 +114,15 @@ def get_typing_type_name(type_class):
     if sys.version_info.minor < 7:
         return type_class.__name__
 
+    # Optional[A] is Union[A, None] and its _name depends on the python
+    # version, so unions are named from their arguments instead
+    if getattr(type_class, '__origin__', None) is typing.Union:
+        args = type_class.__args__
+        if len(args) == 2 and type(None) in args:
+            return 'Optional'
+
+        return 'Union'
+
     return type_class._name
 
 
@@ -155,3 +140,39 @@ def get_typing_type_args(type_class) -> tuple:
         args = [arg for arg in type_class.__args__ if not isinstance(arg, typing.TypeVar)]
 
     return tuple(args)
+
+
+def find_class(path):
+    """Find a class from its dotted path, importing its module if needed.
+
+    Args:
+        path (str): The path of the class like package.module.Class.  Nested
+            classes are supported.
+
+    Returns:
+        type: The class.
+
+    Raises:
+        ValueError: The class could not be found.
+    """
+
+    parts = path.split('.')
+
+    for i in range(len(parts) - 1, 0, -1):
+        module_name = '.'.join(parts[:i])
+
+        try:
+            __import__(module_name)
+        except ImportError:
+            continue
+
+        obj = sys.modules[module_name]
+        try:
+            for part in parts[i:]:
+                obj = getattr(obj, part)
+        except AttributeError:
+            raise ValueError("could not find class %s in module %s" % (path, module_name))
+
+        return obj
+
+    raise ValueError("could not import the module containing class %s" % path)